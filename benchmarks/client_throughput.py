@@ -0,0 +1,299 @@
+"""
+Client throughput benchmark against a local stand-in for the Manifold API.
+
+Starts `fake_server.py` in a child process and measures requests/sec and p50/p99
+latency for sync vs asyncio GETs, cursor pagination, request validation and
+decoding of a large response with each installed JSON codec. Rate limiting, caching and request coalescing
+are disabled so every call reaches the server.
+
+Results are printed as JSON lines. `--output` saves them with metadata so a
+later run can be checked with `--compare`, which exits non-zero if any
+metric regressed by more than `--tolerance`.
+
+    PYTHONPATH=. python benchmarks/client_throughput.py --output baseline.json
+    PYTHONPATH=. python benchmarks/client_throughput.py --compare baseline.json --tolerance 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from importlib.metadata import PackageNotFoundError, version
+
+from fake_server import Fixtures, ServerProcess
+
+from pymanifold import Session, aio, call_manifold_api
+from pymanifold.client import AsyncClient, Client
+from pymanifold.codec import CODECS, get_codec
+from pymanifold.pagination import iter_bets
+from pymanifold.streaming import stream_manifold_api
+
+# Metric name -> whether larger values are better.
+METRICS = {
+    "req_per_s": True,
+    "rows_per_s": True,
+    "mb_per_s": True,
+    "p50_ms": False,
+    "p99_ms": False,
+    "us_per_call": False,
+}
+NO_CACHE = {"api_key": "", "cache": False, "coalesce": False}
+
+
+def percentile(values: list[float], q: float) -> float:
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, round(q * (len(values) - 1))))
+    return values[index]
+
+
+def summarize(name: str, latencies: list[float], seconds: float, **extra) -> dict:
+    result = {
+        "scenario": name,
+        "requests": len(latencies),
+        "seconds": round(seconds, 4),
+        "req_per_s": round(len(latencies) / seconds, 1),
+        "p50_ms": round(percentile(latencies, 0.5) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+    }
+    result.update(extra)
+    return result
+
+
+def bench_sync_get(
+    url: str, fixtures: Fixtures, requests: int, concurrency: int
+) -> dict:
+    markets = [market["id"] for market in fixtures.markets]
+    with Client(base_url=url, rate_limiter=False) as client:
+
+        def get(index: int) -> float:
+            started = time.perf_counter()
+            call_manifold_api(
+                f"/v0/market/{markets[index % len(markets)]}", client=client, **NO_CACHE
+            )
+            return time.perf_counter() - started
+
+        client.warm(concurrency)
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            latencies = list(pool.map(get, range(requests)))
+        seconds = time.perf_counter() - started
+    return summarize("sync_get", latencies, seconds, concurrency=concurrency)
+
+
+def bench_async_get(
+    url: str, fixtures: Fixtures, requests: int, concurrency: int
+) -> dict:
+    markets = [market["id"] for market in fixtures.markets]
+
+    async def run() -> tuple[list[float], float]:
+        client = AsyncClient(base_url=url, rate_limiter=False)
+        try:
+
+            async def get(index: int) -> float:
+                started = time.perf_counter()
+                await aio.call_manifold_api(
+                    f"/v0/market/{markets[index % len(markets)]}",
+                    client=client,
+                    **NO_CACHE,
+                )
+                return time.perf_counter() - started
+
+            await client.warm(concurrency)
+            started = time.perf_counter()
+            latencies = await aio.gather(
+                (get(index) for index in range(requests)), limit=concurrency
+            )
+            return latencies, time.perf_counter() - started
+        finally:
+            await client.aclose()
+
+    latencies, seconds = asyncio.run(run())
+    return summarize("async_get", latencies, seconds, concurrency=concurrency)
+
+
+def bench_pagination(url: str, fixtures: Fixtures, stream: bool) -> dict:
+    with Client(base_url=url, rate_limiter=False) as client:
+        started = time.perf_counter()
+        rows = sum(
+            1
+            for _ in iter_bets(page_size=1000, stream=stream, api_key="", client=client)
+        )
+        seconds = time.perf_counter() - started
+    assert rows == len(fixtures.bets), rows
+    return {
+        "scenario": "pagination_stream" if stream else "pagination",
+        "rows": rows,
+        "seconds": round(seconds, 4),
+        "rows_per_s": round(rows / seconds, 1),
+    }
+
+
+def bench_validation(url: str, fixtures: Fixtures, calls: int) -> list[dict]:
+    params = {"contractId": fixtures.markets[0]["id"], "limit": 10, "order": "asc"}
+    results = []
+    session = Session("/bets")
+    session.validate(params=params)  # build the validator outside the timing
+    started = time.perf_counter()
+    for _ in range(calls):
+        session.validate(params=params)
+    seconds = time.perf_counter() - started
+    results.append(
+        {
+            "scenario": "validate",
+            "calls": calls,
+            "us_per_call": round(seconds / calls * 1e6, 2),
+        }
+    )
+
+    with Client(base_url=url, rate_limiter=False) as client:
+        for trusted in (False, True):
+            session = Session("/bets", api_key="", client=client, trusted=trusted)
+            latencies = []
+            started = time.perf_counter()
+            for _ in range(calls // 10):
+                request_started = time.perf_counter()
+                session.execute(params=params)
+                latencies.append(time.perf_counter() - request_started)
+            seconds = time.perf_counter() - started
+            name = "execute_trusted" if trusted else "execute_validated"
+            results.append(summarize(name, latencies, seconds))
+    return results
+
+
+def available_codecs() -> list[str]:
+    codecs = []
+    for name in CODECS:
+        try:
+            get_codec(name)
+        except ImportError:
+            continue
+        codecs.append(name)
+    return codecs
+
+
+def bench_decode(url: str, fixtures: Fixtures, rows: int, repeat: int) -> list[dict]:
+    results = []
+    # Streaming always uses the incremental standard library decoder.
+    runs = [(False, codec) for codec in available_codecs()] + [(True, None)]
+    for stream, codec in runs:
+        with Client(base_url=url, rate_limiter=False, codec=codec) as client:
+            size = len(
+                client.request("GET", "/v0/bets", params={"limit": rows}).content
+            )
+            latencies = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                if stream:
+                    count = sum(
+                        1
+                        for _ in stream_manifold_api(
+                            "/v0/bets",
+                            params={"limit": rows},
+                            api_key="",
+                            client=client,
+                        )
+                    )
+                else:
+                    count = len(
+                        call_manifold_api(
+                            "/v0/bets",
+                            params={"limit": rows},
+                            client=client,
+                            **NO_CACHE,
+                        )
+                    )
+                latencies.append(time.perf_counter() - started)
+                assert count == rows, count
+            median = statistics.median(latencies)
+            results.append(
+                {
+                    "scenario": "decode_stream" if stream else f"decode[{codec}]",
+                    "rows": rows,
+                    "bytes": size,
+                    "p50_ms": round(median * 1000, 3),
+                    "mb_per_s": round(size / median / 1e6, 2),
+                }
+            )
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Return a description of every metric that regressed by more than `tolerance`."""
+    regressions = []
+    for scenario, metrics in results.items():
+        previous = baseline.get(scenario)
+        if previous is None:
+            continue
+        for metric, higher_is_better in METRICS.items():
+            if metric not in metrics or metric not in previous or not previous[metric]:
+                continue
+            change = (metrics[metric] - previous[metric]) / previous[metric]
+            worse = -change if higher_is_better else change
+            line = f"{scenario}.{metric}: {previous[metric]} -> {metrics[metric]} ({change:+.1%})"
+            print(line, file=sys.stderr)
+            if worse > tolerance:
+                regressions.append(line)
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--bets", type=int, default=50_000)
+    parser.add_argument("--validate-calls", type=int, default=5000)
+    parser.add_argument("--output", help="Write results and metadata to this JSON file")
+    parser.add_argument("--compare", help="Baseline JSON file written by --output")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    # Same seed as the server's fixtures, so ids and counts match.
+    fixtures = Fixtures(bets=args.bets)
+    with ServerProcess(bets=args.bets) as server:
+        results = [
+            bench_sync_get(server.url, fixtures, args.requests, args.concurrency),
+            bench_async_get(server.url, fixtures, args.requests, args.concurrency),
+            bench_pagination(server.url, fixtures, stream=False),
+            bench_pagination(server.url, fixtures, stream=True),
+            *bench_validation(server.url, fixtures, args.validate_calls),
+            *bench_decode(server.url, fixtures, rows=args.bets, repeat=5),
+        ]
+
+    for result in results:
+        print(json.dumps({"benchmark": "client_throughput", **result}))
+    by_scenario = {result["scenario"]: result for result in results}
+
+    if args.output:
+        try:
+            package_version = version("pymanifold")
+        except PackageNotFoundError:
+            package_version = None
+        report = {
+            "meta": {
+                "pymanifold": package_version,
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "args": vars(args),
+            },
+            "results": by_scenario,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(by_scenario, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"FAIL: {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
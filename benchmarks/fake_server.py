@@ -0,0 +1,698 @@
+"""
+Local stand-in for the Manifold Markets API, serving generated fixture payloads.
+
+Routes are generated from `pymanifold.endpoints.ENDPOINTS`, so every endpoint
+the client knows about answers. Users, groups, markets, positions, bets,
+comments, txns and managrams are shaped like the real API's and support the
+query parameters the client relies on: `limit`, `offset`, `order`, bet id
+cursors (`before`/`after` on `/v0/bets`), creation time bounds (`before`/`after`
+on `/v0/txns` and `/v0/managrams`, `afterTime`/`beforeTime` on `/v0/bets`),
+`contractId`, `userId`, `id` and `kinds=open-limit`. Endpoints with nothing
+worth generating (`/v0/leagues`, the lover and compatibility endpoints) return
+an empty list, and writes other than `/v0/bet` and `/v0/market` return
+`{"success": true}`. Fixtures are generated from a fixed seed and encoded
+once, so the server stays cheap next to the client being measured.
+
+Run from the repository root, with the package importable:
+
+    PYTHONPATH=. python benchmarks/fake_server.py --port 8000 --bets 100000
+"""
+
+import argparse
+import json
+import multiprocessing
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+from pymanifold.endpoints import ENDPOINTS
+from pymanifold.routes import compile_template
+
+SEED = 0
+START_TIME = 1_700_000_000_000
+OUTCOMES = ["YES", "NO"]
+
+
+def make_users(count: int, rng: random.Random) -> list[dict]:
+    users = []
+    for index in range(count):
+        username = f"user{index}"
+        users.append(
+            {
+                "id": f"u{index:08d}",
+                "createdTime": START_TIME - rng.randint(0, 10**10),
+                "name": f"User {index}",
+                "username": username,
+                "url": f"https://manifold.markets/{username}",
+                "avatarUrl": f"https://example.com/avatars/{username}.png",
+                "bio": "Forecaster",
+                "balance": round(rng.uniform(0, 50000), 2),
+                "totalDeposits": round(rng.uniform(0, 50000), 2),
+                "profitCached": {
+                    "daily": round(rng.gauss(0, 50), 2),
+                    "weekly": round(rng.gauss(0, 200), 2),
+                    "monthly": round(rng.gauss(0, 500), 2),
+                    "allTime": round(rng.gauss(0, 2000), 2),
+                },
+                "isBot": False,
+                "isAdmin": False,
+                "isTrustworthy": False,
+            }
+        )
+    return users
+
+
+def make_groups(count: int, users: list[dict], rng: random.Random) -> list[dict]:
+    groups = []
+    for index in range(count):
+        creator = rng.choice(users)
+        groups.append(
+            {
+                "id": f"g{index:08d}",
+                "slug": f"topic-{index}",
+                "name": f"Topic {index}",
+                "about": "",
+                "creatorId": creator["id"],
+                "createdTime": START_TIME - rng.randint(0, 10**10),
+                "totalMembers": rng.randint(1, 5000),
+                "privacyStatus": "public",
+                "importanceScore": round(rng.random(), 4),
+            }
+        )
+    return groups
+
+
+def make_markets(
+    count: int, users: list[dict], groups: list[dict], rng: random.Random
+) -> list[dict]:
+    markets = []
+    for index in range(count):
+        creator = rng.choice(users)
+        created = START_TIME + index * 60_000
+        prob = rng.random()
+        slug = f"will-event-{index}-happen"
+        markets.append(
+            {
+                "id": f"m{index:08d}",
+                "creatorId": creator["id"],
+                "creatorUsername": creator["username"],
+                "creatorName": creator["name"],
+                "creatorAvatarUrl": creator["avatarUrl"],
+                "createdTime": created,
+                "closeTime": created + 30 * 24 * 3600 * 1000,
+                "question": f"Will event {index} happen before the end of the year?",
+                "slug": slug,
+                "url": f"https://manifold.markets/{creator['username']}/{slug}",
+                "pool": {
+                    "YES": round(rng.uniform(10, 1000), 4),
+                    "NO": round(rng.uniform(10, 1000), 4),
+                },
+                "probability": prob,
+                "p": 0.5,
+                "totalLiquidity": round(rng.uniform(100, 5000), 2),
+                "outcomeType": "BINARY",
+                "mechanism": "cpmm-1",
+                "volume": round(rng.uniform(0, 100000), 2),
+                "volume24Hours": round(rng.uniform(0, 1000), 2),
+                "isResolved": False,
+                "uniqueBettorCount": rng.randint(0, 500),
+                "lastUpdatedTime": created + rng.randint(0, 10**7),
+                "lastBetTime": created + rng.randint(0, 10**7),
+                "token": "MANA",
+                "groupSlugs": [rng.choice(groups)["slug"]] if groups else [],
+            }
+        )
+    return markets
+
+
+def make_bets(
+    count: int, markets: list[dict], users: list[dict], rng: random.Random
+) -> list[dict]:
+    """Bets oldest first, like `/v0/bets?order=asc`."""
+    bets = []
+    for index in range(count):
+        market = rng.choice(markets)
+        prob_before = rng.random()
+        amount = round(rng.uniform(1, 500), 2)
+        bets.append(
+            {
+                "id": f"b{index:010d}",
+                "userId": rng.choice(users)["id"],
+                "contractId": market["id"],
+                "createdTime": START_TIME + index * 1000,
+                "amount": amount,
+                "shares": round(amount / max(prob_before, 0.01), 6),
+                "outcome": rng.choice(OUTCOMES),
+                "probBefore": prob_before,
+                "probAfter": min(1.0, max(0.0, prob_before + rng.gauss(0, 0.02))),
+                "fees": {"creatorFee": 0, "platformFee": 0, "liquidityFee": 0},
+                "isFilled": True,
+                "isCancelled": False,
+                "isRedemption": False,
+                "loanAmount": 0,
+                "orderAmount": amount,
+                "limitProb": None,
+                "fills": [
+                    {
+                        "amount": amount,
+                        "shares": round(amount / max(prob_before, 0.01), 6),
+                        "timestamp": START_TIME + index * 1000,
+                        "matchedBetId": None,
+                    }
+                ],
+                "visibility": "public",
+            }
+        )
+    return bets
+
+
+def make_comments(
+    count: int, markets: list[dict], users: list[dict], rng: random.Random
+) -> list[dict]:
+    comments = []
+    for index in range(count):
+        user = rng.choice(users)
+        market = rng.choice(markets)
+        comments.append(
+            {
+                "id": f"c{index:08d}",
+                "contractId": market["id"],
+                "userId": user["id"],
+                "userName": user["name"],
+                "userUsername": user["username"],
+                "userAvatarUrl": user["avatarUrl"],
+                "createdTime": START_TIME + index * 5000,
+                "content": {
+                    "type": "doc",
+                    "content": [
+                        {
+                            "type": "paragraph",
+                            "content": [
+                                {"type": "text", "text": "Interesting market."}
+                            ],
+                        }
+                    ],
+                },
+                "commentType": "contract",
+                "visibility": "public",
+            }
+        )
+    return comments
+
+
+def make_txns(
+    count: int, users: list[dict], rng: random.Random, spacing: float = 10_000
+) -> list[dict]:
+    """Txns oldest first, `spacing` ms apart (below 1, several share each millisecond)."""
+    txns = []
+    for index in range(count):
+        sender, receiver = rng.sample(users, 2)
+        txns.append(
+            {
+                "id": f"t{index:08d}",
+                "createdTime": START_TIME + int(index * spacing),
+                "fromId": sender["id"],
+                "fromType": "USER",
+                "toId": receiver["id"],
+                "toType": "USER",
+                "amount": round(rng.uniform(1, 1000), 2),
+                "token": "M$",
+                "category": "MANA_PAYMENT",
+                "description": "Payment",
+            }
+        )
+    return txns
+
+
+ENCODED = ("users", "groups", "markets", "bets", "comments", "txns")
+
+
+class Fixtures:
+    def __init__(
+        self,
+        users: int = 1000,
+        markets: int = 5000,
+        bets: int = 100_000,
+        comments: int = 5000,
+        txns: int = 5000,
+        groups: int = 50,
+        txn_spacing: float = 10_000,
+        seed: int = SEED,
+    ):
+        """
+        Generated API objects, each also kept JSON-encoded for cheap slicing.
+
+        Args:
+            txn_spacing: Milliseconds between consecutive txns; below 1 many
+                txns share a timestamp, as they do in bursts on the real API
+        """
+        rng = random.Random(seed)
+        self.users = make_users(users, rng)
+        self.groups = make_groups(groups, self.users, rng)
+        self.markets = make_markets(markets, self.users, self.groups, rng)
+        self.bets = make_bets(bets, self.markets, self.users, rng)
+        self.comments = make_comments(comments, self.markets, self.users, rng)
+        self.txns = make_txns(txns, self.users, rng, txn_spacing)
+        self.encoded = {
+            name: [
+                json.dumps(row, separators=(",", ":")).encode()
+                for row in getattr(self, name)
+            ]
+            for name in ENCODED
+        }
+        self.index = {
+            name: {
+                row["id"]: position for position, row in enumerate(getattr(self, name))
+            }
+            for name in ("users", "groups", "markets", "bets")
+        }
+        self.by_username = {
+            user["username"]: index for index, user in enumerate(self.users)
+        }
+        self.by_slug = {
+            market["slug"]: index for index, market in enumerate(self.markets)
+        }
+        self.group_by_slug = {
+            group["slug"]: index for index, group in enumerate(self.groups)
+        }
+
+    def add_bets(self, bets: list[dict]) -> None:
+        """
+        Append bets newer than every existing one, as if they were just placed.
+
+        A bet whose id is already stored replaces it in place, e.g. a limit
+        order that has since filled.
+        """
+        for bet in bets:
+            encoded = json.dumps(bet, separators=(",", ":")).encode()
+            position = self.index["bets"].get(bet["id"])
+            if position is not None:
+                self.bets[position] = bet
+                self.encoded["bets"][position] = encoded
+                continue
+            self.index["bets"][bet["id"]] = len(self.bets)
+            self.encoded["bets"].append(encoded)
+            self.bets.append(bet)
+
+    def upsert_markets(self, markets: list[dict]) -> None:
+        """Replace markets by id, e.g. after an edit or a bet, and append new ones."""
+        for market in markets:
+            encoded = json.dumps(market, separators=(",", ":")).encode()
+            position = self.index["markets"].get(market["id"])
+            if position is None:
+                position = self.index["markets"][market["id"]] = len(self.markets)
+                self.markets.append(market)
+                self.encoded["markets"].append(encoded)
+            else:
+                self.by_slug.pop(self.markets[position]["slug"], None)
+                self.markets[position] = market
+                self.encoded["markets"][position] = encoded
+            self.by_slug[market["slug"]] = position
+
+
+def _page(encoded: list[bytes], positions) -> bytes:
+    return b"[" + b",".join(encoded[position] for position in positions) + b"]"
+
+
+def _encode(value) -> bytes:
+    return json.dumps(value, separators=(",", ":")).encode()
+
+
+def _route_pattern(template: str):
+    # "/v0/get-lover-answers?userId=[user_id]" puts its parameter in the query.
+    return compile_template(template.split("?")[0])
+
+
+# (path regex, endpoint template, method) for every endpoint in the table.
+ROUTES = [
+    (_route_pattern(template), template, data.get("method", "GET"))
+    for template, data in ENDPOINTS.items()
+]
+
+# Endpoint template -> name of the `Handler` method that serves it. Endpoints
+# not listed here answer GETs with `[]` and writes with `{"success": true}`.
+HANDLERS = {
+    "/v0/user/[username]": "_user_by_username",
+    "/v0/user/[username]/lite": "_user_by_username",
+    "/v0/user/by-id/[id]": "_user_by_id",
+    "/v0/user/by-id/[id]/lite": "_user_by_id",
+    "/v0/me": "_me",
+    "/v0/user/[username]/bets": "_user_bets",
+    "/v0/groups": "_groups",
+    "/v0/group/[slug]": "_group_by_slug",
+    "/v0/group/by-id/[id]": "_group_by_id",
+    "/v0/group/by-id/[id]/markets": "_group_markets",
+    "/v0/markets": "_markets",
+    "/v0/market/[marketId]": "_market",
+    "/v0/market/[marketId]/positions": "_positions",
+    "/v0/slug/[marketSlug]": "_market_by_slug",
+    "/v0/search-markets": "_search_markets",
+    "/v0/users": "_users",
+    "/v0/comments": "_comments",
+    "/v0/bets": "_bets",
+    "/v0/txns": "_txns",
+    "/v0/managrams": "_txns",
+    "/v0/bet": "_place_bet",
+    "/v0/market": "_create_market",
+}
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; don't let Nagle delay the body.
+    disable_nagle_algorithm = True
+    server: "FakeServer"
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def _send(self, body: bytes, status: int = 200) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _not_found(self) -> None:
+        self._send(b'{"message":"Not found"}', 404)
+
+    def _dispatch(self, method: str, body=None) -> None:
+        url = urlparse(self.path)
+        path = unquote(url.path)
+        self.query = parse_qs(url.query)
+        self.body = body
+        for pattern, template, route_method in ROUTES:
+            match = pattern.match(path)
+            if match is None or route_method != method:
+                continue
+            self.url_params = match.groupdict()
+            handler = HANDLERS.get(template)
+            if handler is not None:
+                return getattr(self, handler)()
+            return self._send(b"[]" if method == "GET" else b'{"success":true}')
+        return self._not_found()
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        self._dispatch("POST", json.loads(self.rfile.read(length) or b"null"))
+
+    def _arg(self, name: str, default=None):
+        return self.query[name][0] if name in self.query else default
+
+    @property
+    def _limit(self) -> int:
+        return int(float(self._arg("limit", 100)))
+
+    @property
+    def _offset(self) -> int:
+        return int(float(self._arg("offset", 0)))
+
+    def _one(self, name: str, index: int | None) -> None:
+        if index is None:
+            return self._not_found()
+        self._send(self.server.fixtures.encoded[name][index])
+
+    def _user_by_username(self) -> None:
+        fixtures = self.server.fixtures
+        self._one("users", fixtures.by_username.get(self.url_params["username"]))
+
+    def _user_by_id(self) -> None:
+        fixtures = self.server.fixtures
+        self._one("users", fixtures.index["users"].get(self.url_params["id"]))
+
+    def _me(self) -> None:
+        self._one("users", 0)
+
+    def _user_bets(self) -> None:
+        fixtures = self.server.fixtures
+        index = fixtures.by_username.get(self.url_params["username"])
+        if index is None:
+            return self._not_found()
+        self.query["userId"] = [fixtures.users[index]["id"]]
+        self._bets()
+
+    def _groups(self) -> None:
+        fixtures = self.server.fixtures
+        self._send(_page(fixtures.encoded["groups"], range(len(fixtures.groups))))
+
+    def _group_by_slug(self) -> None:
+        fixtures = self.server.fixtures
+        self._one("groups", fixtures.group_by_slug.get(self.url_params["slug"]))
+
+    def _group_by_id(self) -> None:
+        fixtures = self.server.fixtures
+        self._one("groups", fixtures.index["groups"].get(self.url_params["id"]))
+
+    def _group_markets(self) -> None:
+        fixtures = self.server.fixtures
+        index = fixtures.index["groups"].get(self.url_params["id"])
+        if index is None:
+            return self._not_found()
+        slug = fixtures.groups[index]["slug"]
+        positions = [
+            p
+            for p, market in enumerate(fixtures.markets)
+            if slug in market["groupSlugs"]
+        ]
+        self._send(_page(fixtures.encoded["markets"], positions[: self._limit]))
+
+    def _markets(self) -> None:
+        # Newest first (or most recently updated first), with a `before` cursor.
+        fixtures = self.server.fixtures
+        if self._arg("sort") == "updated-time":
+            markets = fixtures.markets
+            order = sorted(
+                range(len(markets)),
+                key=lambda p: markets[p]["lastUpdatedTime"],
+                reverse=True,
+            )
+            start = 0
+            before = fixtures.index["markets"].get(self._arg("before"))
+            if before is not None:
+                start = order.index(before) + 1
+            positions = order[start : start + self._limit]
+        else:
+            end = len(fixtures.markets)
+            if self._arg("before") in fixtures.index["markets"]:
+                end = fixtures.index["markets"][self._arg("before")]
+            positions = range(end - 1, max(end - 1 - self._limit, -1), -1)
+        self._send(_page(fixtures.encoded["markets"], positions))
+
+    def _market(self) -> None:
+        fixtures = self.server.fixtures
+        self._one("markets", fixtures.index["markets"].get(self.url_params["marketId"]))
+
+    def _market_by_slug(self) -> None:
+        fixtures = self.server.fixtures
+        self._one("markets", fixtures.by_slug.get(self.url_params["marketSlug"]))
+
+    def _positions(self) -> None:
+        fixtures = self.server.fixtures
+        market_id = self.url_params["marketId"]
+        if market_id not in fixtures.index["markets"]:
+            return self._not_found()
+        positions: dict[str, dict] = {}
+        for bet in fixtures.bets:
+            if bet["contractId"] != market_id:
+                continue
+            position = positions.setdefault(
+                bet["userId"],
+                {
+                    "contractId": market_id,
+                    "userId": bet["userId"],
+                    "invested": 0.0,
+                    "totalShares": {"YES": 0.0, "NO": 0.0},
+                    "lastBetTime": 0,
+                },
+            )
+            position["invested"] += bet["amount"]
+            position["totalShares"][bet["outcome"]] += bet["shares"]
+            position["lastBetTime"] = max(position["lastBetTime"], bet["createdTime"])
+        rows = sorted(positions.values(), key=lambda row: -row["invested"])
+        self._send(_encode(rows[: self._limit]))
+
+    def _search_markets(self) -> None:
+        fixtures = self.server.fixtures
+        offset = self._offset
+        stop = min(offset + self._limit, len(fixtures.markets))
+        self._send(_page(fixtures.encoded["markets"], range(offset, stop)))
+
+    def _users(self) -> None:
+        fixtures = self.server.fixtures
+        self._send(
+            _page(
+                fixtures.encoded["users"], range(min(self._limit, len(fixtures.users)))
+            )
+        )
+
+    def _comments(self) -> None:
+        fixtures = self.server.fixtures
+        positions = range(len(fixtures.comments) - 1, -1, -1)
+        if "contractId" in self.query:
+            market_id = self._arg("contractId")
+            positions = [
+                p for p in positions if fixtures.comments[p]["contractId"] == market_id
+            ]
+        self._send(_page(fixtures.encoded["comments"], positions[: self._limit]))
+
+    def _txns(self) -> None:
+        # Newest first, bounded by creation time: after < createdTime < before.
+        fixtures = self.server.fixtures
+        after = float(self._arg("after", "-inf"))
+        before = float(self._arg("before", "inf"))
+        filters = {
+            field: self._arg(field)
+            for field in ("toId", "fromId")
+            if field in self.query
+        }
+        positions = [
+            p
+            for p in range(len(fixtures.txns) - 1, -1, -1)
+            if after < fixtures.txns[p]["createdTime"] < before
+            and all(
+                fixtures.txns[p][field] == value for field, value in filters.items()
+            )
+        ]
+        offset = self._offset
+        self._send(
+            _page(fixtures.encoded["txns"], positions[offset : offset + self._limit])
+        )
+
+    def _bets(self) -> None:
+        fixtures = self.server.fixtures
+        query = self.query
+        limit = self._limit
+        if "id" in query:
+            index = fixtures.index["bets"].get(self._arg("id"))
+            return self._send(
+                _page(fixtures.encoded["bets"], [] if index is None else [index])
+            )
+        positions = range(len(fixtures.bets))
+        for field in ("contractId", "userId"):
+            if field in query:
+                wanted = set(query[field])
+                positions = [p for p in positions if fixtures.bets[p][field] in wanted]
+        if "afterTime" in query or "beforeTime" in query:
+            after = float(self._arg("afterTime", "-inf"))
+            before = float(self._arg("beforeTime", "inf"))
+            positions = [
+                p for p in positions if after < fixtures.bets[p]["createdTime"] < before
+            ]
+        if self._arg("kinds") == "open-limit":
+            positions = [
+                p
+                for p in positions
+                if fixtures.bets[p]["limitProb"] is not None
+                and not fixtures.bets[p]["isFilled"]
+                and not fixtures.bets[p]["isCancelled"]
+            ]
+        ascending = self._arg("order", "desc") == "asc"
+        if not ascending:
+            positions = positions[::-1]
+        cursor = self._arg("after" if ascending else "before")
+        if cursor is not None:
+            target = fixtures.index["bets"].get(cursor)
+            if target is not None:
+                if isinstance(positions, range):
+                    start = target + 1 if ascending else len(fixtures.bets) - target
+                    positions = positions[start:]
+                else:
+                    positions = [
+                        p
+                        for p in positions
+                        if (p > target if ascending else p < target)
+                    ]
+        self._send(_page(fixtures.encoded["bets"], positions[:limit]))
+
+    def _place_bet(self) -> None:
+        contract_id = (self.body or {}).get("contractId")
+        if contract_id not in self.server.fixtures.index["markets"]:
+            return self._not_found()
+        with self.server.lock:
+            self.server.bet_count += 1
+            bet_id = f"new{self.server.bet_count:010d}"
+        response = {**(self.body or {}), "betId": bet_id, "isFilled": True, "fills": []}
+        self._send(_encode(response))
+
+    def _create_market(self) -> None:
+        with self.server.lock:
+            self.server.market_count += 1
+            market_id = f"newm{self.server.market_count:08d}"
+        self._send(_encode({**(self.body or {}), "id": market_id}))
+
+
+class FakeServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, address: tuple[str, int], fixtures: Fixtures):
+        super().__init__(address, Handler)
+        self.fixtures = fixtures
+        self.lock = threading.Lock()
+        self.bet_count = 0
+        self.market_count = 0
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def serve(fixtures: Fixtures | None = None, port: int = 0) -> FakeServer:
+    """Start a server on a background thread and return it; stop it with `shutdown()`."""
+    server = FakeServer(("127.0.0.1", port), fixtures or Fixtures())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class ServerProcess:
+    def __init__(self, **fixture_kwargs):
+        """
+        Run a server in a child process, so it does not share the GIL with the client.
+
+        Use as a context manager; `url` is set once the server is listening.
+        Fixtures are generated in the child from `fixture_kwargs` (see `Fixtures`).
+        """
+        self.fixture_kwargs = fixture_kwargs
+        self.url: str | None = None
+        self._process: multiprocessing.Process | None = None
+
+    def __enter__(self) -> "ServerProcess":
+        parent, child = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(
+            target=_serve_child, args=(child, self.fixture_kwargs), daemon=True
+        )
+        self._process.start()
+        self.url = parent.recv()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._process.terminate()
+        self._process.join()
+
+
+def _serve_child(conn, fixture_kwargs: dict) -> None:
+    server = FakeServer(("127.0.0.1", 0), Fixtures(**fixture_kwargs))
+    conn.send(server.url)
+    server.serve_forever()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--bets", type=int, default=100_000)
+    parser.add_argument("--markets", type=int, default=5000)
+    args = parser.parse_args()
+    server = FakeServer(
+        ("127.0.0.1", args.port), Fixtures(markets=args.markets, bets=args.bets)
+    )
+    print(f"Serving fake Manifold API on {server.url}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Import-time benchmark for `pymanifold`.
+
+Imports the package in fresh interpreters and reports the wall time. Exits
+non-zero if importing pulls in modules that should only load on first use, or
+if the median import time exceeds `--max-ms`.
+
+    python benchmarks/import_time.py --runs 20 --max-ms 150
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# Loaded lazily (models on first `Session.model` access, dotenv on first API key lookup).
+LAZY_MODULES = ["pydantic", "dotenv", "asyncio", "pymanifold.models"]
+
+PROBE = """
+import json, logging, sys, time
+start = time.perf_counter()
+import pymanifold
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    "seconds": elapsed,
+    "modules": sorted(sys.modules),
+    "root_handlers": len(logging.getLogger().handlers),
+}))
+"""
+
+
+def run_once() -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE], check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--max-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    results = [run_once() for _ in range(args.runs)]
+    times_ms = [result["seconds"] * 1000 for result in results]
+    median_ms = statistics.median(times_ms)
+    print(
+        json.dumps(
+            {
+                "benchmark": "import_time",
+                "runs": args.runs,
+                "min_ms": round(min(times_ms), 2),
+                "median_ms": round(median_ms, 2),
+                "max_ms": round(max(times_ms), 2),
+            }
+        )
+    )
+
+    failures = []
+    modules = results[0]["modules"]
+    for lazy in LAZY_MODULES:
+        if lazy in modules:
+            failures.append(f"`{lazy}` is imported eagerly by `import pymanifold`")
+    if results[0]["root_handlers"]:
+        failures.append("`import pymanifold` configures the root logger")
+    if args.max_ms is not None and median_ms > args.max_ms:
+        failures.append(f"median import time {median_ms:.1f}ms > {args.max_ms}ms")
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
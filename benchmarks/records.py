@@ -0,0 +1,120 @@
+"""
+Memory and construction benchmark for `pymanifold.records`.
+
+Decodes generated API responses (see `fake_server.py`) and reports, per object
+type, the memory held per row as plain dicts, validated records and trusted
+records, the time to decode a row and the time to build a record from it.
+
+    PYTHONPATH=. python benchmarks/records.py --rows 50000
+"""
+
+import argparse
+import gc
+import json
+import sys
+import time
+
+from fake_server import Fixtures
+
+from pymanifold.codec import get_default_codec
+from pymanifold.records import Bet, Comment, Market, Txn, User
+
+
+def deep_size(root) -> int:
+    """
+    Return the bytes held by `root` and every object reachable from it, each counted once.
+
+    Walks containers directly rather than diffing tracemalloc totals, which
+    also pick up (and release) the interpreter's own tables, such as the
+    interned string table, and made one variant's figure depend on which
+    ran before it.
+    """
+    seen = set()
+    stack = [root]
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple)):
+            stack.extend(obj)
+    return total
+
+
+def best_time(build, repeat: int) -> float:
+    """Return `build()`'s best time in seconds, excluding freeing its result."""
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        result = build()
+        timings.append(time.perf_counter() - started)
+        del result
+    return min(timings)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    fixtures = Fixtures(
+        users=min(args.rows, 2000),
+        markets=min(args.rows, 5000),
+        bets=args.rows,
+        comments=args.rows,
+        txns=args.rows,
+    )
+    codec = get_default_codec()
+    datasets = [
+        (Bet, fixtures.bets),
+        (Market, fixtures.markets),
+        (User, fixtures.users),
+        (Comment, fixtures.comments),
+        (Txn, fixtures.txns),
+    ]
+    for cls, rows in datasets:
+        body = codec.dumps(rows)
+        decode_seconds = best_time(lambda: codec.loads(body), args.repeat)
+        # Records are built from rows decoded once, outside the timer.
+        decoded = codec.loads(body)
+        variants = {
+            "dict": (lambda data: data, lambda: decoded),
+            "validated": (
+                lambda data: [cls.from_dict(row) for row in data],
+                lambda: [cls.from_dict(row) for row in decoded],
+            ),
+            "trusted": (
+                lambda data: [cls.from_dict(row, trusted=True) for row in data],
+                lambda: [cls.from_dict(row, trusted=True) for row in decoded],
+            ),
+        }
+        for name, (convert, build) in variants.items():
+            # Sized from a fresh decode, so no strings are shared with `decoded`.
+            size = deep_size(convert(codec.loads(body)))
+            build_seconds = 0.0 if name == "dict" else best_time(build, args.repeat)
+            print(
+                json.dumps(
+                    {
+                        "benchmark": "records",
+                        "type": cls.__name__,
+                        "variant": name,
+                        "rows": len(rows),
+                        "codec": codec.name,
+                        "bytes_per_row": round(size / len(rows)),
+                        "decode_us_per_row": round(decode_seconds / len(rows) * 1e6, 3),
+                        "build_us_per_row": round(build_seconds / len(rows) * 1e6, 3),
+                    }
+                )
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,28 +1,111 @@
-import json
-import os
 import importlib
-from pathlib import Path
 import logging
+import os
+import threading
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from pymanifold.client import (
+    API_BASE_URL,
+    AsyncClient,
+    Client,
+    get_default_async_client,
+    get_default_client,
+    set_default_async_client,
+    set_default_client,
+)
+from pymanifold.cache import (
+    MISS,
+    ResponseCache,
+    get_default_cache,
+    normalize_params,
+    resolve_cache,
+)
+from pymanifold.codec import JSONCodec, get_default_codec, set_default_codec
+from pymanifold.endpoints import ENDPOINTS
+from pymanifold.hooks import (
+    CACHE_HIT,
+    Hooks,
+    RequestEvent,
+    endpoint_template,
+    get_default_hooks,
+)
+from pymanifold.ratelimit import RateLimiter, get_default_rate_limiter
+from pymanifold.routes import Route, get_route
+from pymanifold.singleflight import (
+    SingleFlight,
+    get_default_single_flight,
+    resolve_single_flight,
+)
 
-import httpx
-from dotenv import load_dotenv
-from pydantic import BaseModel
+if TYPE_CHECKING:
+    import httpx
+    from pydantic import BaseModel
 
-load_dotenv()
+__all__ = [
+    "API_BASE_URL",
+    "API_KEY",
+    "API_KEY_ENV",
+    "ENDPOINTS",
+    "AsyncClient",
+    "Client",
+    "Hooks",
+    "JSONCodec",
+    "RateLimiter",
+    "ResponseCache",
+    "Route",
+    "Session",
+    "SingleFlight",
+    "call_manifold_api",
+    "get_api_key",
+    "get_default_async_client",
+    "get_default_cache",
+    "get_default_client",
+    "get_default_codec",
+    "get_default_hooks",
+    "get_default_rate_limiter",
+    "get_default_single_flight",
+    "get_model",
+    "get_route",
+    "set_default_async_client",
+    "set_default_client",
+    "set_default_codec",
+]
 
-API_BASE_URL = "https://api.manifold.markets"
-API_KEY = os.getenv("MANIFOLD_API_KEY")
+API_KEY_ENV = "MANIFOLD_API_KEY"
 
-API_DOC_PATH = Path("api.md")
 MODELS_MODULE = "pymanifold.models"
 
 DEPRECATED = "deprecated"
 
-CURRENT_DIR = Path(__file__).parent
-ENDPOINTS: dict[str, dict[str, str]] = json.load(open(f"{CURRENT_DIR}/endpoints.json"))
-
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
+
+_dotenv_loaded = False
+_dotenv_lock = threading.Lock()
+
+
+def get_api_key() -> str | None:
+    """
+    Return the API key from the `MANIFOLD_API_KEY` environment variable.
+
+    A `.env` file is loaded the first time this is called rather than when
+    the package is imported.
+    """
+    global _dotenv_loaded
+    with _dotenv_lock:
+        if not _dotenv_loaded:
+            from dotenv import load_dotenv
+
+            load_dotenv()
+            _dotenv_loaded = True
+    return os.getenv(API_KEY_ENV)
+
+
+def __getattr__(name: str):
+    # `API_KEY` used to be read at import time; keep it available, lazily.
+    if name == "API_KEY":
+        return get_api_key()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class Session:
@@ -30,7 +113,9 @@ class Session:
         self,
         endpoint: str,
         version: str = "v0",
-        api_key: str | None = API_KEY,
+        api_key: str | None = None,
+        client: Client | None = None,
+        trusted: bool = False,
     ):
         """
         Create a session for interacting with the Manifold Markets API.
@@ -38,7 +123,9 @@ class Session:
         Args:
             endpoint: API endpoint path (e.g. "/bet")
             version: API version (default is "v0")
-            api_key: Optional API key for authenticated endpoints
+            api_key: Optional API key (defaults to `MANIFOLD_API_KEY`)
+            client: Optional pooled client (defaults to the shared client)
+            trusted: Skip validating payloads against the endpoint's model
         """
         if endpoint.startswith("/v0") or endpoint.startswith("v0"):
             endpoint = endpoint.replace("/v0", "")
@@ -48,13 +135,52 @@ class Session:
             raise ValueError("Only v0 is supported")
 
         self.api_key = api_key
+        self.client = client
+        self.trusted = trusted
         self.endpoint = f"/{version}{endpoint}"
-        self.method = ENDPOINTS.get(self.endpoint, {}).get("method")
-        self.model = get_model(self.endpoint)
+        self.template = self.endpoint
+        self.route = get_route(self.template)
+        self.method = self.route.method
+
+    @property
+    def model(self) -> type["BaseModel"]:
+        """Generated model for the endpoint, imported on first access."""
+        return get_model(self.template)
 
     def __repr__(self) -> str:
         return f"Session(endpoint={self.endpoint})"
 
+    def url(self, url_params: dict | None = None) -> str:
+        """Return the request path for these URL parameters; the session itself is not modified."""
+        return self.route.format(url_params)
+
+    def validate(
+        self,
+        url_params: dict | None = None,
+        params: dict | None = None,
+        json_data: dict | None = None,
+    ) -> None:
+        """
+        Validate a request against the endpoint's generated model without sending it.
+
+        Endpoints without a generated model are not validated.
+
+        Raises:
+            pydantic.ValidationError: If the payload does not match the model
+        """
+        try:
+            model = self.model
+        except ValueError as e:
+            if ENDPOINTS.get(self.template, {}).get("module_path") is None:
+                logger.debug(f"No model to validate {self.template} against")
+            else:
+                logger.warning(f"Sending {self.template} unvalidated: {e}")
+            return
+        from pymanifold.validation import validate_request
+
+        payload = params if self.method == "GET" else json_data
+        validate_request(model, url_params, payload)
+
     def execute(
         self,
         url_params: dict | None = None,
@@ -64,33 +190,41 @@ class Session:
         """
         Execute the session.
 
+        The session is not modified, so it can be reused for other URL
+        parameters, including concurrently from several threads.
+
         Args:
             url_params: URL parameters to replace in the endpoint (eg. {"username": "johndoe"} for "/v0/user/[username]")
             params: Query parameters to pass to the API
             json_data: JSON data to pass to the API
         """
-        if url_params:
-            for url_param, value in url_params.items():
-                self.endpoint = self.endpoint.replace(f"[{url_param}]", value)
+        if not self.trusted:
+            self.validate(url_params, params, json_data)
         return call_manifold_api(
-            self.endpoint,
+            self.route.format(url_params),
             method=self.method,
             params=params,
             json_data=json_data,
             api_key=self.api_key,
+            client=self.client,
         )
 
 
-def get_model(endpoint: str) -> BaseModel:
-    module_path = MODELS_MODULE + ENDPOINTS.get(endpoint, {}).get("module_path")
+@lru_cache(maxsize=None)
+def get_model(endpoint: str) -> type["BaseModel"]:
+    module_path = ENDPOINTS.get(endpoint, {}).get("module_path")
     model_name = ENDPOINTS.get(endpoint, {}).get("model_name")
-    logger.info(f"module_path: {module_path}")
-    logger.info(f"model_name: {model_name}")
+    if module_path is None or model_name is None:
+        raise ValueError(f"Model not found for endpoint: {endpoint}")
+    logger.debug(f"module_path: {MODELS_MODULE + module_path}")
+    logger.debug(f"model_name: {model_name}")
 
     try:
-        client = getattr(importlib.import_module(module_path), model_name)
-    except ModuleNotFoundError:
-        raise ValueError(f"Model not found for endpoint: {endpoint}")
+        client = getattr(
+            importlib.import_module(MODELS_MODULE + module_path), model_name
+        )
+    except (ModuleNotFoundError, AttributeError) as e:
+        raise ValueError(f"Model not found for endpoint: {endpoint} ({e})") from e
 
     return client
 
@@ -100,7 +234,10 @@ def call_manifold_api(
     method: str = "GET",
     params: dict | None = None,
     json_data: dict | None = None,
-    api_key: str | None = API_KEY,
+    api_key: str | None = None,
+    client: Client | None = None,
+    cache: ResponseCache | bool | None = None,
+    coalesce: SingleFlight | bool | None = None,
 ) -> dict:
     """Make a request to the Manifold Markets API.
 
@@ -111,7 +248,11 @@ def call_manifold_api(
         method: HTTP method to use ("GET", "POST", etc)
         params: Optional query parameters
         json_data: Optional JSON data for POST/PUT requests
-        api_key: Optional API key for authenticated endpoints
+        api_key: Optional API key (defaults to `MANIFOLD_API_KEY`)
+        client: Optional pooled client (defaults to the shared client)
+        cache: Optional response cache, or True for the shared cache (off by default)
+        coalesce: Optional coalescer sharing one request between concurrent identical GETs,
+            or True for the shared one (off by default)
 
     Returns:
         API response as a dictionary
@@ -119,18 +260,48 @@ def call_manifold_api(
     Raises:
         httpx.HTTPError: If the request fails
     """
-    url = f"{API_BASE_URL}{endpoint}"
+    if client is None:
+        client = get_default_client()
+    if api_key is None:
+        api_key = get_api_key()
+
+    cache = resolve_cache(cache, write=method != "GET")
+    if cache is not None and method == "GET":
+        cached = cache.get(endpoint, params, api_key)
+        if cached is not MISS:
+            if client.hooks:
+                client.hooks.emit(
+                    RequestEvent(
+                        CACHE_HIT, method, endpoint, endpoint_template(endpoint)
+                    )
+                )
+            return cached
 
     headers = {}
     if api_key:
         headers["Authorization"] = f"Key {api_key}"
 
-    response = httpx.request(
-        method=method,
-        url=url,
-        params=params,
-        json=json_data,
-        headers=headers if headers else None,
-    )
+    def fetch() -> "httpx.Response":
+        return client.request(
+            method=method,
+            endpoint=endpoint,
+            params=params,
+            json=json_data,
+            headers=headers if headers else None,
+        )
+
+    flight = resolve_single_flight(coalesce)
+    if flight is not None and method == "GET":
+        key = (client, api_key, endpoint, normalize_params(params))
+        response = flight.do(key, fetch)
+    else:
+        response = fetch()
+    # Coalesced callers share the response, but each raises and decodes its own copy.
     response.raise_for_status()
-    return response.json()
+    result = client.decode(response)
+    if cache is not None:
+        if method == "GET":
+            cache.set(endpoint, params, result, api_key)
+        else:
+            cache.invalidate_write(endpoint, json_data)
+    return result
@@ -0,0 +1,173 @@
+import asyncio
+from typing import Any, Awaitable, Iterable
+
+import httpx
+
+from pymanifold import Session, get_api_key
+from pymanifold.cache import MISS, ResponseCache, normalize_params, resolve_cache
+from pymanifold.client import AsyncClient, get_default_async_client
+from pymanifold.hooks import CACHE_HIT, RequestEvent, endpoint_template
+from pymanifold.singleflight import SingleFlight, resolve_single_flight
+
+DEFAULT_CONCURRENCY = 100
+
+
+class AsyncSession(Session):
+    def __init__(
+        self,
+        endpoint: str,
+        version: str = "v0",
+        api_key: str | None = None,
+        client: AsyncClient | None = None,
+        trusted: bool = False,
+    ):
+        """
+        Create an asyncio session for interacting with the Manifold Markets API.
+
+        Endpoints are resolved exactly as for `Session`; only `execute` differs.
+
+        Args:
+            endpoint: API endpoint path (e.g. "/bet")
+            version: API version (default is "v0")
+            api_key: Optional API key (defaults to `MANIFOLD_API_KEY`)
+            client: Optional pooled async client (defaults to the shared async client)
+            trusted: Skip validating payloads against the endpoint's model
+        """
+        super().__init__(endpoint, version=version, api_key=api_key, trusted=trusted)
+        self.client = client
+
+    def __repr__(self) -> str:
+        return f"AsyncSession(endpoint={self.endpoint})"
+
+    async def execute(
+        self,
+        url_params: dict | None = None,
+        params: dict | None = None,
+        json_data: dict | None = None,
+    ) -> dict:
+        """
+        Execute the session.
+
+        The session is not modified, so it can be reused for other URL
+        parameters, including concurrently from several tasks.
+
+        Args:
+            url_params: URL parameters to replace in the endpoint (eg. {"username": "johndoe"} for "/v0/user/[username]")
+            params: Query parameters to pass to the API
+            json_data: JSON data to pass to the API
+        """
+        if not self.trusted:
+            self.validate(url_params, params, json_data)
+        return await call_manifold_api(
+            self.route.format(url_params),
+            method=self.method,
+            params=params,
+            json_data=json_data,
+            api_key=self.api_key,
+            client=self.client,
+        )
+
+
+async def call_manifold_api(
+    endpoint: str,
+    method: str = "GET",
+    params: dict | None = None,
+    json_data: dict | None = None,
+    api_key: str | None = None,
+    client: AsyncClient | None = None,
+    cache: ResponseCache | bool | None = None,
+    coalesce: SingleFlight | bool | None = None,
+) -> dict:
+    """Make an asynchronous request to the Manifold Markets API.
+
+    Used by the AsyncSession.execute() method but made available for direct use.
+
+    Args:
+        endpoint: API endpoint path (e.g. "/v0/me")
+        method: HTTP method to use ("GET", "POST", etc)
+        params: Optional query parameters
+        json_data: Optional JSON data for POST/PUT requests
+        api_key: Optional API key (defaults to `MANIFOLD_API_KEY`)
+        client: Optional pooled async client (defaults to the shared async client)
+        cache: Optional response cache, or True for the shared cache (off by default)
+        coalesce: Optional coalescer sharing one request between concurrent identical GETs,
+            or True for the shared one (off by default)
+
+    Returns:
+        API response as a dictionary
+
+    Raises:
+        httpx.HTTPError: If the request fails
+    """
+    if client is None:
+        client = get_default_async_client()
+    if api_key is None:
+        api_key = get_api_key()
+
+    cache = resolve_cache(cache, write=method != "GET")
+    if cache is not None and method == "GET":
+        cached = cache.get(endpoint, params, api_key)
+        if cached is not MISS:
+            if client.hooks:
+                client.hooks.emit(
+                    RequestEvent(
+                        CACHE_HIT, method, endpoint, endpoint_template(endpoint)
+                    )
+                )
+            return cached
+
+    headers = {}
+    if api_key:
+        headers["Authorization"] = f"Key {api_key}"
+
+    async def fetch() -> httpx.Response:
+        return await client.request(
+            method=method,
+            endpoint=endpoint,
+            params=params,
+            json=json_data,
+            headers=headers if headers else None,
+        )
+
+    flight = resolve_single_flight(coalesce)
+    if flight is not None and method == "GET":
+        key = (client, api_key, endpoint, normalize_params(params))
+        response = await flight.ado(key, fetch)
+    else:
+        response = await fetch()
+    # Coalesced callers share the response, but each raises and decodes its own copy.
+    response.raise_for_status()
+    result = client.decode(response)
+    if cache is not None:
+        if method == "GET":
+            cache.set(endpoint, params, result, api_key)
+        else:
+            cache.invalidate_write(endpoint, json_data)
+    return result
+
+
+async def gather(
+    aws: Iterable[Awaitable[Any]],
+    limit: int = DEFAULT_CONCURRENCY,
+    return_exceptions: bool = False,
+) -> list[Any]:
+    """
+    Await many requests with at most `limit` of them in flight at once.
+
+    Results are returned in the same order as `aws`. Keep `limit` at or below
+    the client's `max_connections` unless the client uses HTTP/2.
+
+    Args:
+        aws: Awaitables to run (e.g. `session.execute(...)` coroutines)
+        limit: Maximum number of awaitables running concurrently
+        return_exceptions: Return exceptions in the results instead of raising the first one
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(aw: Awaitable[Any]) -> Any:
+        async with semaphore:
+            return await aw
+
+    return await asyncio.gather(
+        *(run(aw) for aw in aws), return_exceptions=return_exceptions
+    )
@@ -0,0 +1,219 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+try:
+    import numpy as np
+except ImportError as e:  # no cov
+    raise ImportError(
+        "pymanifold.analytics requires numpy, install it with `pip install pymanifold[numpy]`"
+    ) from e
+
+if TYPE_CHECKING:
+    from pymanifold.store import BetStore
+
+MISSING = -1
+KEY_LIMIT = 2**62
+
+
+@dataclass
+class Positions:
+    """
+    Per (user, contract, answer, outcome) positions, one row per group.
+
+    Identifier columns hold the integer codes passed in; money columns are in
+    mana. Costs use the average price paid, so selling part of a position
+    realizes profit against that average.
+    """
+
+    user: np.ndarray
+    contract: np.ndarray
+    answer: np.ndarray
+    outcome: np.ndarray
+    shares: np.ndarray
+    bought: np.ndarray
+    sold: np.ndarray
+    cost_basis: np.ndarray
+    realized: np.ndarray
+    price: np.ndarray
+    value: np.ndarray
+    unrealized: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.user)
+
+    def select(self, mask: np.ndarray) -> "Positions":
+        """Return the positions where `mask` is true (or at the given indices)."""
+        return Positions(
+            **{name: getattr(self, name)[mask] for name in self.__dataclass_fields__}
+        )
+
+    @property
+    def profit(self) -> np.ndarray:
+        return self.realized + self.unrealized
+
+
+def _group(*codes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Return the first row index of each distinct code tuple and each row's group."""
+    key = np.zeros(len(codes[0]), dtype=np.int64)
+    bound = 1
+    for column in codes:
+        column = np.asarray(column, dtype=np.int64) + 1  # MISSING (-1) becomes 0
+        size = int(column.max(initial=0)) + 1
+        if bound * size >= KEY_LIMIT:
+            # Re-densify the key so far so that combining it cannot overflow.
+            _, key = np.unique(key, return_inverse=True)
+            key = key.reshape(-1).astype(np.int64)
+            bound = int(key.max(initial=0)) + 1
+        key = key * size + column
+        bound *= size
+    _, first, group = np.unique(key, return_index=True, return_inverse=True)
+    return first, group.reshape(-1)
+
+
+def latest_prob(
+    contract: np.ndarray,
+    answer: np.ndarray,
+    created_time: np.ndarray,
+    prob_after: np.ndarray,
+) -> np.ndarray:
+    """
+    Return, for every bet, the `probAfter` of the latest bet on the same contract and answer.
+
+    This is the market's YES probability as of the newest bet in the arrays,
+    used as the default price for marking positions to market.
+    """
+    first, group = _group(contract, answer)
+    if len(group) == 0:
+        return np.empty(0)
+    order = np.lexsort((created_time, group))
+    ordered = group[order]
+    is_last = np.append(ordered[1:] != ordered[:-1], True)
+    prob = np.empty(len(first))
+    prob[ordered[is_last]] = np.asarray(prob_after, dtype=np.float64)[order[is_last]]
+    return prob[group]
+
+
+def compute_positions(
+    user: np.ndarray,
+    contract: np.ndarray,
+    outcome: np.ndarray,
+    amount: np.ndarray,
+    shares: np.ndarray,
+    yes: int,
+    answer: np.ndarray | None = None,
+    prob: np.ndarray | None = None,
+) -> Positions:
+    """
+    Compute positions and profit with grouped vectorized reductions.
+
+    Bets with a positive `amount` are buys; negative amounts are sales, whose
+    (negative) shares reduce the position.
+
+    Args:
+        user: Integer user code per bet
+        contract: Integer contract code per bet
+        outcome: Integer outcome code per bet
+        amount: Mana spent per bet (negative for sales)
+        shares: Shares bought per bet (negative for sales)
+        yes: Outcome code of "YES"; every other outcome is priced as NO
+        answer: Optional integer answer code per bet (-1 for binary markets)
+        prob: YES probability per bet used to price the position (e.g. `latest_prob(...)`);
+            positions are not marked to market when omitted
+
+    Returns:
+        A `Positions` table with one row per (user, contract, answer, outcome)
+    """
+    amount = np.asarray(amount, dtype=np.float64)
+    shares = np.asarray(shares, dtype=np.float64)
+    if answer is None:
+        answer = np.full(len(amount), MISSING, dtype=np.int64)
+    first, group = _group(user, contract, answer, outcome)
+    groups = len(first)
+
+    def total(weights: np.ndarray) -> np.ndarray:
+        return np.bincount(group, weights=weights, minlength=groups)
+
+    buy = amount > 0
+    bought = total(np.where(buy, amount, 0.0))
+    bought_shares = total(np.where(buy, shares, 0.0))
+    sold = total(np.where(buy, 0.0, -amount))
+    sold_shares = total(np.where(buy, 0.0, -shares))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        average_price = np.where(bought_shares > 0, bought / bought_shares, 0.0)
+    held = bought_shares - sold_shares
+    cost_basis = held * average_price
+    realized = sold - sold_shares * average_price
+
+    group_outcome = np.asarray(outcome)[first]
+    if prob is None:
+        price = np.full(groups, np.nan)
+    else:
+        yes_prob = np.asarray(prob, dtype=np.float64)[first]
+        price = np.where(group_outcome == yes, yes_prob, 1.0 - yes_prob)
+    value = held * price
+    unrealized = value - cost_basis
+
+    return Positions(
+        user=np.asarray(user)[first],
+        contract=np.asarray(contract)[first],
+        answer=np.asarray(answer)[first],
+        outcome=group_outcome,
+        shares=held,
+        bought=bought,
+        sold=sold,
+        cost_basis=cost_basis,
+        realized=realized,
+        price=price,
+        value=value,
+        unrealized=unrealized,
+    )
+
+
+def positions_from_store(store: "BetStore") -> Positions:
+    """Compute positions over every bet in a `BetStore`, priced at each market's latest probability."""
+    outcomes = store.labels("outcome").tolist()
+    yes = outcomes.index("YES") if "YES" in outcomes else MISSING
+    contract, answer = store["contractId"], store["answerId"]
+    return compute_positions(
+        user=store["userId"],
+        contract=contract,
+        outcome=store["outcome"],
+        amount=store["amount"],
+        shares=store["shares"],
+        yes=yes,
+        answer=answer,
+        prob=latest_prob(contract, answer, store["createdTime"], store["probAfter"]),
+    )
+
+
+def top_holders(
+    positions: Positions,
+    contract: int,
+    n: int = 10,
+    by: str = "shares",
+    answer: int | None = None,
+    outcome: int | None = None,
+) -> Positions:
+    """
+    Return the `n` largest positions in a contract, largest first.
+
+    Args:
+        positions: Output of `compute_positions`
+        contract: Contract code to rank holders of
+        n: Number of holders to return
+        by: `Positions` column to rank by (e.g. "shares", "value", "profit")
+        answer: Optional answer code to restrict to
+        outcome: Optional outcome code to restrict to
+    """
+    mask = positions.contract == contract
+    if answer is not None:
+        mask &= positions.answer == answer
+    if outcome is not None:
+        mask &= positions.outcome == outcome
+    index = np.flatnonzero(mask)
+    score = getattr(positions, by)[index]
+    if len(index) > n:
+        keep = np.argpartition(-score, n - 1)[:n]
+        index, score = index[keep], score[keep]
+    return positions.select(index[np.argsort(-score, kind="stable")])
@@ -0,0 +1,263 @@
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterator
+
+from pymanifold import call_manifold_api
+from pymanifold.client import Client
+
+TXNS_ENDPOINT = "/v0/txns"
+MANAGRAMS_ENDPOINT = "/v0/managrams"
+MAX_PAGE_SIZE = 100
+
+HOUR_MS = 60 * 60 * 1000
+DAY_MS = 24 * HOUR_MS
+DEFAULT_MAX_WORKERS = 8
+
+
+def split_windows(start: float, end: float, window: float) -> list[tuple[float, float]]:
+    """
+    Split the half-open range [start, end) into consecutive windows, oldest first.
+
+    Args:
+        start: Range start (ms since epoch, inclusive)
+        end: Range end (ms since epoch, exclusive)
+        window: Window length in ms
+    """
+    if window <= 0:
+        raise ValueError("window must be positive")
+    windows = []
+    lo = start
+    while lo < end:
+        hi = min(lo + window, end)
+        windows.append((lo, hi))
+        lo = hi
+    return windows
+
+
+def fetch_window(
+    endpoint: str,
+    lo: float,
+    hi: float,
+    params: dict | None = None,
+    page_size: int = MAX_PAGE_SIZE,
+    time_field: str = "createdTime",
+    id_field: str = "id",
+    offset_param: str | None = None,
+    api_key: str | None = None,
+    client: Client | None = None,
+) -> list[dict]:
+    """
+    Fetch every row with `lo <= createdTime < hi`, newest first.
+
+    Pages are walked by moving `before` to the oldest timestamp seen. Rows that
+    share that timestamp are requested again on the next page and dropped by id,
+    so rows are neither lost nor duplicated at page boundaries. When a whole
+    page shares one timestamp, the rows at that instant are paged by
+    `offset_param` instead.
+
+    Raises:
+        RuntimeError: If more than `page_size` rows share a timestamp and the
+            endpoint has no offset parameter to page through them
+    """
+    rows: list[dict] = []
+    before = hi
+    boundary_ids: set = set()
+    while True:
+        page = call_manifold_api(
+            endpoint,
+            params={
+                **(params or {}),
+                "after": lo - 1,
+                "before": before,
+                "limit": page_size,
+            },
+            api_key=api_key,
+            client=client,
+        )
+        fresh = [
+            row
+            for row in page
+            if lo <= row[time_field] < hi and row[id_field] not in boundary_ids
+        ]
+        rows.extend(fresh)
+        if len(page) < page_size:
+            return rows
+        oldest = page[-1][time_field]
+        if page[0][time_field] == oldest:
+            # Moving `before` cannot get past a page that is all one instant.
+            if offset_param is None:
+                raise RuntimeError(
+                    f"More than {page_size} rows at {endpoint} time {oldest} and no "
+                    "offset parameter to page through them"
+                )
+            seen = boundary_ids | {row[id_field] for row in fresh}
+            rows.extend(
+                _fetch_instant(
+                    endpoint,
+                    oldest,
+                    seen,
+                    params,
+                    page_size,
+                    id_field,
+                    offset_param,
+                    api_key,
+                    client,
+                )
+            )
+            before = oldest
+            boundary_ids = set()
+            continue
+        boundary_ids = {row[id_field] for row in page if row[time_field] == oldest}
+        before = oldest + 1
+
+
+def _fetch_instant(
+    endpoint: str,
+    instant: float,
+    seen: set,
+    params: dict | None,
+    page_size: int,
+    id_field: str,
+    offset_param: str,
+    api_key: str | None,
+    client: Client | None,
+) -> list[dict]:
+    """Fetch the rows created at exactly `instant` that are not in `seen`, paging by offset."""
+    rows: list[dict] = []
+    offset = 0
+    while True:
+        page = call_manifold_api(
+            endpoint,
+            params={
+                **(params or {}),
+                "after": instant - 1,
+                "before": instant + 1,
+                "limit": page_size,
+                offset_param: offset,
+            },
+            api_key=api_key,
+            client=client,
+        )
+        for row in page:
+            if row[id_field] not in seen:
+                seen.add(row[id_field])
+                rows.append(row)
+        if len(page) < page_size:
+            return rows
+        offset += len(page)
+
+
+def backfill(
+    endpoint: str,
+    start: float,
+    end: float | None = None,
+    params: dict | None = None,
+    window: float = DAY_MS,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    order: str = "desc",
+    page_size: int = MAX_PAGE_SIZE,
+    time_field: str = "createdTime",
+    id_field: str = "id",
+    offset_param: str | None = None,
+    api_key: str | None = None,
+    client: Client | None = None,
+) -> Iterator[dict]:
+    """
+    Backfill a timestamp-paginated endpoint by fetching time windows concurrently.
+
+    The range is split into windows that are fetched on a thread pool and
+    yielded in order as soon as every earlier window is complete. Windows are
+    half-open, so each row belongs to exactly one window. At most
+    `2 * max_workers` windows are buffered at a time; closing the generator
+    early cancels the windows not yet started.
+
+    Args:
+        endpoint: API endpoint path (e.g. "/v0/txns")
+        start: Range start (ms since epoch, inclusive)
+        end: Range end (ms since epoch, exclusive; defaults to now)
+        params: Extra query parameters sent with every page (e.g. {"toId": "..."})
+        window: Window length in ms
+        max_workers: Number of windows fetched concurrently
+        order: "desc" (newest first, as the API returns rows) or "asc"
+        page_size: Rows requested per page
+        time_field: Row field holding the timestamp
+        id_field: Row field holding the unique id
+        offset_param: Query parameter for paging through more than `page_size`
+            rows with the same timestamp, if the endpoint has one (see `fetch_window`)
+        api_key: Optional API key (defaults to `MANIFOLD_API_KEY`)
+        client: Optional pooled client (defaults to the shared client)
+    """
+    if order not in ("asc", "desc"):
+        raise ValueError("order must be 'asc' or 'desc'")
+    if end is None:
+        end = time.time() * 1000
+    windows = split_windows(start, end, window)
+    if order == "desc":
+        windows.reverse()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pending: deque[Future] = deque()
+        try:
+            for lo, hi in windows:
+                pending.append(
+                    pool.submit(
+                        fetch_window,
+                        endpoint,
+                        lo,
+                        hi,
+                        params=params,
+                        page_size=page_size,
+                        time_field=time_field,
+                        id_field=id_field,
+                        offset_param=offset_param,
+                        api_key=api_key,
+                        client=client,
+                    )
+                )
+                if len(pending) >= 2 * max_workers:
+                    yield from _window_rows(pending.popleft(), order)
+            while pending:
+                yield from _window_rows(pending.popleft(), order)
+        finally:
+            # Reached early when the consumer stops iterating; don't fetch windows nobody will read.
+            for future in pending:
+                future.cancel()
+
+
+def _window_rows(future: Future, order: str) -> list[dict]:
+    rows = future.result()
+    if order == "asc":
+        rows.reverse()
+    return rows
+
+
+def backfill_txns(
+    start: float, end: float | None = None, params: dict | None = None, **kwargs
+) -> Iterator[dict]:
+    """
+    Backfill `/v0/txns` over [start, end). See `backfill` for the keyword arguments.
+
+    Rows sharing a timestamp beyond one page are paged with `offset`.
+
+    Args:
+        start: Range start (ms since epoch, inclusive)
+        end: Range end (ms since epoch, exclusive; defaults to now)
+        params: Query parameters accepted by `pymanifold.models.txns.Txns`
+    """
+    kwargs.setdefault("offset_param", "offset")
+    return backfill(TXNS_ENDPOINT, start, end, params=params, **kwargs)
+
+
+def backfill_managrams(
+    start: float, end: float | None = None, params: dict | None = None, **kwargs
+) -> Iterator[dict]:
+    """
+    Backfill `/v0/managrams` over [start, end). See `backfill` for the keyword arguments.
+
+    Args:
+        start: Range start (ms since epoch, inclusive)
+        end: Range end (ms since epoch, exclusive; defaults to now)
+        params: Query parameters accepted by `pymanifold.models.managrams.Managrams`
+    """
+    return backfill(MANAGRAMS_ENDPOINT, start, end, params=params, **kwargs)
@@ -0,0 +1,266 @@
+import asyncio
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Mapping, Sequence
+
+from pymanifold import call_manifold_api, get_model
+from pymanifold import aio
+from pymanifold.client import (
+    AsyncClient,
+    Client,
+    get_default_async_client,
+    get_default_client,
+)
+from pymanifold.ratelimit import RateLimiter
+
+if TYPE_CHECKING:
+    from pymanifold.models.bet import Bet
+
+BET_ENDPOINT = "/v0/bet"
+DEFAULT_CONCURRENCY = 16
+
+
+class DependencyError(Exception):
+    """Raised for a bet that was not placed because one of its `deps` failed."""
+
+
+@dataclass
+class BetResult:
+    key: str
+    request: dict
+    response: dict | None = None
+    error: BaseException | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.response is not None
+
+
+@dataclass
+class BatchReport:
+    results: list[BetResult] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def __iter__(self):
+        return iter(self.results)
+
+    @property
+    def succeeded(self) -> list[BetResult]:
+        return [result for result in self.results if result.ok]
+
+    @property
+    def failed(self) -> list[BetResult]:
+        return [result for result in self.results if not result.ok]
+
+    def raise_for_errors(self) -> None:
+        """Raise the first error in the batch, if any."""
+        for result in self.results:
+            if result.error is not None:
+                raise result.error
+
+
+def _prepare(
+    bets: "Sequence[Bet | dict] | Mapping[str, Bet | dict]",
+    dry_run: bool | None,
+    trusted: bool,
+) -> tuple[dict[str, dict], dict[str, list[str]]]:
+    """Return the JSON payload and in-batch dependencies of each bet, keyed and ordered."""
+    if isinstance(bets, Mapping):
+        items = [(str(key), bet) for key, bet in bets.items()]
+    else:
+        items = [(str(index), bet) for index, bet in enumerate(bets)]
+
+    validate = None
+    if not trusted:
+        from pymanifold.validation import validate_request
+
+        model = get_model(BET_ENDPOINT)
+
+        def validate(payload):
+            return validate_request(model, None, payload)
+
+    payloads: dict[str, dict] = {}
+    for key, bet in items:
+        if hasattr(bet, "model_dump"):
+            payload = bet.model_dump(mode="json", exclude_unset=True)
+        else:
+            payload = dict(bet)
+        if dry_run is not None:
+            payload["dryRun"] = dry_run
+        if validate is not None:
+            validate(payload)
+        payloads[key] = payload
+
+    # Only mapping keys are chosen by the caller; list indexes would collide with
+    # real bet ids such as "0", so a list's `deps` are all sent to the API.
+    in_batch = payloads if isinstance(bets, Mapping) else {}
+    deps = {
+        key: [dep for dep in payload.get("deps") or [] if dep in in_batch]
+        for key, payload in payloads.items()
+    }
+    _check_acyclic(deps)
+    return payloads, deps
+
+
+def _check_acyclic(deps: dict[str, list[str]]) -> None:
+    done: set[str] = set()
+    visiting: set[str] = set()
+
+    def visit(key: str) -> None:
+        if key in done:
+            return
+        if key in visiting:
+            raise ValueError(f"Bet {key!r} has a circular dependency")
+        visiting.add(key)
+        for dep in deps[key]:
+            visit(dep)
+        visiting.discard(key)
+        done.add(key)
+
+    for key in deps:
+        visit(key)
+
+
+def _check_deps(
+    payload: dict, deps: list[str], results: dict[str, BetResult]
+) -> tuple[dict, BaseException | None]:
+    """
+    Check that the in-batch `deps` of a bet succeeded and drop them from its payload.
+
+    In-batch keys only order the batch on the client side; they are not sent
+    as the API's `deps`, whose other entries are passed through unchanged.
+    """
+    if not deps:
+        return payload, None
+    for dep in deps:
+        if not results[dep].ok:
+            return payload, DependencyError(f"Dependency {dep!r} failed")
+    external = [dep for dep in payload["deps"] if dep not in deps]
+    payload = {key: value for key, value in payload.items() if key != "deps"}
+    if external:
+        payload["deps"] = external
+    return payload, None
+
+
+def place_bets(
+    bets: "Sequence[Bet | dict] | Mapping[str, Bet | dict]",
+    max_concurrency: int = DEFAULT_CONCURRENCY,
+    dry_run: bool | None = None,
+    trusted: bool = False,
+    rate_limiter: RateLimiter | None = None,
+    api_key: str | None = None,
+    client: Client | None = None,
+) -> BatchReport:
+    """
+    Place many bets concurrently over the pooled connections.
+
+    Bets are sent as soon as they are ready, with at most `max_concurrency`
+    requests in flight. When `bets` is a mapping, a bet's `deps` may name
+    other keys of the mapping: it is sent only after those bets succeed, and
+    those keys are removed from the `deps` sent to the API. Failures never
+    stop the rest of the batch; they are collected in the report instead.
+
+    Requests are throttled by the client's rate limiter, whose default write
+    budget is shared with every other write; pass `rate_limiter` to give the
+    batch its own budget (the API's own limits still apply).
+
+    Args:
+        bets: `pymanifold.models.bet.Bet` objects or dicts, as a sequence or keyed mapping
+        max_concurrency: Maximum number of bet requests in flight
+        dry_run: If set, overrides `dryRun` on every bet
+        trusted: Skip validating bets against the `Bet` model
+        rate_limiter: Optional rate limiter used for this batch instead of the client's
+            (e.g. `RateLimiter({"write": (8.0, 20)})`)
+        api_key: Optional API key (defaults to `MANIFOLD_API_KEY`)
+        client: Optional pooled client (defaults to the shared client)
+
+    Returns:
+        A `BatchReport` with one `BetResult` per bet, in input order
+
+    Raises:
+        pydantic.ValidationError: If a bet is invalid (nothing is sent)
+        ValueError: If the in-batch `deps` form a cycle (nothing is sent)
+    """
+    payloads, deps = _prepare(bets, dry_run, trusted)
+    if rate_limiter is not None:
+        client = (client or get_default_client()).with_rate_limiter(rate_limiter)
+    results: dict[str, BetResult] = {}
+    waiting = dict(deps)
+
+    def send(payload: dict) -> dict:
+        return call_manifold_api(
+            BET_ENDPOINT,
+            method="POST",
+            json_data=payload,
+            api_key=api_key,
+            client=client,
+        )
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+        running: dict[Future, tuple[str, dict]] = {}
+        while waiting or running:
+            for key in [k for k, d in waiting.items() if all(x in results for x in d)]:
+                del waiting[key]
+                payload, error = _check_deps(payloads[key], deps[key], results)
+                if error is not None:
+                    results[key] = BetResult(key, payload, error=error)
+                    continue
+                running[pool.submit(send, payload)] = (key, payload)
+            if not running:
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                key, payload = running.pop(future)
+                error = future.exception()
+                results[key] = BetResult(
+                    key,
+                    payload,
+                    response=None if error else future.result(),
+                    error=error,
+                )
+
+    return BatchReport([results[key] for key in payloads])
+
+
+async def place_bets_async(
+    bets: "Sequence[Bet | dict] | Mapping[str, Bet | dict]",
+    max_concurrency: int = DEFAULT_CONCURRENCY,
+    dry_run: bool | None = None,
+    trusted: bool = False,
+    rate_limiter: RateLimiter | None = None,
+    api_key: str | None = None,
+    client: AsyncClient | None = None,
+) -> BatchReport:
+    """Asyncio counterpart of `place_bets`."""
+    payloads, deps = _prepare(bets, dry_run, trusted)
+    if rate_limiter is not None:
+        client = (client or get_default_async_client()).with_rate_limiter(rate_limiter)
+    results: dict[str, BetResult] = {}
+    done = {key: asyncio.Event() for key in payloads}
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def place(key: str) -> None:
+        for dep in deps[key]:
+            await done[dep].wait()
+        payload, error = _check_deps(payloads[key], deps[key], results)
+        if error is None:
+            async with semaphore:
+                try:
+                    response = await aio.call_manifold_api(
+                        BET_ENDPOINT,
+                        method="POST",
+                        json_data=payload,
+                        api_key=api_key,
+                        client=client,
+                    )
+                except Exception as e:
+                    error = e
+        results[key] = BetResult(
+            key, payload, response=None if error else response, error=error
+        )
+        done[key].set()
+
+    await asyncio.gather(*(place(key) for key in payloads))
+    return BatchReport([results[key] for key in payloads])
@@ -0,0 +1,200 @@
+import heapq
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Iterable, Iterator
+from urllib.parse import quote
+
+from pymanifold import call_manifold_api
+from pymanifold.client import Client
+from pymanifold.pagination import BETS_ENDPOINT, BETS_PAGE_SIZE, _bets_cursor
+
+# Keep each query string well below the ~8 KB request line most servers and
+# proxies accept, and bound how many markets share one paginated response.
+MAX_QUERY_BYTES = 4000
+MAX_CONTRACTS_PER_QUERY = 100
+DEFAULT_MAX_WORKERS = 8
+# Pages buffered per chunk while merging by time.
+MAX_BUFFERED_PAGES = 2
+MERGES = ("time", "contract", "arrival")
+
+
+def plan_chunks(
+    contract_ids: Iterable[str],
+    max_contracts: int = MAX_CONTRACTS_PER_QUERY,
+    max_query_bytes: int = MAX_QUERY_BYTES,
+) -> list[list[str]]:
+    """
+    Split contract ids into groups small enough for one multi-contract `/v0/bets` query.
+
+    Duplicate ids are dropped; the input order is otherwise kept.
+
+    Args:
+        contract_ids: Market ids to query
+        max_contracts: Maximum number of ids per query
+        max_query_bytes: Budget for the encoded `contractId=...` part of the query string
+    """
+    chunks: list[list[str]] = []
+    chunk: list[str] = []
+    size = 0
+    for contract_id in dict.fromkeys(contract_ids):
+        cost = len("contractId=") + len(quote(contract_id, safe="")) + 1
+        if chunk and (len(chunk) >= max_contracts or size + cost > max_query_bytes):
+            chunks.append(chunk)
+            chunk, size = [], 0
+        chunk.append(contract_id)
+        size += cost
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+class _Chunk:
+    def __init__(self, index: int, contract_ids: list[str], params: dict):
+        self.index = index
+        self.contract_ids = contract_ids
+        self.params = params
+        self.rows: deque[dict] = deque()
+        self.pages = 0
+        self.running = False
+        self.done = False
+
+
+def iter_bets_bulk(
+    contract_ids: Iterable[str],
+    params: dict | None = None,
+    merge: str = "time",
+    page_size: int = BETS_PAGE_SIZE,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    max_contracts: int = MAX_CONTRACTS_PER_QUERY,
+    api_key: str | None = None,
+    client: Client | None = None,
+) -> Iterator[dict]:
+    """
+    Fetch the bets of many markets with concurrent multi-contract `/v0/bets` queries.
+
+    Contract ids are grouped by `plan_chunks`, each group is paginated
+    independently, and up to `max_workers` pages are requested at a time.
+
+    `merge` controls the order bets are yielded in:
+
+    - "time": one stream ordered like a single `/v0/bets` query (newest first,
+      or oldest first with `params={"order": "asc"}`), merged across groups
+      while only a couple of pages per group are buffered
+    - "contract": every bet of a market together, markets in input order within
+      a group; a whole group is buffered before it is yielded
+    - "arrival": pages as soon as they arrive, with the least buffering
+
+    Args:
+        contract_ids: Market ids to fetch bets for
+        params: Other query parameters accepted by `pymanifold.models.bets.Bets`
+            (e.g. {"afterTime": 1700000000000}); "contractId" and the cursors are managed here
+        merge: "time", "contract" or "arrival"
+        page_size: Bets requested per page (at most 50,000)
+        max_workers: Number of pages fetched concurrently
+        max_contracts: Maximum number of markets per query
+        api_key: Optional API key (defaults to `MANIFOLD_API_KEY`)
+        client: Optional pooled client (defaults to the shared client)
+    """
+    if merge not in MERGES:
+        raise ValueError(f"merge must be one of {MERGES}")
+    params = {
+        key: value
+        for key, value in (params or {}).items()
+        if key not in ("contractId", "contractSlug", "before", "after", "limit")
+    }
+    cursor_param = _bets_cursor(params, page_size)
+    ascending = cursor_param == "after"
+    chunks = [
+        _Chunk(index, ids, {**params, "contractId": ids})
+        for index, ids in enumerate(plan_chunks(contract_ids, max_contracts))
+    ]
+
+    def fetch(chunk: _Chunk) -> list[dict]:
+        return call_manifold_api(
+            BETS_ENDPOINT,
+            params={**chunk.params, "limit": page_size},
+            api_key=api_key,
+            client=client,
+        )
+
+    def wanted(chunk: _Chunk) -> bool:
+        if chunk.done or chunk.running:
+            return False
+        return merge != "time" or chunk.pages < MAX_BUFFERED_PAGES
+
+    def sort_key(chunk: _Chunk) -> tuple[float, int]:
+        created_time = chunk.rows[0]["createdTime"]
+        return (created_time if ascending else -created_time, chunk.index)
+
+    # Merge state: the head bet of every buffered chunk is in `heads`; chunks
+    # that are still fetching but have nothing buffered block the merge.
+    heads: list[tuple[float, int]] = []
+    starved = {chunk.index for chunk in chunks}
+
+    def receive(chunk: _Chunk, page: list[dict]) -> None:
+        chunk.running = False
+        if len(page) < page_size:
+            chunk.done = True
+        else:
+            chunk.params[cursor_param] = page[-1]["id"]
+        was_empty = not chunk.rows
+        chunk.rows.extend(page)
+        chunk.pages += 1
+        if merge == "time" and was_empty:
+            if chunk.rows:
+                heapq.heappush(heads, sort_key(chunk))
+            if chunk.rows or chunk.done:
+                starved.discard(chunk.index)
+
+    def emit() -> Iterator[dict]:
+        if merge == "arrival":
+            for chunk in chunks:
+                yield from chunk.rows
+                chunk.rows.clear()
+                chunk.pages = 0
+        elif merge == "contract":
+            for chunk in chunks:
+                if chunk.done and chunk.rows:
+                    grouped: dict[str, list[dict]] = {
+                        contract_id: [] for contract_id in chunk.contract_ids
+                    }
+                    for bet in chunk.rows:
+                        grouped.setdefault(bet["contractId"], []).append(bet)
+                    chunk.rows.clear()
+                    for bets in grouped.values():
+                        yield from bets
+        else:
+            while heads and not starved:
+                _, index = heapq.heappop(heads)
+                chunk = chunks[index]
+                yield chunk.rows.popleft()
+                # Free a buffer slot once a page's worth of rows has been consumed.
+                chunk.pages = min(chunk.pages, -(-len(chunk.rows) // page_size))
+                if chunk.rows:
+                    heapq.heappush(heads, sort_key(chunk))
+                elif not chunk.done:
+                    starved.add(index)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        running: dict[Future, _Chunk] = {}
+        try:
+            while True:
+                # Chunks holding up the time merge go first.
+                for chunk in sorted(
+                    chunks, key=lambda chunk: chunk.index not in starved
+                ):
+                    if len(running) >= max_workers:
+                        break
+                    if wanted(chunk):
+                        chunk.running = True
+                        running[pool.submit(fetch, chunk)] = chunk
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    receive(running.pop(future), future.result())
+                yield from emit()
+            yield from emit()
+        finally:
+            for future in running:
+                future.cancel()
@@ -0,0 +1,268 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+import httpx
+
+from pymanifold.codec import JSONCodec, get_default_codec
+from pymanifold.routes import compile_template
+
+DEFAULT_MAXSIZE = 4096
+
+# Seconds a GET response stays fresh, per endpoint template. Endpoints not
+# listed here are never cached.
+DEFAULT_TTLS: dict[str, float] = {
+    "/v0/market/[marketId]": 5.0,
+    "/v0/market/[marketId]/positions": 5.0,
+    "/v0/slug/[marketSlug]": 5.0,
+    "/v0/user/[username]": 60.0,
+    "/v0/user/[username]/lite": 60.0,
+    "/v0/user/by-id/[id]": 60.0,
+    "/v0/user/by-id/[id]/lite": 60.0,
+    "/v0/group/[slug]": 300.0,
+    "/v0/group/by-id/[id]": 300.0,
+}
+
+# Cached reads that describe a single market; they are evicted when that market is written to.
+MARKET_READS = {
+    "/v0/market/[marketId]",
+    "/v0/market/[marketId]/positions",
+    "/v0/slug/[marketSlug]",
+}
+
+# Writes that modify a market, and the URL or JSON parameter that holds its id.
+MARKET_WRITES: dict[str, str] = {
+    "/v0/bet": "contractId",
+    "/v0/market/[marketId]/answer": "marketId",
+    "/v0/market/[marketId]/add-liquidity": "marketId",
+    "/v0/market/[marketId]/add-bounty": "marketId",
+    "/v0/market/[marketId]/award-bounty": "marketId",
+    "/v0/market/[marketId]/close": "marketId",
+    "/v0/market/[marketId]/group": "marketId",
+    "/v0/market/[marketId]/resolve": "marketId",
+    "/v0/market/[marketId]/sell": "marketId",
+}
+
+# Cached reads that include a user's balance.
+USER_READS = {
+    "/v0/user/[username]",
+    "/v0/user/[username]/lite",
+    "/v0/user/by-id/[id]",
+    "/v0/user/by-id/[id]/lite",
+}
+
+# Writes that move mana, after which every cached user read may show a stale balance.
+BALANCE_WRITES = {
+    "/v0/bet",
+    "/v0/bet/cancel/[id]",
+    "/v0/managram",
+    "/v0/market",
+    "/v0/market/[marketId]/add-liquidity",
+    "/v0/market/[marketId]/add-bounty",
+    "/v0/market/[marketId]/award-bounty",
+    "/v0/market/[marketId]/resolve",
+    "/v0/market/[marketId]/sell",
+}
+
+MISS = object()
+
+
+def normalize_params(params: dict | None) -> tuple:
+    """Normalize query parameters to the sorted key/value pairs sent on the wire."""
+    if not params:
+        return ()
+    return tuple(sorted(httpx.QueryParams(params).multi_items()))
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        ttls: dict[str, float] | None = None,
+        maxsize: int = DEFAULT_MAXSIZE,
+        codec: JSONCodec | None = None,
+    ):
+        """
+        In-process TTL + LRU cache for idempotent GET responses.
+
+        Entries are keyed on the API key, request path and normalized query
+        parameters, so responses are never shared between identities. Values
+        are stored encoded and decoded on every hit, so each caller gets its
+        own copy and may mutate it.
+
+        Args:
+            ttls: Seconds each endpoint template stays fresh (defaults to `DEFAULT_TTLS`)
+            maxsize: Maximum number of entries before the least recently used is evicted
+            codec: JSON codec used to store values (defaults to the shared codec)
+        """
+        ttls = DEFAULT_TTLS if ttls is None else ttls
+        self.routes = [
+            (compile_template(template), template, ttl)
+            for template, ttl in ttls.items()
+        ]
+        self.writes = [
+            (compile_template(template), param)
+            for template, param in MARKET_WRITES.items()
+        ]
+        self.balance_writes = [compile_template(t) for t in BALANCE_WRITES]
+        self.maxsize = maxsize
+        self.codec = codec
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # key -> (expiry, encoded value, market id, template)
+        self._entries: OrderedDict[tuple, tuple[float, bytes, str | None, str]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"ResponseCache(size={len(self)}, maxsize={self.maxsize}, hits={self.hits}, misses={self.misses})"
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _route(self, endpoint: str) -> tuple[str, float, dict] | None:
+        for pattern, template, ttl in self.routes:
+            match = pattern.match(endpoint)
+            if match:
+                return template, ttl, match.groupdict()
+        return None
+
+    def _codec(self) -> JSONCodec:
+        return self.codec if self.codec is not None else get_default_codec()
+
+    def get(
+        self, endpoint: str, params: dict | None = None, api_key: str | None = None
+    ) -> Any:
+        """Return a copy of the cached response for a GET, or `MISS`."""
+        if self._route(endpoint) is None:
+            return MISS
+        key = (api_key, endpoint, normalize_params(params))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return MISS
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return self._codec().loads(entry[1])
+
+    def set(
+        self,
+        endpoint: str,
+        params: dict | None,
+        value: Any,
+        api_key: str | None = None,
+    ) -> None:
+        """Store a GET response if its endpoint has a TTL."""
+        route = self._route(endpoint)
+        if route is None:
+            return
+        template, ttl, url_params = route
+        market_id = None
+        if template in MARKET_READS:
+            market_id = url_params.get("marketId")
+            if market_id is None and isinstance(value, dict):
+                market_id = value.get("id")
+        key = (api_key, endpoint, normalize_params(params))
+        encoded = self._codec().dumps(value)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, encoded, market_id, template)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(
+        self,
+        endpoint: str | None = None,
+        params: dict | None = None,
+        market_id: str | None = None,
+        users: bool = False,
+    ) -> int:
+        """
+        Evict cached entries, for every API key, and return how many were removed.
+
+        Args:
+            endpoint: Evict entries for this request path (all params unless `params` is given)
+            params: Query parameters narrowing `endpoint` to a single entry
+            market_id: Evict every market read (by id or slug) cached for this market
+            users: Evict every cached user read (see `USER_READS`)
+        """
+        normalized = None if params is None else normalize_params(params)
+        with self._lock:
+            stale = [
+                key
+                for key, (_, _, entry_market_id, template) in self._entries.items()
+                if (
+                    endpoint is not None
+                    and key[1] == endpoint
+                    and (normalized is None or key[2] == normalized)
+                )
+                or (market_id is not None and entry_market_id == market_id)
+                or (users and template in USER_READS)
+            ]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+    def invalidate_write(self, endpoint: str, json_data: dict | None = None) -> int:
+        """Evict entries affected by a write request to `endpoint`."""
+        market_id = None
+        for pattern, param in self.writes:
+            match = pattern.match(endpoint)
+            if match:
+                market_id = match.groupdict().get(param) or (json_data or {}).get(param)
+                break
+        users = any(pattern.match(endpoint) for pattern in self.balance_writes)
+        if market_id is None and not users:
+            return 0
+        return self.invalidate(market_id=market_id, users=users)
+
+    def clear(self) -> None:
+        """Evict every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict[str, int]:
+        """Return hit/miss/eviction counters and the current size."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+        }
+
+
+_default_cache: ResponseCache | None = None
+_default_lock = threading.Lock()
+
+
+def get_default_cache() -> ResponseCache:
+    """Return the process-wide response cache, creating it if needed."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = ResponseCache()
+        return _default_cache
+
+
+def resolve_cache(
+    cache: ResponseCache | bool | None, write: bool = False
+) -> ResponseCache | None:
+    """
+    Map a `cache` argument to a cache: True is the shared cache, None/False disable caching.
+
+    Caching is opt-in, but a write made without a cache still evicts the
+    shared cache's affected entries (if it is in use), so a read cached by one
+    caller never outlives another caller's write.
+    """
+    if cache is True:
+        return get_default_cache()
+    if cache is None and write:
+        return _default_cache
+    return cache or None
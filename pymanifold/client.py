@@ -0,0 +1,710 @@
+import copy
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from typing import TYPE_CHECKING, Any, AsyncGenerator, AsyncIterator, Iterator, TypeVar
+
+import httpx
+
+from pymanifold.codec import CONTENT_TYPE, JSONCodec, get_codec, get_default_codec
+from pymanifold.hooks import (
+    ERROR,
+    REQUEST,
+    RESPONSE,
+    RETRY,
+    Hooks,
+    RequestEvent,
+    endpoint_template,
+    get_default_hooks,
+)
+from pymanifold.ratelimit import (
+    RateLimiter,
+    get_default_rate_limiter,
+    parse_retry_after,
+)
+from pymanifold.retry import RetryPolicy
+
+if TYPE_CHECKING:
+    import asyncio
+
+API_BASE_URL = "https://api.manifold.markets"
+
+WARM_ENDPOINT = "/v0/markets"
+WARM_PARAMS = {"limit": 1}
+
+_C = TypeVar("_C", bound="_BaseClient")
+
+
+class _Pools:
+    """Connection pool state, shared by a client and its `with_rate_limiter` views."""
+
+    __slots__ = ("lock", "client", "pools", "guards")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # The sync client's pool.
+        self.client: httpx.Client | None = None
+        # The async client's pools, per event loop, and the guards closing them.
+        self.pools: dict["asyncio.AbstractEventLoop | None", httpx.AsyncClient] = {}
+        self.guards: dict["asyncio.AbstractEventLoop", AsyncGenerator] = {}
+
+
+class _BaseClient:
+    def __init__(
+        self,
+        base_url: str = API_BASE_URL,
+        http2: bool = False,
+        max_connections: int | None = 100,
+        max_keepalive_connections: int | None = 20,
+        keepalive_expiry: float | None = 30.0,
+        timeout: float | httpx.Timeout | None = 10.0,
+        rate_limiter: RateLimiter | bool | None = None,
+        hooks: Hooks | None = None,
+        retry: RetryPolicy | bool | None = None,
+        codec: JSONCodec | str | None = None,
+    ):
+        """
+        Create a long-lived HTTP client that owns a keep-alive connection pool.
+
+        The underlying httpx client is created on `open()` (or lazily on the
+        first request) and reused for every call until it is closed.
+
+        Args:
+            base_url: Root URL of the Manifold Markets API
+            http2: Enable HTTP/2 (requires the `h2` package, `pip install httpx[http2]`)
+            max_connections: Maximum number of concurrent connections in the pool
+            max_keepalive_connections: Maximum number of idle connections kept alive
+            keepalive_expiry: Seconds an idle connection is kept before being closed
+            timeout: Request timeout in seconds, or an `httpx.Timeout`
+            rate_limiter: Rate limiter applied to every request (defaults to the
+                shared limiter; pass False to disable client-side rate limiting)
+            hooks: Registry notified of every request, response, retry and error
+                (defaults to the shared registry, see `pymanifold.hooks`)
+            retry: Policy for retrying 5xx responses and network errors (defaults to
+                `RetryPolicy()`; pass False to disable). Writes are only retried when
+                they carry an idempotency key.
+            codec: JSON codec (or its name, "json" or "orjson") used to encode request
+                bodies and decode responses (defaults to the shared codec, which is
+                orjson when installed)
+        """
+        self.base_url = base_url
+        self.http2 = http2
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = timeout
+        if rate_limiter is None or rate_limiter is True:
+            rate_limiter = get_default_rate_limiter()
+        self.rate_limiter = rate_limiter or None
+        self.hooks = hooks if hooks is not None else get_default_hooks()
+        if retry is None or retry is True:
+            retry = RetryPolicy()
+        self.retry = retry or None
+        self._codec = get_codec(codec) if isinstance(codec, str) else codec
+        self._shared = _Pools()
+
+    def __repr__(self) -> str:
+        state = "closed" if self.closed else "open"
+        name = type(self).__name__
+        return f"{name}(base_url={self.base_url}, http2={self.http2}, {state})"
+
+    @property
+    def closed(self) -> bool:
+        return self._shared.client is None
+
+    def with_rate_limiter(self: _C, rate_limiter: RateLimiter | bool) -> _C:
+        """
+        Return a client sharing this one's connection pool but throttled by `rate_limiter`.
+
+        Pass False to send without client-side rate limiting. Both clients
+        hold the same pool state, so closing either closes the pool for both
+        and the next request through either reopens it for both.
+        """
+        view = copy.copy(self)
+        if rate_limiter is True:
+            rate_limiter = get_default_rate_limiter()
+        view.rate_limiter = rate_limiter or None
+        return view
+
+    @property
+    def codec(self) -> JSONCodec:
+        return self._codec if self._codec is not None else get_default_codec()
+
+    def decode(self, response: httpx.Response) -> Any:
+        """Decode a JSON response body with the client's codec."""
+        return self.codec.loads(response.content)
+
+    def _encode(
+        self, json: dict | None, headers: dict | None
+    ) -> tuple[bytes | None, dict | None]:
+        # Encode the body ourselves so a fast codec is used instead of httpx's `json=`.
+        if json is None:
+            return None, headers
+        return self.codec.dumps(json), {**(headers or {}), "Content-Type": CONTENT_TYPE}
+
+    def _attempts(
+        self,
+        method: str,
+        endpoint: str,
+        params: dict | None,
+        json: dict | None,
+        headers: dict | None,
+    ) -> "_Attempts":
+        """Start the attempt bookkeeping shared by every request and stream loop."""
+        if self.retry is not None:
+            json = self.retry.prepare(method, endpoint, json)
+        content, headers = self._encode(json, headers)
+        return _Attempts(self, method, endpoint, params, json, content, headers)
+
+    def _retry_delay(
+        self,
+        method: str,
+        endpoint: str,
+        json: dict | None,
+        retries: int,
+        response: httpx.Response | None = None,
+        error: BaseException | None = None,
+    ) -> float | None:
+        """Return how long to wait before resending a failed attempt, or None to give up."""
+        limiter = self.rate_limiter
+        if limiter is not None and response is not None and response.status_code == 429:
+            # A 429 means the request was rejected unprocessed, so it is safe to
+            # resend; the limiter does the waiting once it has backed off.
+            limiter.penalize(method, endpoint, parse_retry_after(response))
+            return 0.0 if retries < limiter.max_retries else None
+        policy = self.retry
+        if policy is None or not policy.should_retry(
+            method, json, retries, response, error
+        ):
+            return None
+        delay = policy.delay(retries)
+        retry_after = parse_retry_after(response) if response is not None else None
+        return delay if retry_after is None else max(delay, retry_after)
+
+    def _emit(
+        self,
+        kind: str,
+        method: str,
+        endpoint: str,
+        attempt: int,
+        started: float | None = None,
+        response: httpx.Response | None = None,
+        error: BaseException | None = None,
+    ) -> None:
+        event = RequestEvent(
+            kind=kind,
+            method=method,
+            endpoint=endpoint,
+            template=endpoint_template(endpoint),
+            attempt=attempt,
+            error=error,
+        )
+        if started is not None:
+            event.elapsed = time.perf_counter() - started
+        if response is not None:
+            event.status = response.status_code
+            event.request_bytes = len(response.request.content)
+            event.response_bytes = response.num_bytes_downloaded
+        self.hooks.emit(event)
+
+    def _make_client(self, client_class: type) -> httpx.Client | httpx.AsyncClient:
+        return client_class(
+            base_url=self.base_url,
+            http2=self.http2,
+            limits=self.limits,
+            timeout=self.timeout,
+        )
+
+
+class Client(_BaseClient):
+    def __enter__(self) -> "Client":
+        return self.open()
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def open(self) -> "Client":
+        """Create the connection pool if it is not already open."""
+        with self._shared.lock:
+            if self._shared.client is None:
+                self._shared.client = self._make_client(httpx.Client)
+        return self
+
+    def close(self) -> None:
+        """Close every pooled connection. The client can be re-opened afterwards."""
+        with self._shared.lock:
+            client, self._shared.client = self._shared.client, None
+        if client is not None:
+            client.close()
+
+    def warm(self, connections: int = 1) -> None:
+        """
+        Pre-establish pooled connections so the first real requests skip the handshake.
+
+        Args:
+            connections: Number of connections to open concurrently
+        """
+        self.open()
+        if connections <= 1:
+            self._warm_one()
+            return
+        with ThreadPoolExecutor(max_workers=connections) as pool:
+            for future in [pool.submit(self._warm_one) for _ in range(connections)]:
+                future.result()
+
+    def _warm_one(self) -> None:
+        self.request("GET", WARM_ENDPOINT, params=WARM_PARAMS).raise_for_status()
+
+    def request(
+        self,
+        method: str,
+        endpoint: str,
+        params: dict | None = None,
+        json: dict | None = None,
+        headers: dict | None = None,
+    ) -> httpx.Response:
+        """
+        Send a request over the pooled connections.
+
+        Args:
+            method: HTTP method to use ("GET", "POST", etc)
+            endpoint: API endpoint path relative to `base_url` (e.g. "/v0/me")
+            params: Optional query parameters
+            json: Optional JSON body
+            headers: Optional request headers
+        """
+        client = self._shared.client
+        if client is None:
+            client = self.open()._shared.client
+        limiter = self.rate_limiter
+        attempts = self._attempts(method, endpoint, params, json, headers)
+        while True:
+            if limiter is not None:
+                limiter.acquire(method, endpoint)
+            attempts.begin()
+            try:
+                response = client.request(**attempts.request)
+            except Exception as e:
+                delay = attempts.failed(e)
+                if delay is None:
+                    raise
+            else:
+                attempts.responded(response)
+                delay = attempts.delay(response)
+                if delay is None:
+                    return response
+            attempts.next()
+            if delay > 0:
+                time.sleep(delay)
+
+    @contextmanager
+    def stream(
+        self,
+        method: str,
+        endpoint: str,
+        params: dict | None = None,
+        json: dict | None = None,
+        headers: dict | None = None,
+    ) -> Iterator[httpx.Response]:
+        """
+        Send a request and yield the response before its body has been read.
+
+        Takes the same arguments as `request`; read the body incrementally with
+        `response.iter_bytes()`.
+        """
+        client = self._shared.client
+        if client is None:
+            client = self.open()._shared.client
+        limiter = self.rate_limiter
+        attempts = self._attempts(method, endpoint, params, json, headers)
+        delivered = False
+        while True:
+            if limiter is not None:
+                limiter.acquire(method, endpoint)
+            attempts.begin()
+            try:
+                with client.stream(**attempts.request) as response:
+                    delay = attempts.delay(response)
+                    if delay is None:
+                        delivered = True
+                        try:
+                            yield response
+                        finally:
+                            # Reported once the body has been consumed, so its size is known.
+                            attempts.responded(response)
+                        return
+            except Exception as e:
+                # Errors raised by the caller while reading the body are not request errors.
+                if delivered:
+                    raise
+                delay = attempts.failed(e)
+                if delay is None:
+                    raise
+            else:
+                attempts.responded(response)
+            attempts.next()
+            if delay > 0:
+                time.sleep(delay)
+
+
+class AsyncClient(_BaseClient):
+    """Asyncio counterpart of `Client`, backed by `httpx.AsyncClient`."""
+
+    @property
+    def closed(self) -> bool:
+        return not self._shared.pools
+
+    async def __aenter__(self) -> "AsyncClient":
+        return self.open()
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    def open(self) -> "AsyncClient":
+        """
+        Create the connection pool for the running event loop if it is not already open.
+
+        Connections cannot be shared between event loops, so each loop the
+        client is used from (e.g. successive `asyncio.run` calls) gets its own
+        pool. A loop's pool is closed when the loop shuts down its async
+        generators, as `asyncio.run` does, or by `aclose()`.
+        """
+        loop = _running_loop()
+        with self._shared.lock:
+            if loop not in self._shared.pools:
+                for owner in [
+                    o for o in self._shared.pools if o is not None and o.is_closed()
+                ]:
+                    del self._shared.pools[owner]
+                    self._shared.guards.pop(owner, None)
+                pool = self._shared.pools[loop] = self._make_client(httpx.AsyncClient)
+                if loop is not None:
+                    self._shared.guards[loop] = _close_with_loop(pool)
+        return self
+
+    async def aclose(self) -> None:
+        """Close every pooled connection, on every loop. The client can be re-opened afterwards."""
+        import asyncio
+
+        loop = _running_loop()
+        with self._shared.lock:
+            pools, self._shared.pools = self._shared.pools, {}
+            guards, self._shared.guards = self._shared.guards, {}
+        for owner, pool in pools.items():
+            guard = guards.get(owner)
+            if owner is None or owner is loop:
+                await (pool.aclose() if guard is None else guard.aclose())
+            elif owner.is_running():
+                await asyncio.wrap_future(
+                    asyncio.run_coroutine_threadsafe(guard.aclose(), owner)
+                )
+            # Otherwise the guard, once released, is closed by its loop's
+            # async generator finalizer the next time that loop runs.
+
+    def _pool(self) -> httpx.AsyncClient:
+        loop = _running_loop()
+        pool = self._shared.pools.get(loop)
+        if pool is None:
+            pool = self.open()._shared.pools[loop]
+        return pool
+
+    async def warm(self, connections: int = 1) -> None:
+        """
+        Pre-establish pooled connections so the first real requests skip the handshake.
+
+        Args:
+            connections: Number of connections to open concurrently
+        """
+        import asyncio
+
+        self.open()
+        responses = await asyncio.gather(
+            *(
+                self.request("GET", WARM_ENDPOINT, params=WARM_PARAMS)
+                for _ in range(connections)
+            )
+        )
+        for response in responses:
+            response.raise_for_status()
+
+    async def request(
+        self,
+        method: str,
+        endpoint: str,
+        params: dict | None = None,
+        json: dict | None = None,
+        headers: dict | None = None,
+    ) -> httpx.Response:
+        """
+        Send a request over the pooled connections.
+
+        Args:
+            method: HTTP method to use ("GET", "POST", etc)
+            endpoint: API endpoint path relative to `base_url` (e.g. "/v0/me")
+            params: Optional query parameters
+            json: Optional JSON body
+            headers: Optional request headers
+        """
+        client = self._pool()
+        limiter = self.rate_limiter
+        attempts = self._attempts(method, endpoint, params, json, headers)
+        while True:
+            if limiter is not None:
+                await limiter.acquire_async(method, endpoint)
+            attempts.begin()
+            try:
+                response = await client.request(**attempts.request)
+            except Exception as e:
+                delay = attempts.failed(e)
+                if delay is None:
+                    raise
+            else:
+                attempts.responded(response)
+                delay = attempts.delay(response)
+                if delay is None:
+                    return response
+            attempts.next()
+            if delay > 0:
+                import asyncio
+
+                await asyncio.sleep(delay)
+
+    @asynccontextmanager
+    async def stream(
+        self,
+        method: str,
+        endpoint: str,
+        params: dict | None = None,
+        json: dict | None = None,
+        headers: dict | None = None,
+    ) -> AsyncIterator[httpx.Response]:
+        """
+        Send a request and yield the response before its body has been read.
+
+        Takes the same arguments as `request`; read the body incrementally with
+        `response.aiter_bytes()`.
+        """
+        client = self._pool()
+        limiter = self.rate_limiter
+        attempts = self._attempts(method, endpoint, params, json, headers)
+        delivered = False
+        while True:
+            if limiter is not None:
+                await limiter.acquire_async(method, endpoint)
+            attempts.begin()
+            try:
+                async with client.stream(**attempts.request) as response:
+                    delay = attempts.delay(response)
+                    if delay is None:
+                        delivered = True
+                        try:
+                            yield response
+                        finally:
+                            # Reported once the body has been consumed, so its size is known.
+                            attempts.responded(response)
+                        return
+            except Exception as e:
+                # Errors raised by the caller while reading the body are not request errors.
+                if delivered:
+                    raise
+                delay = attempts.failed(e)
+                if delay is None:
+                    raise
+            else:
+                attempts.responded(response)
+            attempts.next()
+            if delay > 0:
+                import asyncio
+
+                await asyncio.sleep(delay)
+
+
+class _Attempts:
+    __slots__ = (
+        "client",
+        "method",
+        "endpoint",
+        "json",
+        "request",
+        "retries",
+        "started",
+        "response",
+        "error",
+    )
+
+    def __init__(
+        self,
+        client: _BaseClient,
+        method: str,
+        endpoint: str,
+        params: dict | None,
+        json: dict | None,
+        content: bytes | None,
+        headers: dict | None,
+    ):
+        """
+        Retry state of one logical request, shared by the sync and async loops.
+
+        The loops only send, wait and sleep; deciding whether and when to
+        resend, and reporting each attempt to the hooks, happens here.
+        """
+        self.client = client
+        self.method = method
+        self.endpoint = endpoint
+        self.json = json
+        # Keyword arguments for `httpx.Client.request` / `stream`.
+        self.request = {
+            "method": method,
+            "url": endpoint,
+            "params": params,
+            "content": content,
+            "headers": headers,
+        }
+        self.retries = 0
+        self.started = 0.0
+        self.response: httpx.Response | None = None
+        self.error: BaseException | None = None
+
+    def begin(self) -> None:
+        """Record the start of an attempt."""
+        self.response = self.error = None
+        if self.client.hooks:
+            self.client._emit(REQUEST, self.method, self.endpoint, self.retries)
+        self.started = time.perf_counter()
+
+    def responded(self, response: httpx.Response) -> None:
+        """Report a response (for streams, once its body has been read)."""
+        self.response = response
+        if self.client.hooks:
+            self.client._emit(
+                RESPONSE,
+                self.method,
+                self.endpoint,
+                self.retries,
+                self.started,
+                response,
+            )
+
+    def failed(self, error: BaseException) -> float | None:
+        """Report a failed attempt; return the delay before resending, or None to give up."""
+        self.error = error
+        if self.client.hooks:
+            self.client._emit(
+                ERROR,
+                self.method,
+                self.endpoint,
+                self.retries,
+                self.started,
+                error=error,
+            )
+        return self.delay()
+
+    def delay(self, response: httpx.Response | None = None) -> float | None:
+        """Return the delay before resending this attempt, or None if it is final."""
+        if response is not None:
+            self.response = response
+        return self.client._retry_delay(
+            self.method,
+            self.endpoint,
+            self.json,
+            self.retries,
+            self.response,
+            self.error,
+        )
+
+    def next(self) -> None:
+        """Report that the attempt is being resent."""
+        if self.client.hooks:
+            self.client._emit(
+                RETRY,
+                self.method,
+                self.endpoint,
+                self.retries,
+                None,
+                self.response,
+                self.error,
+            )
+        self.retries += 1
+
+
+async def _closing(pool: httpx.AsyncClient) -> AsyncGenerator:
+    try:
+        yield
+    finally:
+        await pool.aclose()
+
+
+def _close_with_loop(pool: httpx.AsyncClient) -> AsyncGenerator:
+    """
+    Return a started async generator that closes `pool` when finalized.
+
+    Starting it inside the running loop registers it with that loop, so
+    `loop.shutdown_asyncgens()` (called by `asyncio.run` before the loop is
+    closed) closes the pool while its connections can still be shut down.
+    """
+    guard = _closing(pool)
+    try:
+        guard.asend(None).send(None)
+    except StopIteration:
+        pass
+    return guard
+
+
+def _running_loop() -> "asyncio.AbstractEventLoop | None":
+    # Imported here so that synchronous users never pay for importing asyncio.
+    import asyncio
+
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+_default_client: Client | None = None
+_default_async_client: AsyncClient | None = None
+_default_lock = threading.Lock()
+
+
+def get_default_client() -> Client:
+    """Return the process-wide client shared by every `Session`, creating it if needed."""
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = Client()
+        return _default_client
+
+
+def set_default_client(client: Client) -> Client | None:
+    """
+    Replace the process-wide client, e.g. to enable HTTP/2 or change pool limits.
+
+    Returns the previous client (if any) so the caller can close it.
+    """
+    global _default_client
+    with _default_lock:
+        previous, _default_client = _default_client, client
+    return previous
+
+
+def get_default_async_client() -> AsyncClient:
+    """Return the process-wide client shared by every `AsyncSession`, creating it if needed."""
+    global _default_async_client
+    with _default_lock:
+        if _default_async_client is None:
+            _default_async_client = AsyncClient()
+        return _default_async_client
+
+
+def set_default_async_client(client: AsyncClient) -> AsyncClient | None:
+    """
+    Replace the process-wide async client.
+
+    Returns the previous client (if any) so the caller can close it.
+    """
+    global _default_async_client
+    with _default_lock:
+        previous, _default_async_client = _default_async_client, client
+    return previous
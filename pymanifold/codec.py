@@ -0,0 +1,101 @@
+import json
+import math
+import threading
+from typing import Any
+
+CONTENT_TYPE = "application/json"
+
+
+class JSONCodec:
+    """Standard library JSON codec; subclass and override `dumps`/`loads` to plug in another."""
+
+    name = "json"
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(name={self.name})"
+
+    def dumps(self, obj: Any) -> bytes:
+        """
+        Encode a request body to UTF-8 JSON bytes.
+
+        Raises:
+            ValueError: If the body contains NaN or an infinite float
+        """
+        # Same output as httpx's `json=` encoding.
+        return json.dumps(
+            obj, ensure_ascii=False, separators=(",", ":"), allow_nan=False
+        ).encode("utf-8")
+
+    def loads(self, data: bytes | str) -> Any:
+        """Decode a response body."""
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    """JSON codec backed by `orjson` (`pip install orjson`), several times faster on large bodies."""
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._orjson = orjson
+
+    def dumps(self, obj: Any) -> bytes:
+        data = self._orjson.dumps(obj)
+        # orjson writes NaN and infinities as null; raise like the standard codec.
+        if b"null" in data and _has_nonfinite(obj):
+            raise ValueError("Out of range float values are not JSON compliant")
+        return data
+
+    def loads(self, data: bytes | str) -> Any:
+        return self._orjson.loads(data)
+
+
+def _has_nonfinite(obj: Any) -> bool:
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(_has_nonfinite(value) for value in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_has_nonfinite(value) for value in obj)
+    return False
+
+
+CODECS: dict[str, type[JSONCodec]] = {"json": JSONCodec, "orjson": OrjsonCodec}
+
+
+def get_codec(name: str) -> JSONCodec:
+    """Return a codec by name ("json" or "orjson")."""
+    try:
+        return CODECS[name]()
+    except KeyError:
+        raise ValueError(
+            f"Unknown codec {name!r}, expected one of {list(CODECS)}"
+        ) from None
+
+
+_default_codec: JSONCodec | None = None
+_default_lock = threading.Lock()
+
+
+def get_default_codec() -> JSONCodec:
+    """Return the process-wide codec: `orjson` if it is installed, else the standard library."""
+    global _default_codec
+    with _default_lock:
+        if _default_codec is None:
+            try:
+                _default_codec = OrjsonCodec()
+            except ImportError:
+                _default_codec = JSONCodec()
+        return _default_codec
+
+
+def set_default_codec(codec: JSONCodec | str) -> JSONCodec | None:
+    """Replace the process-wide codec and return the previous one."""
+    global _default_codec
+    if isinstance(codec, str):
+        codec = get_codec(codec)
+    with _default_lock:
+        previous, _default_codec = _default_codec, codec
+    return previous
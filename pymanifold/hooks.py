@@ -0,0 +1,153 @@
+import logging
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable
+
+from pymanifold.endpoints import ENDPOINTS
+from pymanifold.routes import compile_template
+
+# Event kinds passed to hooks.
+REQUEST = "request"
+RESPONSE = "response"
+RETRY = "retry"
+ERROR = "error"
+CACHE_HIT = "cache_hit"
+KINDS = (REQUEST, RESPONSE, RETRY, ERROR, CACHE_HIT)
+
+# Template reported for paths that match no `ENDPOINTS` template.
+OTHER = "other"
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RequestEvent:
+    """
+    A request lifecycle event.
+
+    `request` is emitted before each attempt is sent, `response` after each
+    attempt is answered, `retry` when an attempt will be resent, `error` when
+    an attempt fails without a response and `cache_hit` when a GET is served
+    from the response cache without a request.
+    """
+
+    kind: str
+    method: str
+    endpoint: str
+    template: str
+    attempt: int = 0
+    status: int | None = None
+    elapsed: float | None = None
+    request_bytes: int | None = None
+    response_bytes: int | None = None
+    error: BaseException | None = None
+
+
+Hook = Callable[[RequestEvent], None]
+
+
+@lru_cache(maxsize=None)
+def _routes() -> list[tuple]:
+    # Most specific templates first: fewest placeholders, then longest.
+    templates = sorted(ENDPOINTS, key=lambda t: (t.count("["), -len(t)))
+    return [(compile_template(template), template) for template in templates]
+
+
+@lru_cache(maxsize=4096)
+def endpoint_template(endpoint: str) -> str:
+    """
+    Return the `ENDPOINTS` template a request path belongs to, or `OTHER` if none match.
+
+    Unknown paths share one label, so ids in them can't grow metrics without bound.
+    """
+    if endpoint in ENDPOINTS:
+        return endpoint
+    for pattern, template in _routes():
+        if pattern.match(endpoint):
+            return template
+    return OTHER
+
+
+class Hooks:
+    def __init__(self):
+        """
+        Registry of callbacks notified of request lifecycle events.
+
+        Hooks run synchronously on the thread or task that made the request,
+        so they should be fast; exceptions they raise are logged and ignored.
+        """
+        self._hooks: tuple[tuple[Hook, frozenset | None, frozenset | None], ...] = ()
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"Hooks(count={len(self)})"
+
+    def __len__(self) -> int:
+        return len(self._hooks)
+
+    def __bool__(self) -> bool:
+        return bool(self._hooks)
+
+    def add(
+        self,
+        hook: Hook,
+        kinds: list[str] | None = None,
+        endpoints: list[str] | None = None,
+    ) -> Hook:
+        """
+        Register a hook and return it (so this can be used as a decorator).
+
+        Args:
+            hook: Callable taking a `RequestEvent`
+            kinds: Event kinds to receive (defaults to every kind)
+            endpoints: Endpoint templates to receive events for, e.g. ["/v0/market/[marketId]"]
+                (defaults to every endpoint)
+        """
+        for kind in kinds or ():
+            if kind not in KINDS:
+                raise ValueError(
+                    f"Unknown event kind {kind!r}, expected one of {KINDS}"
+                )
+        entry = (
+            hook,
+            frozenset(kinds) if kinds is not None else None,
+            frozenset(endpoints) if endpoints is not None else None,
+        )
+        with self._lock:
+            self._hooks = (*self._hooks, entry)
+        return hook
+
+    def remove(self, hook: Hook) -> None:
+        """Unregister every registration of `hook`."""
+        with self._lock:
+            self._hooks = tuple(entry for entry in self._hooks if entry[0] is not hook)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._hooks = ()
+
+    def emit(self, event: RequestEvent) -> None:
+        """Call every hook registered for the event's kind and endpoint template."""
+        for hook, kinds, endpoints in self._hooks:
+            if kinds is not None and event.kind not in kinds:
+                continue
+            if endpoints is not None and event.template not in endpoints:
+                continue
+            try:
+                hook(event)
+            except Exception:
+                logger.exception(f"Hook {hook!r} failed on {event.kind} event")
+
+
+_default_hooks: Hooks | None = None
+_default_lock = threading.Lock()
+
+
+def get_default_hooks() -> Hooks:
+    """Return the process-wide hook registry used by every client, creating it if needed."""
+    global _default_hooks
+    with _default_lock:
+        if _default_hooks is None:
+            _default_hooks = Hooks()
+        return _default_hooks
@@ -0,0 +1,194 @@
+import bisect
+import threading
+from collections import defaultdict
+
+from pymanifold.hooks import (
+    CACHE_HIT,
+    ERROR,
+    RESPONSE,
+    RETRY,
+    Hooks,
+    RequestEvent,
+    get_default_hooks,
+)
+
+# Upper bounds, in seconds, of the latency histogram buckets.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PROMETHEUS_PREFIX = "pymanifold"
+
+
+class _Series:
+    __slots__ = (
+        "buckets",
+        "latency_sum",
+        "responses",
+        "statuses",
+        "errors",
+        "retries",
+        "cache_hits",
+        "request_bytes",
+        "response_bytes",
+    )
+
+    def __init__(self, size: int):
+        self.buckets = [0] * size
+        self.latency_sum = 0.0
+        self.responses = 0
+        self.statuses: dict[int, int] = defaultdict(int)
+        self.errors = 0
+        self.retries = 0
+        self.cache_hits = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+
+
+class MetricsCollector:
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        """
+        Per-endpoint request metrics, collected from `pymanifold.hooks` events.
+
+        Series are keyed by endpoint template and method, so
+        "/v0/market/abc" and "/v0/market/xyz" are both counted under
+        "/v0/market/[marketId]".
+
+        Args:
+            buckets: Upper bounds in seconds of the latency histogram buckets
+        """
+        self.bounds = tuple(sorted(buckets))
+        self._series: dict[tuple[str, str], _Series] = {}
+        self._lock = threading.Lock()
+        self._hooks: Hooks | None = None
+
+    def __repr__(self) -> str:
+        return f"MetricsCollector(endpoints={len(self._series)})"
+
+    def install(self, hooks: Hooks | None = None) -> "MetricsCollector":
+        """Start collecting events from a hook registry (defaults to the shared one)."""
+        self.uninstall()
+        self._hooks = hooks if hooks is not None else get_default_hooks()
+        self._hooks.add(self, kinds=[RESPONSE, RETRY, ERROR, CACHE_HIT])
+        return self
+
+    def uninstall(self) -> None:
+        """Stop collecting events."""
+        if self._hooks is not None:
+            self._hooks.remove(self)
+            self._hooks = None
+
+    def __call__(self, event: RequestEvent) -> None:
+        key = (event.template, event.method)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series(len(self.bounds) + 1)
+            if event.kind == RESPONSE:
+                series.responses += 1
+                series.statuses[event.status] += 1
+                if event.elapsed is not None:
+                    series.buckets[bisect.bisect_left(self.bounds, event.elapsed)] += 1
+                    series.latency_sum += event.elapsed
+                series.request_bytes += event.request_bytes or 0
+                series.response_bytes += event.response_bytes or 0
+            elif event.kind == RETRY:
+                series.retries += 1
+            elif event.kind == ERROR:
+                series.errors += 1
+            elif event.kind == CACHE_HIT:
+                series.cache_hits += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def snapshot(self) -> dict[str, dict[str, dict]]:
+        """
+        Return the metrics as plain data: {template: {method: {...}}}.
+
+        Each entry has counts of responses, errors, retries and cache hits,
+        responses per status code, bytes sent and received, and the latency
+        histogram as cumulative counts per bucket upper bound ("+Inf" last).
+        """
+        snapshot: dict[str, dict[str, dict]] = {}
+        with self._lock:
+            for (template, method), series in sorted(self._series.items()):
+                cumulative = 0
+                histogram = {}
+                for bound, count in zip([*self.bounds, "+Inf"], series.buckets):
+                    cumulative += count
+                    histogram[str(bound)] = cumulative
+                snapshot.setdefault(template, {})[method] = {
+                    "responses": series.responses,
+                    "errors": series.errors,
+                    "retries": series.retries,
+                    "cache_hits": series.cache_hits,
+                    "statuses": {
+                        str(code): n for code, n in sorted(series.statuses.items())
+                    },
+                    "request_bytes": series.request_bytes,
+                    "response_bytes": series.response_bytes,
+                    "latency_sum": series.latency_sum,
+                    "latency_buckets": histogram,
+                }
+        return snapshot
+
+    def to_prometheus(self, prefix: str = PROMETHEUS_PREFIX) -> str:
+        """Return the metrics in the Prometheus text exposition format."""
+        lines = []
+
+        def family(name: str, kind: str, description: str) -> str:
+            lines.append(f"# HELP {prefix}_{name} {description}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            return f"{prefix}_{name}"
+
+        snapshot = self.snapshot()
+        series = [
+            (_labels(template, method), data)
+            for template, methods in snapshot.items()
+            for method, data in methods.items()
+        ]
+
+        name = family(
+            "request_duration_seconds", "histogram", "Request latency by endpoint."
+        )
+        for labels, data in series:
+            for bound, count in data["latency_buckets"].items():
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f"{name}_sum{{{labels}}} {data['latency_sum']}")
+            lines.append(f"{name}_count{{{labels}}} {data['responses']}")
+
+        name = family(
+            "responses_total", "counter", "Responses by endpoint and status code."
+        )
+        for labels, data in series:
+            for status, count in data["statuses"].items():
+                lines.append(f'{name}{{{labels},status="{status}"}} {count}')
+
+        for key, description in (
+            ("errors", "Requests that failed without a response."),
+            ("retries", "Requests that were retried."),
+            ("cache_hits", "GET requests served from the response cache."),
+            ("request_bytes", "Request body bytes sent."),
+            ("response_bytes", "Response body bytes received."),
+        ):
+            name = family(f"{key}_total", "counter", description)
+            for labels, data in series:
+                lines.append(f"{name}{{{labels}}} {data[key]}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(template: str, method: str) -> str:
+    template = template.replace("\\", "\\\\").replace('"', '\\"')
+    return f'endpoint="{template}",method="{method}"'
+
+
+_default_metrics: MetricsCollector | None = None
+_default_lock = threading.Lock()
+
+
+def get_default_metrics() -> MetricsCollector:
+    """Return the process-wide metrics collector, installing it on the shared hooks if needed."""
+    global _default_metrics
+    with _default_lock:
+        if _default_metrics is None:
+            _default_metrics = MetricsCollector().install()
+        return _default_metrics
@@ -0,0 +1,169 @@
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+from pymanifold.client import Client
+from pymanifold.pagination import paginate
+
+MARKETS_ENDPOINT = "/v0/markets"
+MARKETS_PAGE_SIZE = 1000
+DEFAULT_INTERVAL = 60.0
+# Markets updated this long before a sync started are fetched again on the next
+# one, covering updates made mid-crawl and clock skew with the API.
+DEFAULT_OVERLAP_MS = 60 * 1000
+
+logger = logging.getLogger(__name__)
+
+
+class MarketMirror:
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        overlap_ms: float = DEFAULT_OVERLAP_MS,
+        api_key: str | None = None,
+        client: Client | None = None,
+    ):
+        """
+        Local mirror of `/v0/markets`, indexed by id and slug.
+
+        The first `sync()` crawls every market; later ones use the
+        `sort=updated-time` order to fetch only markets updated since the last
+        watermark. The API returns lite markets, so the mirror holds those.
+
+        Args:
+            path: Optional JSON file the mirror is loaded from and saved to after each sync
+            overlap_ms: How far before the previous sync each refresh reaches back
+            api_key: Optional API key (defaults to `MANIFOLD_API_KEY`)
+            client: Optional pooled client (defaults to the shared client)
+        """
+        self.path = Path(path) if path is not None else None
+        self.overlap_ms = overlap_ms
+        self.api_key = api_key
+        self.client = client
+        self.watermark: float | None = None
+        self._markets: dict[str, dict] = {}
+        self._slugs: dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._stop: threading.Event | None = None
+        self._thread: threading.Thread | None = None
+        if self.path is not None and self.path.exists():
+            self.load()
+
+    def __repr__(self) -> str:
+        return f"MarketMirror(markets={len(self)}, watermark={self.watermark})"
+
+    def __len__(self) -> int:
+        return len(self._markets)
+
+    def __contains__(self, market_id: str) -> bool:
+        return market_id in self._markets
+
+    def get(self, market_id: str) -> dict | None:
+        """Return the mirrored market with this id, like `/v0/market/[marketId]`."""
+        return self._markets.get(market_id)
+
+    def get_by_slug(self, slug: str) -> dict | None:
+        """Return the mirrored market with this slug, like `/v0/slug/[marketSlug]`."""
+        market_id = self._slugs.get(slug)
+        return None if market_id is None else self._markets.get(market_id)
+
+    def markets(self) -> list[dict]:
+        """Return a snapshot of every mirrored market."""
+        with self._lock:
+            return list(self._markets.values())
+
+    def upsert(self, market: dict) -> None:
+        """Insert or replace a market in the index."""
+        with self._lock:
+            previous = self._markets.get(market["id"])
+            if previous is not None and previous.get("slug") != market.get("slug"):
+                self._slugs.pop(previous.get("slug"), None)
+            self._markets[market["id"]] = market
+            if market.get("slug"):
+                self._slugs[market["slug"]] = market["id"]
+
+    def sync(self) -> int:
+        """
+        Crawl (first run) or refresh the mirror and return how many markets were upserted.
+
+        A refresh walks markets from most to least recently updated and stops at
+        the first one older than the watermark.
+        """
+        with self._sync_lock:
+            started = time.time() * 1000 - self.overlap_ms
+            watermark = self.watermark
+            count = 0
+            for market in paginate(
+                MARKETS_ENDPOINT,
+                params={"sort": "updated-time", "order": "desc"},
+                page_size=MARKETS_PAGE_SIZE,
+                api_key=self.api_key,
+                client=self.client,
+            ):
+                if (
+                    watermark is not None
+                    and market.get("lastUpdatedTime", 0) < watermark
+                ):
+                    break
+                self.upsert(market)
+                count += 1
+            self.watermark = started
+            logger.debug(f"Mirrored {count} markets, {len(self)} total")
+            if self.path is not None:
+                self.save()
+            return count
+
+    def start(self, interval: float = DEFAULT_INTERVAL) -> None:
+        """Sync now and then every `interval` seconds on a background thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(interval, self._stop), daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stop the background refresh thread started by `start()`."""
+        if self._stop is not None:
+            self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self, interval: float, stop: threading.Event) -> None:
+        while not stop.is_set():
+            try:
+                self.sync()
+            except Exception:
+                logger.exception("Market mirror refresh failed")
+            stop.wait(interval)
+
+    def save(self, path: str | Path | None = None) -> None:
+        """Write the mirror to a JSON file (defaults to `path`)."""
+        path = Path(path) if path is not None else self.path
+        with self._lock:
+            data = {
+                "watermark": self.watermark,
+                "markets": list(self._markets.values()),
+            }
+        tmp_path = path.with_name(path.name + ".tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    def load(self, path: str | Path | None = None) -> None:
+        """Replace the mirror's contents with a JSON file written by `save()`."""
+        path = Path(path) if path is not None else self.path
+        with path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+        with self._lock:
+            self._markets = {}
+            self._slugs = {}
+        for market in data["markets"]:
+            self.upsert(market)
+        self.watermark = data["watermark"]
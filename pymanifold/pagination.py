@@ -0,0 +1,179 @@
+from typing import AsyncIterator, Iterator
+
+from pymanifold import call_manifold_api
+from pymanifold import aio
+from pymanifold.client import AsyncClient, Client
+from pymanifold.streaming import astream_manifold_api, stream_manifold_api
+
+BETS_ENDPOINT = "/v0/bets"
+BETS_PAGE_SIZE = 1000
+BETS_MAX_PAGE_SIZE = 50000
+
+
+def paginate(
+    endpoint: str,
+    params: dict | None = None,
+    cursor_param: str = "before",
+    cursor_field: str = "id",
+    page_size: int = BETS_PAGE_SIZE,
+    max_rows: int | None = None,
+    stream: bool = False,
+    api_key: str | None = None,
+    client: Client | None = None,
+) -> Iterator[dict]:
+    """
+    Lazily iterate over a cursor-paginated list endpoint, one page in memory at a time.
+
+    After each full page the cursor parameter is set to `cursor_field` of the
+    last row; iteration stops on the first short page or once `max_rows` rows
+    have been yielded.
+
+    Args:
+        endpoint: API endpoint path (e.g. "/v0/bets")
+        params: Query parameters sent with every page (the cursor and "limit" are managed here)
+        cursor_param: Query parameter that carries the cursor
+        cursor_field: Field of the last row used as the next cursor
+        page_size: Rows requested per page
+        max_rows: Optional cap on the total number of rows yielded
+        stream: Decode each page as it downloads instead of buffering it (see
+            `pymanifold.streaming`), so only one row is held in memory at a time
+        api_key: Optional API key (defaults to `MANIFOLD_API_KEY`)
+        client: Optional pooled client (defaults to the shared client)
+    """
+    params = dict(params or {})
+    remaining = max_rows
+    while True:
+        limit = page_size if remaining is None else min(page_size, remaining)
+        if limit <= 0:
+            return
+        fetch = stream_manifold_api if stream else call_manifold_api
+        page = fetch(
+            endpoint,
+            params={**params, "limit": limit},
+            api_key=api_key,
+            client=client,
+        )
+        count = 0
+        row = None
+        for row in page:
+            count += 1
+            yield row
+        if remaining is not None:
+            remaining -= count
+        if count < limit:
+            return
+        params[cursor_param] = row[cursor_field]
+
+
+async def apaginate(
+    endpoint: str,
+    params: dict | None = None,
+    cursor_param: str = "before",
+    cursor_field: str = "id",
+    page_size: int = BETS_PAGE_SIZE,
+    max_rows: int | None = None,
+    stream: bool = False,
+    api_key: str | None = None,
+    client: AsyncClient | None = None,
+) -> AsyncIterator[dict]:
+    """Asyncio counterpart of `paginate`."""
+    params = dict(params or {})
+    remaining = max_rows
+    while True:
+        limit = page_size if remaining is None else min(page_size, remaining)
+        if limit <= 0:
+            return
+        if stream:
+            page = astream_manifold_api(
+                endpoint,
+                params={**params, "limit": limit},
+                api_key=api_key,
+                client=client,
+            )
+        else:
+            page = _aiter(
+                await aio.call_manifold_api(
+                    endpoint,
+                    params={**params, "limit": limit},
+                    api_key=api_key,
+                    client=client,
+                )
+            )
+        count = 0
+        row = None
+        async for row in page:
+            count += 1
+            yield row
+        if remaining is not None:
+            remaining -= count
+        if count < limit:
+            return
+        params[cursor_param] = row[cursor_field]
+
+
+async def _aiter(rows: list[dict]) -> AsyncIterator[dict]:
+    for row in rows:
+        yield row
+
+
+def _bets_cursor(params: dict | None, page_size: int) -> str:
+    if not 0 < page_size <= BETS_MAX_PAGE_SIZE:
+        raise ValueError(f"page_size must be between 1 and {BETS_MAX_PAGE_SIZE}")
+    order = (params or {}).get("order")
+    # Bets are newest-first by default; ascending pages walk forward with `after`.
+    return "after" if getattr(order, "value", order) == "asc" else "before"
+
+
+def iter_bets(
+    params: dict | None = None,
+    page_size: int = BETS_PAGE_SIZE,
+    max_rows: int | None = None,
+    stream: bool = False,
+    api_key: str | None = None,
+    client: Client | None = None,
+) -> Iterator[dict]:
+    """
+    Lazily iterate over `/v0/bets`, advancing the `before`/`after` cursor automatically.
+
+    Time bounds are passed through to the API, e.g.
+    `iter_bets({"contractId": "abc", "afterTime": 1700000000000})`.
+
+    Args:
+        params: Query parameters accepted by `pymanifold.models.bets.Bets`
+        page_size: Bets requested per page (at most 50,000)
+        max_rows: Optional cap on the total number of bets yielded
+        stream: Decode each page as it downloads instead of buffering it
+        api_key: Optional API key (defaults to `MANIFOLD_API_KEY`)
+        client: Optional pooled client (defaults to the shared client)
+    """
+    return paginate(
+        BETS_ENDPOINT,
+        params=params,
+        cursor_param=_bets_cursor(params, page_size),
+        page_size=page_size,
+        max_rows=max_rows,
+        stream=stream,
+        api_key=api_key,
+        client=client,
+    )
+
+
+def aiter_bets(
+    params: dict | None = None,
+    page_size: int = BETS_PAGE_SIZE,
+    max_rows: int | None = None,
+    stream: bool = False,
+    api_key: str | None = None,
+    client: AsyncClient | None = None,
+) -> AsyncIterator[dict]:
+    """Asyncio counterpart of `iter_bets`."""
+    return apaginate(
+        BETS_ENDPOINT,
+        params=params,
+        cursor_param=_bets_cursor(params, page_size),
+        page_size=page_size,
+        max_rows=max_rows,
+        stream=stream,
+        api_key=api_key,
+        client=client,
+    )
@@ -0,0 +1,169 @@
+import logging
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable
+
+import httpx
+
+# Manifold allows roughly 500 requests per minute per IP; leave a little headroom.
+DEFAULT_BUDGETS: dict[str, tuple[float, float]] = {
+    "read": (400 / 60, 20),
+    "write": (80 / 60, 5),
+}
+DEFAULT_RETRY_AFTER = 1.0
+DEFAULT_MAX_RETRIES = 3
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    def __init__(
+        self,
+        rate: float,
+        burst: float,
+        min_rate: float | None = None,
+        backoff: float = 0.5,
+        recovery: float | None = None,
+    ):
+        """
+        Token bucket whose refill rate shrinks on 429 and recovers over time.
+
+        Args:
+            rate: Sustained requests per second when no 429s are seen
+            burst: Maximum number of tokens that can accumulate
+            min_rate: Lowest rate the bucket backs off to (default is 5% of `rate`)
+            backoff: Factor the rate is multiplied by on each 429
+            recovery: Requests per second the rate regains every second (default is `rate / 60`)
+        """
+        self.base_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate if min_rate is not None else rate / 20
+        self.backoff = backoff
+        self.recovery = recovery if recovery is not None else rate / 60
+        self.tokens = burst
+        self.blocked_until = 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"TokenBucket(rate={self.rate:.3g}/{self.base_rate:.3g}, burst={self.burst})"
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._updated = now
+        if now >= self.blocked_until:
+            self.rate = min(self.base_rate, self.rate + self.recovery * elapsed)
+        self.tokens = min(self.burst, self.tokens + self.rate * elapsed)
+
+    def reserve(self) -> float:
+        """Take one token and return how many seconds the caller must wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            return max(wait, self.blocked_until - now)
+
+    def penalize(self, retry_after: float | None = None) -> None:
+        """Shrink the rate and pause the bucket after a 429 response."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate = max(self.min_rate, self.rate * self.backoff)
+            self.tokens = min(self.tokens, 0.0)
+            pause = retry_after if retry_after is not None else DEFAULT_RETRY_AFTER
+            self.blocked_until = max(self.blocked_until, now + pause)
+
+
+def classify_by_method(method: str, endpoint: str) -> str:
+    """Default endpoint classifier: GETs are "read", everything else is "write"."""
+    return "read" if method.upper() == "GET" else "write"
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        budgets: dict[str, tuple[float, float]] | None = None,
+        classify: Callable[[str, str], str] = classify_by_method,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+    ):
+        """
+        Client-side rate limiter shared by threads and asyncio tasks.
+
+        Each endpoint class has its own adaptive `TokenBucket`; requests whose
+        class has no budget are not limited.
+
+        Args:
+            budgets: Mapping of endpoint class to (requests per second, burst)
+            classify: Callable mapping (method, endpoint) to an endpoint class
+            max_retries: How many times a request answered with 429 is retried
+        """
+        budgets = DEFAULT_BUDGETS if budgets is None else budgets
+        self.buckets = {
+            name: TokenBucket(rate, burst) for name, (rate, burst) in budgets.items()
+        }
+        self.classify = classify
+        self.max_retries = max_retries
+
+    def __repr__(self) -> str:
+        return f"RateLimiter(buckets={self.buckets})"
+
+    def _bucket(self, method: str, endpoint: str) -> TokenBucket | None:
+        return self.buckets.get(self.classify(method, endpoint))
+
+    def acquire(self, method: str, endpoint: str) -> None:
+        """Block the calling thread until the request may be sent."""
+        bucket = self._bucket(method, endpoint)
+        if bucket is not None:
+            wait = bucket.reserve()
+            if wait > 0:
+                time.sleep(wait)
+
+    async def acquire_async(self, method: str, endpoint: str) -> None:
+        """Suspend the calling task until the request may be sent."""
+        import asyncio
+
+        bucket = self._bucket(method, endpoint)
+        if bucket is not None:
+            wait = bucket.reserve()
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+    def penalize(self, method: str, endpoint: str, retry_after: float | None) -> None:
+        """Record a 429 response for the endpoint's class."""
+        bucket = self._bucket(method, endpoint)
+        if bucket is not None:
+            logger.warning(
+                f"Rate limited on {method} {endpoint}; backing off to {bucket.rate * bucket.backoff:.3g} req/s"
+            )
+            bucket.penalize(retry_after)
+
+
+def parse_retry_after(response: httpx.Response) -> float | None:
+    """Return the Retry-After header in seconds, if present."""
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+_default_rate_limiter: RateLimiter | None = None
+_default_lock = threading.Lock()
+
+
+def get_default_rate_limiter() -> RateLimiter:
+    """Return the process-wide rate limiter shared by every client, creating it if needed."""
+    global _default_rate_limiter
+    with _default_lock:
+        if _default_rate_limiter is None:
+            _default_rate_limiter = RateLimiter()
+        return _default_rate_limiter
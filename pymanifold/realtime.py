@@ -0,0 +1,557 @@
+import asyncio
+import inspect
+import itertools
+import logging
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterable
+
+from pymanifold import aio
+from pymanifold.bulk import plan_chunks
+from pymanifold.client import AsyncClient
+from pymanifold.codec import get_default_codec
+from pymanifold.pagination import aiter_bets
+from pymanifold.retry import RetryPolicy
+
+REALTIME_URL = "wss://api.manifold.markets/ws"
+# The server drops connections that stay silent for about a minute.
+DEFAULT_PING_INTERVAL = 30.0
+DEFAULT_POLL_INTERVAL = 5.0
+DEFAULT_QUEUE_SIZE = 1000
+RECONNECT_BASE_DELAY = 1.0
+RECONNECT_MAX_DELAY = 60.0
+MARKETS_ENDPOINT = "/v0/markets"
+COMMENTS_ENDPOINT = "/v0/comments"
+POLL_PAGE_SIZE = 1000
+POLL_COMMENTS_LIMIT = 100
+POLL_CONCURRENCY = 8
+# Ids remembered per topic so events seen both live and by a catch-up poll are delivered once.
+SEEN_IDS = 10_000
+
+NEW_BETS = "global/new-bet"
+NEW_MARKETS = "global/new-contract"
+NEW_COMMENTS = "global/new-comment"
+MARKET_TOPIC = re.compile(
+    r"^contract/(?P<id>[^/]+)(?:/(?P<kind>new-bet|new-comment))?$"
+)
+
+REALTIME = "realtime"
+POLLING = "polling"
+IDLE = "idle"
+
+logger = logging.getLogger(__name__)
+
+
+def market_bets(market_id: str) -> str:
+    """Topic of new bets on a market; events carry `{"bets": [...]}`."""
+    return f"contract/{market_id}/new-bet"
+
+
+def market_updates(market_id: str) -> str:
+    """Topic of changes to a market; events carry `{"contract": {...}}`."""
+    return f"contract/{market_id}"
+
+
+def market_comments(market_id: str) -> str:
+    """Topic of new comments on a market; events carry `{"comment": {...}}`."""
+    return f"contract/{market_id}/new-comment"
+
+
+@dataclass
+class Event:
+    topic: str
+    data: dict
+    source: str
+
+
+Callback = Callable[[Event], Awaitable[None] | None]
+
+_CLOSED = object()
+
+
+def _now_ms() -> float:
+    return time.time() * 1000
+
+
+class Subscription:
+    def __init__(
+        self,
+        realtime: "RealtimeClient",
+        topics: frozenset[str],
+        callback: Callback | None,
+        max_queue: int,
+    ):
+        """
+        Handle for topics subscribed with `RealtimeClient.subscribe`.
+
+        Without a callback, iterate it with `async for` to receive events.
+        """
+        self.topics = topics
+        self.callback = callback
+        self.closed = False
+        self.dropped = 0
+        self._realtime = realtime
+        self._queue: asyncio.Queue | None = (
+            None if callback is not None else asyncio.Queue(maxsize=max_queue)
+        )
+
+    def __repr__(self) -> str:
+        return f"Subscription(topics={sorted(self.topics)}, closed={self.closed})"
+
+    def __aiter__(self) -> "Subscription":
+        if self._queue is None:
+            raise TypeError("This subscription delivers events to its callback")
+        return self
+
+    async def __anext__(self) -> Event:
+        if self.closed and self._queue.empty():
+            raise StopAsyncIteration
+        event = await self._queue.get()
+        if event is _CLOSED:
+            raise StopAsyncIteration
+        return event
+
+    async def __aenter__(self) -> "Subscription":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Unsubscribe from every topic and end iteration."""
+        if self.closed:
+            return
+        self.closed = True
+        await self._realtime._unsubscribe(self)
+        if self._queue is not None:
+            self._put(_CLOSED)
+
+    def _put(self, event: Any) -> None:
+        if self._queue.full():
+            # A slow consumer loses the oldest events rather than stalling every topic.
+            self._queue.get_nowait()
+            self.dropped += 1
+            logger.warning(f"Dropped an event for {sorted(self.topics)}, queue is full")
+        self._queue.put_nowait(event)
+
+    async def _deliver(self, event: Event) -> None:
+        if self.closed:
+            return
+        if self._queue is not None:
+            self._put(event)
+            return
+        try:
+            result = self.callback(event)
+            if inspect.isawaitable(result):
+                await result
+        except Exception:
+            logger.exception(f"Callback for {event.topic} failed")
+
+
+class RealtimeClient:
+    def __init__(
+        self,
+        url: str = REALTIME_URL,
+        realtime: bool = True,
+        poll: bool = True,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        ping_interval: float = DEFAULT_PING_INTERVAL,
+        max_queue: int = DEFAULT_QUEUE_SIZE,
+        api_key: str | None = None,
+        client: AsyncClient | None = None,
+    ):
+        """
+        Live updates for many topics over one websocket connection.
+
+        Topics (see `market_bets`, `market_updates`, `market_comments`,
+        `NEW_BETS`, `NEW_MARKETS` and `NEW_COMMENTS`) are multiplexed on a single
+        connection to the API's realtime endpoint, which is reconnected with
+        backoff when it drops. While it is down, or if `websockets` is not
+        installed (`pip install pymanifold[realtime]`), the same events are
+        produced by polling: bets for every watched market come from a few
+        multi-market `/v0/bets` queries and market updates from one
+        `/v0/markets` scan per interval. After reconnecting, one catch-up poll
+        covers the gap; events are delivered once per topic either way.
+
+        Args:
+            url: Websocket URL of the realtime API
+            realtime: Use the websocket connection; False polls only
+            poll: Poll while the websocket is unavailable; False waits for it instead
+            poll_interval: Seconds between polls
+            ping_interval: Seconds between keep-alive pings on the websocket
+            max_queue: Events buffered per iterated subscription before the oldest are dropped
+            api_key: Optional API key for polling (defaults to `MANIFOLD_API_KEY`)
+            client: Optional pooled async client for polling (defaults to the shared async client)
+        """
+        self.url = url
+        self.realtime = realtime
+        self.poll = poll
+        self.poll_interval = poll_interval
+        self.ping_interval = ping_interval
+        self.max_queue = max_queue
+        self.api_key = api_key
+        self.client = client
+        self.mode = IDLE
+        self._subscriptions: dict[str, set[Subscription]] = {}
+        self._watermarks: dict[str, float] = {}
+        self._seen: dict[str, OrderedDict] = {}
+        self._txid = itertools.count(1)
+        self._backoff = RetryPolicy(
+            base_delay=RECONNECT_BASE_DELAY, max_delay=RECONNECT_MAX_DELAY
+        )
+        self._ws = None
+        self._task: asyncio.Task | None = None
+        self._poller: asyncio.Task | None = None
+        self._connections = 0
+        self._closed = False
+
+    def __repr__(self) -> str:
+        return f"RealtimeClient(mode={self.mode}, topics={len(self._subscriptions)})"
+
+    async def __aenter__(self) -> "RealtimeClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    @property
+    def topics(self) -> list[str]:
+        return list(self._subscriptions)
+
+    async def subscribe(
+        self, topics: str | Iterable[str], callback: Callback | None = None
+    ) -> Subscription:
+        """
+        Subscribe to one or more topics.
+
+        Args:
+            topics: Topic or topics, e.g. `market_bets("abc")`
+            callback: Optional function (or coroutine function) called with each
+                `Event`; without one, iterate the returned subscription
+        """
+        if self._closed:
+            raise RuntimeError("RealtimeClient is closed")
+        topics = frozenset([topics] if isinstance(topics, str) else topics)
+        subscription = Subscription(self, topics, callback, self.max_queue)
+        new = [topic for topic in topics if topic not in self._subscriptions]
+        for topic in topics:
+            self._subscriptions.setdefault(topic, set()).add(subscription)
+            self._watermarks.setdefault(topic, _now_ms())
+        if new and self._ws is not None:
+            await self._send("subscribe", topics=new)
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+        return subscription
+
+    async def aclose(self) -> None:
+        """Close the connection, stop polling and end every subscription."""
+        self._closed = True
+        if self._ws is not None:
+            await self._ws.close()
+        for task in (self._task, self._poller):
+            if task is not None:
+                task.cancel()
+        for task in (self._task, self._poller):
+            if task is not None:
+                try:
+                    await task
+                except (asyncio.CancelledError, Exception):
+                    pass
+        self._task = self._poller = None
+        subscriptions = {s for subs in self._subscriptions.values() for s in subs}
+        for subscription in subscriptions:
+            await subscription.close()
+        self.mode = IDLE
+
+    async def _unsubscribe(self, subscription: Subscription) -> None:
+        gone = []
+        for topic in subscription.topics:
+            subscribers = self._subscriptions.get(topic)
+            if subscribers is None:
+                continue
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscriptions[topic]
+                self._watermarks.pop(topic, None)
+                self._seen.pop(topic, None)
+                gone.append(topic)
+        if gone and self._ws is not None:
+            try:
+                await self._send("unsubscribe", topics=gone)
+            except Exception as e:
+                logger.debug(f"Could not unsubscribe from {gone}: {e}")
+
+    async def _send(self, kind: str, **fields) -> None:
+        message = {"type": kind, "txid": next(self._txid), **fields}
+        await self._ws.send(get_default_codec().dumps(message).decode("utf-8"))
+
+    async def _run(self) -> None:
+        attempt = 0
+        while not self._closed:
+            if self.realtime:
+                connections = self._connections
+                error = None
+                try:
+                    await self._listen()
+                except ImportError:
+                    logger.warning(
+                        "Realtime updates require `websockets` "
+                        "(`pip install pymanifold[realtime]`), polling instead"
+                    )
+                    self.realtime = False
+                except Exception as e:
+                    error = e
+                # A session that was established, however it ended, starts a new streak.
+                if self._connections > connections:
+                    attempt = 0
+                if error is not None:
+                    # Only the first failure of a streak is worth a warning.
+                    log = logger.warning if attempt == 0 else logger.debug
+                    log(f"Realtime connection to {self.url} failed: {error}")
+            if self.poll and (self._poller is None or self._poller.done()):
+                self._poller = asyncio.ensure_future(self._poll_loop())
+            if not self.realtime:
+                if self._poller is not None:
+                    await self._poller
+                return
+            await asyncio.sleep(self._backoff.delay(min(attempt, 16)))
+            attempt += 1
+
+    async def _listen(self) -> None:
+        """Hold one websocket connection until it closes, counting it once established."""
+        from websockets.asyncio.client import connect
+
+        async with connect(self.url, ping_interval=None) as ws:
+            self._ws = ws
+            pinger = asyncio.ensure_future(self._ping())
+            try:
+                if self._subscriptions:
+                    await self._send("subscribe", topics=list(self._subscriptions))
+                # Catch up on whatever was missed while polling or disconnected.
+                catch_up = self._poller is not None or self._connections > 0
+                if self._poller is not None:
+                    self._poller.cancel()
+                    self._poller = None
+                self._connections += 1
+                self.mode = REALTIME
+                logger.info(f"Connected to {self.url}")
+                if catch_up:
+                    await self._poll_once()
+                async for message in ws:
+                    await self._on_message(message)
+            finally:
+                pinger.cancel()
+                self._ws = None
+                self.mode = IDLE
+
+    async def _ping(self) -> None:
+        while True:
+            await asyncio.sleep(self.ping_interval)
+            await self._send("ping")
+
+    async def _on_message(self, message: str | bytes) -> None:
+        try:
+            payload = get_default_codec().loads(message)
+        except ValueError:
+            logger.debug(f"Ignoring malformed realtime message {message!r}")
+            return
+        kind = payload.get("type")
+        if kind == "broadcast":
+            await self._dispatch(
+                payload.get("topic"), payload.get("data") or {}, REALTIME
+            )
+        elif kind == "ack" and not payload.get("success", True):
+            logger.warning(
+                f"Realtime request {payload.get('txid')} failed: {payload.get('error')}"
+            )
+
+    async def _dispatch(self, topic: str, data: dict, source: str) -> None:
+        subscribers = self._subscriptions.get(topic)
+        if not subscribers:
+            return
+        data = self._fresh(topic, data)
+        if data is None:
+            return
+        event = Event(topic, data, source)
+        for subscription in list(subscribers):
+            await subscription._deliver(event)
+
+    def _fresh(self, topic: str, data: dict) -> dict | None:
+        """Drop objects already delivered on this topic and advance its watermark."""
+        seen = self._seen.setdefault(topic, OrderedDict())
+        watermark = self._watermarks.get(topic, 0.0)
+
+        def fresh(key: str | None, created: float | None) -> bool:
+            nonlocal watermark
+            if created is not None:
+                watermark = max(watermark, created)
+            if key is None:
+                return True
+            if key in seen:
+                return False
+            seen[key] = None
+            if len(seen) > SEEN_IDS:
+                seen.popitem(last=False)
+            return True
+
+        if "bets" in data:
+            bets = [
+                bet
+                for bet in data["bets"]
+                if fresh(bet.get("id"), bet.get("createdTime"))
+            ]
+            data = {**data, "bets": bets} if bets else None
+        elif "comment" in data:
+            comment = data["comment"]
+            if not fresh(comment.get("id"), comment.get("createdTime")):
+                data = None
+        elif "contract" in data:
+            contract = data["contract"]
+            if topic == NEW_MARKETS:
+                key, created = contract.get("id"), contract.get("createdTime")
+            else:
+                created = contract.get("lastUpdatedTime")
+                key = None if created is None else f"{contract.get('id')}@{created}"
+            if not fresh(key, created):
+                data = None
+        if topic in self._watermarks:
+            self._watermarks[topic] = watermark
+        return data
+
+    async def _poll_loop(self) -> None:
+        self.mode = POLLING
+        while True:
+            await self._poll_once()
+            await asyncio.sleep(self.poll_interval)
+
+    async def _poll_once(self) -> None:
+        """Fetch everything newer than each topic's watermark with as few requests as possible."""
+        bet_markets, update_markets, comment_markets = [], set(), []
+        for topic in list(self._subscriptions):
+            match = MARKET_TOPIC.match(topic)
+            if match is None:
+                continue
+            kind = match.group("kind")
+            if kind == "new-bet":
+                bet_markets.append(match.group("id"))
+            elif kind == "new-comment":
+                comment_markets.append(match.group("id"))
+            else:
+                update_markets.add(match.group("id"))
+
+        jobs = []
+        if NEW_BETS in self._subscriptions:
+            # One unfiltered query also covers every per-market bet topic.
+            jobs.append(self._poll_bets(None, bet_markets))
+        else:
+            for chunk in plan_chunks(bet_markets):
+                jobs.append(self._poll_bets(chunk, chunk))
+        if update_markets or NEW_MARKETS in self._subscriptions:
+            jobs.append(self._poll_markets(update_markets))
+        if NEW_COMMENTS in self._subscriptions:
+            jobs.append(self._poll_comments(None))
+        for market_id in comment_markets:
+            jobs.append(self._poll_comments(market_id))
+
+        try:
+            results = await aio.gather(
+                jobs, limit=POLL_CONCURRENCY, return_exceptions=True
+            )
+        except asyncio.CancelledError:
+            # Jobs still waiting for a slot never started; close them quietly.
+            for job in jobs:
+                if inspect.getcoroutinestate(job) == inspect.CORO_CREATED:
+                    job.close()
+            raise
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning(f"Polling for realtime topics failed: {result}")
+
+    async def _poll_bets(
+        self, contract_ids: list[str] | None, market_ids: list[str]
+    ) -> None:
+        topics = [market_bets(market_id) for market_id in market_ids]
+        if contract_ids is None:
+            topics.append(NEW_BETS)
+        since = min(
+            (self._watermarks[topic] for topic in topics if topic in self._watermarks),
+            default=_now_ms(),
+        )
+        params = {"afterTime": since, "order": "asc"}
+        if contract_ids is not None:
+            params["contractId"] = contract_ids
+        by_market: dict[str, list[dict]] = {}
+        bets = []
+        async for bet in aiter_bets(
+            params, page_size=POLL_PAGE_SIZE, api_key=self.api_key, client=self.client
+        ):
+            bets.append(bet)
+            by_market.setdefault(bet.get("contractId"), []).append(bet)
+        if bets and contract_ids is None:
+            await self._dispatch_newer(NEW_BETS, "bets", bets)
+        for market_id, rows in by_market.items():
+            await self._dispatch_newer(market_bets(market_id), "bets", rows)
+
+    async def _poll_markets(self, market_ids: set[str]) -> None:
+        topics = [market_updates(market_id) for market_id in market_ids]
+        topics.append(NEW_MARKETS)
+        since = min(
+            (self._watermarks[topic] for topic in topics if topic in self._watermarks),
+            default=_now_ms(),
+        )
+        # New markets are also the most recently updated, so one scan covers both.
+        params = {"sort": "updated-time", "order": "desc", "limit": POLL_PAGE_SIZE}
+        markets = []
+        while True:
+            page = await aio.call_manifold_api(
+                MARKETS_ENDPOINT,
+                params=params,
+                api_key=self.api_key,
+                client=self.client,
+                cache=False,
+            )
+            newer = [m for m in page if m.get("lastUpdatedTime", 0) > since]
+            markets.extend(newer)
+            if len(newer) < len(page) or len(page) < POLL_PAGE_SIZE:
+                break
+            params = {**params, "before": page[-1]["id"]}
+        for market in markets:
+            if market["id"] in market_ids:
+                await self._dispatch_newer(
+                    market_updates(market["id"]),
+                    "contract",
+                    [market],
+                    "lastUpdatedTime",
+                )
+        await self._dispatch_newer(NEW_MARKETS, "contract", markets)
+
+    async def _poll_comments(self, market_id: str | None) -> None:
+        topic = NEW_COMMENTS if market_id is None else market_comments(market_id)
+        params = {"limit": POLL_COMMENTS_LIMIT}
+        if market_id is not None:
+            params["contractId"] = market_id
+        comments = await aio.call_manifold_api(
+            COMMENTS_ENDPOINT,
+            params=params,
+            api_key=self.api_key,
+            client=self.client,
+            cache=False,
+        )
+        await self._dispatch_newer(topic, "comment", comments[::-1])
+
+    async def _dispatch_newer(
+        self, topic: str, field: str, rows: list[dict], time_field: str = "createdTime"
+    ) -> None:
+        watermark = self._watermarks.get(topic)
+        if watermark is None:
+            return
+        rows = [row for row in rows if row.get(time_field, 0) >= watermark]
+        if not rows:
+            return
+        if field == "bets":
+            await self._dispatch(topic, {"bets": rows}, POLLING)
+        else:
+            for row in sorted(rows, key=lambda row: row.get(time_field, 0)):
+                await self._dispatch(topic, {field: row}, POLLING)
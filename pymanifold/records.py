@@ -0,0 +1,348 @@
+import sys
+from operator import itemgetter
+from typing import Any, Iterable, Iterator
+
+from pymanifold.hooks import endpoint_template
+
+NUMBER = (int, float)
+
+
+class Record(tuple):
+    """
+    Compact, immutable response object backed by a tuple of field values.
+
+    Subclasses declare `FIELDS` (API field name -> accepted type or tuple of
+    types); each field becomes a read-only attribute named like the API key
+    (e.g. `bet.contractId`), None when the response omitted it. Fields not
+    listed are dropped unless the record is built with `extras=True`, which
+    keeps them in `extras`. Repeated strings named in `INTERNED` (ids,
+    usernames, enums) are shared between records instead of stored once per row.
+
+    Records only compare and hash equal to records of the same type.
+    """
+
+    __slots__ = ()
+
+    FIELDS: dict[str, type | tuple[type, ...]] = {}
+    REQUIRED: frozenset[str] = frozenset({"id"})
+    INTERNED: frozenset[str] = frozenset()
+
+    _fields: tuple[str, ...] = ()
+    _interned: tuple[int, ...] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "__slots__" not in cls.__dict__:
+            raise TypeError(f"{cls.__name__} must declare `__slots__ = ()`")
+        cls._fields = tuple(cls.FIELDS)
+        cls._interned = tuple(
+            index for index, name in enumerate(cls._fields) if name in cls.INTERNED
+        )
+        for index, name in enumerate(cls._fields):
+            setattr(cls, name, property(itemgetter(index), doc=f"`{name}` field"))
+
+    def __new__(cls, **fields):
+        return cls.from_dict(fields)
+
+    def __reduce__(self) -> tuple:
+        return self._make, (tuple(self),)
+
+    @classmethod
+    def _make(cls, values: tuple) -> "Record":
+        return tuple.__new__(cls, values)
+
+    def __eq__(self, other: object) -> bool:
+        # Plain tuple equality would make a Bet equal to a Comment with the same values.
+        return type(other) is type(self) and tuple.__eq__(self, other)
+
+    def __ne__(self, other: object) -> bool:
+        return not self == other
+
+    def __hash__(self) -> int:
+        return hash((type(self), tuple.__hash__(self)))
+
+    def __repr__(self) -> str:
+        fields = ", ".join(
+            f"{name}={value!r}"
+            for name, value in zip(self._fields, self)
+            if value is not None
+        )
+        return f"{type(self).__name__}({fields})"
+
+    @property
+    def extras(self) -> dict | None:
+        """Fields the record type does not list, if built with `extras=True` and there were any."""
+        return self[-1] if len(self) > len(self._fields) else None
+
+    @classmethod
+    def from_dict(
+        cls, data: dict, trusted: bool = False, extras: bool = False
+    ) -> "Record":
+        """
+        Build a record from a decoded API object.
+
+        Args:
+            data: Decoded JSON object, e.g. one element of a `/v0/bets` response
+            trusted: Skip type checks, for responses straight from the API
+            extras: Keep fields the record type does not list in `extras`
+                instead of dropping them
+
+        Raises:
+            ValueError: If `data` is not an object, misses a required field or
+                holds a value of the wrong type (only when not `trusted`)
+        """
+        if not trusted:
+            cls.validate(data)
+        values = list(map(data.get, cls._fields))
+        for index in cls._interned:
+            value = values[index]
+            if type(value) is str:
+                values[index] = sys.intern(value)
+        if extras and not data.keys() <= cls.FIELDS.keys():
+            values.append(
+                {name: value for name, value in data.items() if name not in cls.FIELDS}
+            )
+        return tuple.__new__(cls, values)
+
+    @classmethod
+    def from_dicts(
+        cls, rows: Iterable[dict], trusted: bool = False, extras: bool = False
+    ) -> Iterator["Record"]:
+        """Lazily convert decoded API objects, e.g. `Bet.from_dicts(iter_bets(...), trusted=True)`."""
+        from_dict = cls.from_dict
+        for row in rows:
+            yield from_dict(row, trusted, extras)
+
+    @classmethod
+    def validate(cls, data: Any) -> None:
+        """Check that `data` has the required fields and that every known field has the right type."""
+        if not isinstance(data, dict):
+            raise ValueError(
+                f"{cls.__name__} expects an object, got {type(data).__name__}"
+            )
+        missing = [name for name in cls.REQUIRED if data.get(name) is None]
+        if missing:
+            raise ValueError(f"{cls.__name__} is missing {sorted(missing)}")
+        for name, types in cls.FIELDS.items():
+            value = data.get(name)
+            if value is None:
+                continue
+            if not isinstance(value, types) or (
+                type(value) is bool and bool not in _as_tuple(types)
+            ):
+                raise ValueError(
+                    f"{cls.__name__}.{name} expects {_type_names(types)}, "
+                    f"got {type(value).__name__}"
+                )
+
+    def to_dict(self) -> dict:
+        """Return the fields present in the response, including any `extras`, as a plain dict."""
+        fields = {
+            name: value for name, value in zip(self._fields, self) if value is not None
+        }
+        if len(self) > len(self._fields):
+            fields.update(self[-1])
+        return fields
+
+
+def _as_tuple(types: type | tuple[type, ...]) -> tuple[type, ...]:
+    return types if isinstance(types, tuple) else (types,)
+
+
+def _type_names(types: type | tuple[type, ...]) -> str:
+    return " or ".join(t.__name__ for t in _as_tuple(types))
+
+
+class Bet(Record):
+    __slots__ = ()
+
+    FIELDS = {
+        "id": str,
+        "userId": str,
+        "contractId": str,
+        "answerId": str,
+        "createdTime": NUMBER,
+        "updatedTime": NUMBER,
+        "amount": NUMBER,
+        "shares": NUMBER,
+        "outcome": str,
+        "probBefore": NUMBER,
+        "probAfter": NUMBER,
+        "limitProb": NUMBER,
+        "orderAmount": NUMBER,
+        "loanAmount": NUMBER,
+        "isFilled": bool,
+        "isCancelled": bool,
+        "isRedemption": bool,
+        "expiresAt": NUMBER,
+        "betGroupId": str,
+        "replyToCommentId": str,
+    }
+    INTERNED = frozenset({"userId", "contractId", "answerId", "outcome", "betGroupId"})
+
+
+class Market(Record):
+    __slots__ = ()
+
+    FIELDS = {
+        "id": str,
+        "creatorId": str,
+        "creatorUsername": str,
+        "creatorName": str,
+        "creatorAvatarUrl": str,
+        "createdTime": NUMBER,
+        "closeTime": NUMBER,
+        "question": str,
+        "slug": str,
+        "url": str,
+        "outcomeType": str,
+        "mechanism": str,
+        "probability": NUMBER,
+        "p": NUMBER,
+        "pool": dict,
+        "totalLiquidity": NUMBER,
+        "volume": NUMBER,
+        "volume24Hours": NUMBER,
+        "isResolved": bool,
+        "resolution": str,
+        "resolutionTime": NUMBER,
+        "resolutionProbability": NUMBER,
+        "uniqueBettorCount": int,
+        "lastUpdatedTime": NUMBER,
+        "lastBetTime": NUMBER,
+        "lastCommentTime": NUMBER,
+        "token": str,
+    }
+    INTERNED = frozenset(
+        {
+            "creatorId",
+            "creatorUsername",
+            "creatorName",
+            "creatorAvatarUrl",
+            "outcomeType",
+            "mechanism",
+            "resolution",
+            "token",
+        }
+    )
+
+
+class User(Record):
+    __slots__ = ()
+
+    FIELDS = {
+        "id": str,
+        "createdTime": NUMBER,
+        "name": str,
+        "username": str,
+        "url": str,
+        "avatarUrl": str,
+        "bio": str,
+        "balance": NUMBER,
+        "totalDeposits": NUMBER,
+        "profitCached": dict,
+        "isBot": bool,
+        "isAdmin": bool,
+        "isTrustworthy": bool,
+        "isBannedFromPosting": bool,
+        "userDeleted": bool,
+        "lastBetTime": NUMBER,
+    }
+
+
+class Comment(Record):
+    __slots__ = ()
+
+    FIELDS = {
+        "id": str,
+        "contractId": str,
+        "userId": str,
+        "userName": str,
+        "userUsername": str,
+        "userAvatarUrl": str,
+        "createdTime": NUMBER,
+        "editedTime": NUMBER,
+        "content": dict,
+        "commentType": str,
+        "replyToCommentId": str,
+        "answerOutcome": str,
+        "betId": str,
+        "visibility": str,
+    }
+    INTERNED = frozenset(
+        {
+            "contractId",
+            "userId",
+            "userName",
+            "userUsername",
+            "userAvatarUrl",
+            "commentType",
+            "visibility",
+        }
+    )
+
+
+class Txn(Record):
+    __slots__ = ()
+
+    FIELDS = {
+        "id": str,
+        "createdTime": NUMBER,
+        "fromId": str,
+        "fromType": str,
+        "toId": str,
+        "toType": str,
+        "amount": NUMBER,
+        "token": str,
+        "category": str,
+        "description": str,
+        "data": dict,
+    }
+    INTERNED = frozenset({"fromId", "fromType", "toId", "toType", "token", "category"})
+
+
+# Endpoint template -> record type of the objects it returns.
+RECORD_TYPES: dict[str, type[Record]] = {
+    "/v0/bets": Bet,
+    "/v0/user/[username]/bets": Bet,
+    "/v0/markets": Market,
+    "/v0/market/[marketId]": Market,
+    "/v0/slug/[marketSlug]": Market,
+    "/v0/search-markets": Market,
+    "/v0/users": User,
+    "/v0/user/[username]": User,
+    "/v0/user/by-id/[id]": User,
+    "/v0/me": User,
+    "/v0/comments": Comment,
+    "/v0/txns": Txn,
+    "/v0/managrams": Txn,
+}
+
+
+def record_type(endpoint: str) -> type[Record] | None:
+    """Return the record type for an endpoint path or template, if it has one."""
+    return RECORD_TYPES.get(endpoint_template(endpoint))
+
+
+def to_records(
+    endpoint: str, data: Any, trusted: bool = False, extras: bool = False
+) -> Any:
+    """
+    Convert a decoded response into records of the endpoint's type.
+
+    Lists are converted element-wise. Responses from endpoints without a
+    record type are returned unchanged.
+
+    Args:
+        endpoint: Endpoint path the response came from, e.g. "/v0/bets"
+        data: Decoded response
+        trusted: Skip per-field validation
+        extras: Keep fields the record type does not list (see `Record.extras`)
+    """
+    cls = record_type(endpoint)
+    if cls is None:
+        return data
+    if isinstance(data, list):
+        from_dict = cls.from_dict
+        return [from_dict(row, trusted, extras) for row in data]
+    return cls.from_dict(data, trusted, extras)
@@ -0,0 +1,116 @@
+import random
+import secrets
+
+import httpx
+
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BASE_DELAY = 0.25
+DEFAULT_MAX_DELAY = 8.0
+
+# Transient server-side failures. 429 is handled by the rate limiter.
+RETRY_STATUSES = frozenset({500, 502, 503, 504})
+# Methods that can be resent without changing the outcome.
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+# Errors raised before the request reached the server, safe to retry for any method.
+UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+# Errors after which a request may or may not have been processed.
+TRANSIENT_ERRORS = (
+    httpx.TimeoutException,
+    httpx.NetworkError,
+    httpx.RemoteProtocolError,
+)
+
+IDEMPOTENCY_KEY_FIELD = "idempotencyKey"
+# Write endpoints that accept an idempotency key (see `pymanifold.models.market.Market7`).
+IDEMPOTENCY_KEY_ENDPOINTS = frozenset({"/v0/market"})
+# The API accepts 10 characters of this alphabet.
+IDEMPOTENCY_KEY_ALPHABET = (
+    "useandom26T198340PX75pxJACKVERYMINDBUSHWOLFGQZbfghjklqvwyzrict"
+)
+IDEMPOTENCY_KEY_LENGTH = 10
+
+
+def generate_idempotency_key() -> str:
+    """Return a random idempotency key in the format the API accepts."""
+    return "".join(
+        secrets.choice(IDEMPOTENCY_KEY_ALPHABET) for _ in range(IDEMPOTENCY_KEY_LENGTH)
+    )
+
+
+class RetryPolicy:
+    def __init__(
+        self,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        base_delay: float = DEFAULT_BASE_DELAY,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        statuses: frozenset[int] = RETRY_STATUSES,
+        auto_idempotency_key: bool = True,
+    ):
+        """
+        Retry transient failures with jittered exponential backoff, without duplicating writes.
+
+        GETs (and other idempotent methods) are retried on 5xx responses,
+        timeouts and connection errors. Other requests are retried only when
+        their JSON body carries an `idempotencyKey`, so the server can drop the
+        duplicate, or when the connection failed before anything was sent.
+
+        Args:
+            max_retries: Maximum number of retries per request
+            base_delay: Upper bound in seconds of the first backoff; doubles on each retry
+            max_delay: Cap on the backoff upper bound
+            statuses: Response status codes that are retried
+            auto_idempotency_key: Add a random `idempotencyKey` to writes whose endpoint
+                supports one (e.g. creating a market) when the caller did not
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.statuses = statuses
+        self.auto_idempotency_key = auto_idempotency_key
+
+    def __repr__(self) -> str:
+        return f"RetryPolicy(max_retries={self.max_retries}, base_delay={self.base_delay}, max_delay={self.max_delay})"
+
+    def prepare(self, method: str, endpoint: str, json: dict | None) -> dict | None:
+        """Return the JSON body to send, with an idempotency key added if supported."""
+        if (
+            self.auto_idempotency_key
+            and method.upper() != "GET"
+            and endpoint in IDEMPOTENCY_KEY_ENDPOINTS
+            and isinstance(json, dict)
+            and not json.get(IDEMPOTENCY_KEY_FIELD)
+        ):
+            return {**json, IDEMPOTENCY_KEY_FIELD: generate_idempotency_key()}
+        return json
+
+    def is_idempotent(self, method: str, json: dict | None) -> bool:
+        if method.upper() in IDEMPOTENT_METHODS:
+            return True
+        return isinstance(json, dict) and bool(json.get(IDEMPOTENCY_KEY_FIELD))
+
+    def should_retry(
+        self,
+        method: str,
+        json: dict | None,
+        retries: int,
+        response: httpx.Response | None = None,
+        error: BaseException | None = None,
+    ) -> bool:
+        """Return whether a failed attempt (a response or an exception) should be retried."""
+        if retries >= self.max_retries:
+            return False
+        if error is not None:
+            if isinstance(error, UNSENT_ERRORS):
+                return True
+            return isinstance(error, TRANSIENT_ERRORS) and self.is_idempotent(
+                method, json
+            )
+        return (
+            response is not None
+            and response.status_code in self.statuses
+            and self.is_idempotent(method, json)
+        )
+
+    def delay(self, retries: int) -> float:
+        """Seconds to wait before retry number `retries + 1` ("full jitter" backoff)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**retries))
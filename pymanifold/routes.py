@@ -0,0 +1,70 @@
+import re
+from functools import lru_cache
+from urllib.parse import quote
+
+from pymanifold.endpoints import ENDPOINTS
+
+PLACEHOLDER = re.compile(r"\[(\w+)\]")
+
+
+def compile_template(template: str) -> re.Pattern:
+    """Compile an endpoint template such as "/v0/market/[marketId]" into a path regex."""
+    pattern = re.sub(r"\\\[(\w+)\\\]", r"(?P<\1>[^/]+)", re.escape(template))
+    return re.compile(f"^{pattern}$")
+
+
+class Route:
+    __slots__ = ("template", "method", "params", "_literals")
+
+    def __init__(self, template: str, method: str | None = None):
+        """
+        Endpoint template such as "/v0/market/[marketId]/sell", parsed once.
+
+        Formatting a URL builds a new string from the parsed pieces, so one
+        route can be shared by any number of threads and tasks.
+
+        Args:
+            template: Endpoint template with `[name]` placeholders
+            method: HTTP method of the endpoint, if known
+        """
+        self.template = template
+        self.method = method
+        pieces = PLACEHOLDER.split(template)
+        # Alternating literals and placeholder names, starting and ending with a literal.
+        self._literals: tuple[str, ...] = tuple(pieces[::2])
+        self.params: tuple[str, ...] = tuple(pieces[1::2])
+
+    def __repr__(self) -> str:
+        return f"Route(template={self.template}, method={self.method})"
+
+    def format(self, url_params: dict | None = None) -> str:
+        """
+        Return the request path with every placeholder substituted.
+
+        Values are percent-encoded, so an id can never add path segments.
+        Parameters the template does not use are ignored.
+
+        Raises:
+            ValueError: If a placeholder has no value in `url_params`
+        """
+        if not self.params:
+            return self.template
+        url_params = url_params or {}
+        literals = self._literals
+        parts = [literals[0]]
+        for name, literal in zip(self.params, literals[1:]):
+            try:
+                value = url_params[name]
+            except KeyError:
+                raise ValueError(
+                    f"Missing URL parameter {name!r} for {self.template}"
+                ) from None
+            parts.append(quote(str(value), safe=""))
+            parts.append(literal)
+        return "".join(parts)
+
+
+@lru_cache(maxsize=None)
+def get_route(template: str) -> Route:
+    """Return the shared route for an endpoint template, with its method from `ENDPOINTS`."""
+    return Route(template, ENDPOINTS.get(template, {}).get("method"))
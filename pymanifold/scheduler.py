@@ -0,0 +1,356 @@
+import asyncio
+import heapq
+import inspect
+import itertools
+import logging
+import time
+from typing import Awaitable, Callable, Iterable
+
+from pymanifold import aio
+from pymanifold.client import AsyncClient
+from pymanifold.ratelimit import TokenBucket
+from pymanifold.routes import get_route
+
+MARKET_ROUTE = "/v0/market/[marketId]"
+DEFAULT_RPS = 2.0
+DEFAULT_MIN_INTERVAL = 10.0
+DEFAULT_MAX_INTERVAL = 6 * 3600.0
+DEFAULT_CONCURRENCY = 8
+# A market that last traded t seconds ago is expected to change again within about t;
+# polling at a fraction of that catches most changes without hammering idle markets.
+RECENCY_FACTOR = 0.25
+# 24h volume (mana) at which a market is polled twice as often.
+VOLUME_SCALE = 1000.0
+# Polls guaranteed between now and a market's close, so the close itself is seen promptly.
+CLOSE_POLLS = 4
+# Interval multipliers after a poll that found the market changed or unchanged.
+SHRINK = 0.5
+GROWTH = 1.5
+# Longest the scheduler sleeps before re-checking the queue.
+IDLE_WAIT = 1.0
+
+logger = logging.getLogger(__name__)
+
+
+class _Entry:
+    __slots__ = ("market_id", "market", "interval", "version", "token")
+
+    def __init__(self, market_id: str):
+        self.market_id = market_id
+        self.market: dict | None = None
+        self.interval: float | None = None
+        self.version = None
+        # Matches the entry's live heap item; older items are skipped when popped.
+        self.token = -1
+
+
+def _version(market: dict) -> tuple:
+    return (
+        market.get("lastUpdatedTime"),
+        market.get("lastBetTime"),
+        market.get("probability"),
+        market.get("isResolved"),
+    )
+
+
+class PollSchedule:
+    def __init__(
+        self,
+        rps: float = DEFAULT_RPS,
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        max_interval: float = DEFAULT_MAX_INTERVAL,
+    ):
+        """
+        Priority queue of markets ordered by when each is next due for a poll.
+
+        Each market's interval comes from its activity (time since its last
+        bet, 24h volume and how soon it closes) and shrinks or grows as polls
+        find it changed or not. When the intervals ask for more than `rps`
+        polls per second, every interval is stretched by the same factor, so the
+        budget is shared in proportion to how often each market changes.
+
+        Args:
+            rps: Polls per second the schedule is sized for
+            min_interval: Shortest interval in seconds between polls of one market
+            max_interval: Longest interval in seconds, used for closed and resolved markets
+        """
+        self.rps = rps
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._heap: list[tuple[float, int, str]] = []
+        self._entries: dict[str, _Entry] = {}
+        self._tokens = itertools.count()
+        # Polls per second the current intervals ask for.
+        self._demand = 0.0
+
+    def __repr__(self) -> str:
+        return f"PollSchedule(markets={len(self)}, load={self.load:.2f})"
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, market_id: str) -> bool:
+        return market_id in self._entries
+
+    @property
+    def load(self) -> float:
+        """Polls per second wanted divided by the budget; above 1 every interval is stretched."""
+        return self._demand / self.rps
+
+    def interval(self, market_id: str) -> float | None:
+        """Current interval of a market, None until it has been seen."""
+        entry = self._entries.get(market_id)
+        return None if entry is None else entry.interval
+
+    def estimate(self, market: dict, now: float) -> float:
+        """Return the poll interval in seconds suggested by a market's activity."""
+        now_ms = now * 1000
+        close_time = market.get("closeTime")
+        if market.get("isResolved") or (
+            close_time is not None and close_time <= now_ms
+        ):
+            return self.max_interval
+        last = (
+            market.get("lastBetTime")
+            or market.get("lastUpdatedTime")
+            or market.get("createdTime")
+        )
+        idle = (now_ms - last) / 1000 if last else self.max_interval
+        interval = max(idle, 0.0) * RECENCY_FACTOR
+        interval /= 1 + (market.get("volume24Hours") or 0) / VOLUME_SCALE
+        return self._clamp(interval, market, now)
+
+    def _clamp(self, interval: float, market: dict, now: float) -> float:
+        close_time = market.get("closeTime")
+        if close_time is not None and close_time > now * 1000:
+            interval = min(interval, (close_time / 1000 - now) / CLOSE_POLLS)
+        return min(self.max_interval, max(self.min_interval, interval))
+
+    def add(self, market: str | dict, now: float | None = None) -> None:
+        """
+        Watch a market, given its id or a market object (e.g. from `/v0/markets`).
+
+        A market object counts as a fresh poll, so its first real poll is
+        scheduled from its activity; a bare id is due immediately.
+        """
+        now = time.time() if now is None else now
+        if isinstance(market, str):
+            if market not in self._entries:
+                entry = self._entries[market] = _Entry(market)
+                self._push(entry, now)
+            return
+        if market["id"] in self._entries:
+            self.record(market["id"], market, now)
+            return
+        entry = self._entries[market["id"]] = _Entry(market["id"])
+        self._update(entry, market, self.estimate(market, now), now)
+
+    def remove(self, market_id: str) -> None:
+        """Stop watching a market."""
+        entry = self._entries.pop(market_id, None)
+        if entry is not None and entry.interval is not None:
+            self._demand -= 1 / entry.interval
+
+    def pop_due(self, now: float | None = None) -> str | None:
+        """Take the most overdue market, or None if nothing is due yet."""
+        now = time.time() if now is None else now
+        self._discard_stale()
+        if not self._heap or self._heap[0][0] > now:
+            return None
+        _, _, market_id = heapq.heappop(self._heap)
+        # Not due again until its poll is recorded.
+        self._entries[market_id].token = -1
+        return market_id
+
+    def next_due(self) -> float | None:
+        """Time the next market becomes due, or None if none is queued."""
+        self._discard_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def record(
+        self, market_id: str, market: dict | None, now: float | None = None
+    ) -> bool:
+        """
+        Reschedule a market after a poll and return whether it changed.
+
+        Args:
+            market_id: Market that was polled
+            market: The market returned by the API, None if the poll failed
+            now: Time of the poll (defaults to now)
+        """
+        now = time.time() if now is None else now
+        entry = self._entries.get(market_id)
+        if entry is None:
+            return False
+        if market is None:
+            # Retry failures at the usual pace rather than immediately.
+            self._push(entry, now, entry.interval or self.min_interval)
+            return False
+        changed = entry.version is not None and _version(market) != entry.version
+        estimate = self.estimate(market, now)
+        if entry.interval is None:
+            interval = estimate
+        elif changed:
+            interval = min(estimate, entry.interval * SHRINK)
+        else:
+            interval = max(estimate, entry.interval * GROWTH)
+        self._update(entry, market, self._clamp(interval, market, now), now)
+        return changed
+
+    def _update(self, entry: _Entry, market: dict, interval: float, now: float) -> None:
+        if entry.interval is not None:
+            self._demand -= 1 / entry.interval
+        self._demand += 1 / interval
+        entry.market = market
+        entry.version = _version(market)
+        entry.interval = interval
+        self._push(entry, now, interval)
+
+    def _push(self, entry: _Entry, now: float, interval: float | None = None) -> None:
+        due = now if interval is None else now + interval * max(1.0, self.load)
+        entry.token = next(self._tokens)
+        heapq.heappush(self._heap, (due, entry.token, entry.market_id))
+
+    def _discard_stale(self) -> None:
+        heap = self._heap
+        while heap:
+            _, token, market_id = heap[0]
+            entry = self._entries.get(market_id)
+            if entry is not None and entry.token == token:
+                return
+            heapq.heappop(heap)
+
+
+class MarketPoller:
+    def __init__(
+        self,
+        markets: Iterable[str | dict] = (),
+        on_change: Callable[[dict], Awaitable[None] | None] | None = None,
+        rps: float = DEFAULT_RPS,
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        max_interval: float = DEFAULT_MAX_INTERVAL,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        api_key: str | None = None,
+        client: AsyncClient | None = None,
+    ):
+        """
+        Poll many markets via `/v0/market/[marketId]` within a fixed request budget.
+
+        Markets are taken from a `PollSchedule` in order of when they are due
+        and fetched at no more than `rps` requests per second, so busy markets
+        are refreshed often and idle, closed or resolved ones rarely.
+
+        Args:
+            markets: Market ids or market objects to watch; objects (e.g. from
+                `/v0/markets` or a `MarketMirror`) seed the schedule without a first poll
+            on_change: Function (or coroutine function) called with each market a poll
+                found changed
+            rps: Requests per second spent on polling
+            min_interval: Shortest interval in seconds between polls of one market
+            max_interval: Longest interval in seconds between polls of one market
+            concurrency: Maximum number of polls in flight
+            api_key: Optional API key (defaults to `MANIFOLD_API_KEY`)
+            client: Optional pooled async client (defaults to the shared async client)
+        """
+        self.schedule = PollSchedule(rps, min_interval, max_interval)
+        self.on_change = on_change
+        self.concurrency = concurrency
+        self.api_key = api_key
+        self.client = client
+        self.polls = 0
+        self.changes = 0
+        self.errors = 0
+        self._bucket = TokenBucket(rps, burst=1)
+        self._route = get_route(MARKET_ROUTE)
+        self._stop: asyncio.Event | None = None
+        now = time.time()
+        for market in markets:
+            self.schedule.add(market, now)
+
+    def __repr__(self) -> str:
+        return f"MarketPoller(markets={len(self.schedule)}, polls={self.polls}, changes={self.changes})"
+
+    def add(self, market: str | dict) -> None:
+        """Watch another market, by id or market object."""
+        self.schedule.add(market)
+
+    def remove(self, market_id: str) -> None:
+        """Stop watching a market."""
+        self.schedule.remove(market_id)
+
+    def stop(self) -> None:
+        """Make `run` return after the polls in flight finish."""
+        if self._stop is not None:
+            self._stop.set()
+
+    async def run(self, duration: float | None = None) -> None:
+        """
+        Poll until `stop()` is called, or for `duration` seconds.
+
+        Args:
+            duration: Optional number of seconds to run for
+        """
+        self._stop = stop = asyncio.Event()
+        deadline = None if duration is None else time.monotonic() + duration
+        slots = asyncio.Semaphore(self.concurrency)
+        running: set[asyncio.Task] = set()
+        try:
+            while not stop.is_set():
+                if deadline is not None and time.monotonic() >= deadline:
+                    break
+                market_id = self.schedule.pop_due()
+                if market_id is None:
+                    next_due = self.schedule.next_due()
+                    wait = IDLE_WAIT if next_due is None else next_due - time.time()
+                    if deadline is not None:
+                        wait = min(wait, deadline - time.monotonic())
+                    await _wait(stop, min(IDLE_WAIT, max(wait, 0.0)))
+                    continue
+                delay = self._bucket.reserve()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                await slots.acquire()
+                task = asyncio.ensure_future(self._poll(market_id, slots))
+                running.add(task)
+                task.add_done_callback(running.discard)
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+        finally:
+            for task in running:
+                task.cancel()
+            self._stop = None
+
+    async def _poll(self, market_id: str, slots: asyncio.Semaphore) -> None:
+        try:
+            market = await aio.call_manifold_api(
+                self._route.format({"marketId": market_id}),
+                api_key=self.api_key,
+                client=self.client,
+                cache=False,
+            )
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Polling market {market_id} failed: {e}")
+            self.schedule.record(market_id, None)
+            return
+        finally:
+            slots.release()
+        self.polls += 1
+        if not self.schedule.record(market_id, market):
+            return
+        self.changes += 1
+        if self.on_change is None:
+            return
+        try:
+            result = self.on_change(market)
+            if inspect.isawaitable(result):
+                await result
+        except Exception:
+            logger.exception(f"on_change failed for market {market_id}")
+
+
+async def _wait(event: asyncio.Event, timeout: float) -> None:
+    try:
+        await asyncio.wait_for(event.wait(), timeout)
+    except asyncio.TimeoutError:
+        pass
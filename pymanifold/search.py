@@ -0,0 +1,187 @@
+import asyncio
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import AsyncIterator, Iterator
+
+from pymanifold import call_manifold_api
+from pymanifold import aio
+from pymanifold.client import AsyncClient, Client
+
+SEARCH_ENDPOINT = "/v0/search-markets"
+SEARCH_MAX_PAGE_SIZE = 1000
+DEFAULT_MAX_WORKERS = 8
+
+
+def _scan_params(params: dict | None, page_size: int) -> dict:
+    if not 0 < page_size <= SEARCH_MAX_PAGE_SIZE:
+        raise ValueError(f"page_size must be between 1 and {SEARCH_MAX_PAGE_SIZE}")
+    # Offsets and limits are managed by the scan.
+    return {
+        key: value
+        for key, value in (params or {}).items()
+        if key not in ("offset", "limit")
+    }
+
+
+class _Scan:
+    """Offset bookkeeping shared by the thread and asyncio scans."""
+
+    def __init__(self, page_size: int, max_rows: int | None, ordered: bool):
+        self.page_size = page_size
+        self.max_rows = max_rows
+        self.ordered = ordered
+        self.next_offset = 0
+        self.next_emit = 0
+        # Offset of the first short page: nothing past it needs fetching.
+        self.end: int | None = None
+        self.pages: dict[int, list[dict]] = {}
+        self.seen: set[str] = set()
+        self.yielded = 0
+
+    def more(self) -> bool:
+        if self.end is not None:
+            return False
+        return self.max_rows is None or self.next_offset < self.max_rows
+
+    def take_offset(self) -> int:
+        offset = self.next_offset
+        self.next_offset += self.page_size
+        return offset
+
+    def add(self, offset: int, page: list[dict]) -> None:
+        if len(page) < self.page_size and (self.end is None or offset < self.end):
+            self.end = offset
+        self.pages[offset] = page
+
+    def beyond_end(self, offset: int) -> bool:
+        return self.end is not None and offset > self.end
+
+    def done(self) -> bool:
+        return self.max_rows is not None and self.yielded >= self.max_rows
+
+    def emit(self) -> list[dict]:
+        """Return the fresh markets of every page that may be yielded now."""
+        if self.ordered:
+            offsets = []
+            while self.next_emit in self.pages:
+                offsets.append(self.next_emit)
+                self.next_emit += self.page_size
+        else:
+            offsets = sorted(self.pages)
+        rows = []
+        for offset in offsets:
+            for market in self.pages.pop(offset):
+                # Markets can shift across page boundaries while the scan runs.
+                if market["id"] in self.seen:
+                    continue
+                if self.done():
+                    return rows
+                self.seen.add(market["id"])
+                self.yielded += 1
+                rows.append(market)
+        return rows
+
+
+def scan_markets(
+    params: dict | None = None,
+    page_size: int = SEARCH_MAX_PAGE_SIZE,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    max_rows: int | None = None,
+    ordered: bool = True,
+    api_key: str | None = None,
+    client: Client | None = None,
+) -> Iterator[dict]:
+    """
+    Enumerate `/v0/search-markets` results by fetching offset pages concurrently.
+
+    Up to `max_workers` pages are in flight at a time. Once a short page
+    arrives no later offsets are requested and pages not yet started are
+    cancelled. Markets are yielded as their page arrives, once each; a market
+    that moves between pages during the scan is only yielded the first time.
+
+    Args:
+        params: Query parameters accepted by `pymanifold.models.search_markets.SearchMarkets`
+            (e.g. {"topicSlug": "ai", "filter": "open"}); "offset" and "limit" are managed here
+        page_size: Markets requested per page (at most 1,000)
+        max_workers: Number of pages fetched concurrently
+        max_rows: Optional cap on the number of markets yielded
+        ordered: Yield pages in offset (sort) order; otherwise yield each page as soon as it arrives
+        api_key: Optional API key (defaults to `MANIFOLD_API_KEY`)
+        client: Optional pooled client (defaults to the shared client)
+    """
+    params = _scan_params(params, page_size)
+    scan = _Scan(page_size, max_rows, ordered)
+
+    def fetch(offset: int) -> list[dict]:
+        return call_manifold_api(
+            SEARCH_ENDPOINT,
+            params={**params, "offset": offset, "limit": page_size},
+            api_key=api_key,
+            client=client,
+        )
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        running: dict[Future, int] = {}
+        try:
+            while not scan.done():
+                while len(running) < max_workers and scan.more():
+                    offset = scan.take_offset()
+                    running[pool.submit(fetch, offset)] = offset
+                if not running:
+                    return
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    scan.add(running.pop(future), future.result())
+                for future, offset in list(running.items()):
+                    if scan.beyond_end(offset) and future.cancel():
+                        del running[future]
+                        scan.pages[offset] = []
+                yield from scan.emit()
+        finally:
+            for future in running:
+                future.cancel()
+
+
+async def ascan_markets(
+    params: dict | None = None,
+    page_size: int = SEARCH_MAX_PAGE_SIZE,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    max_rows: int | None = None,
+    ordered: bool = True,
+    api_key: str | None = None,
+    client: AsyncClient | None = None,
+) -> AsyncIterator[dict]:
+    """Asyncio counterpart of `scan_markets`."""
+    params = _scan_params(params, page_size)
+    scan = _Scan(page_size, max_rows, ordered)
+    running: dict[asyncio.Task, int] = {}
+
+    async def fetch(offset: int) -> list[dict]:
+        return await aio.call_manifold_api(
+            SEARCH_ENDPOINT,
+            params={**params, "offset": offset, "limit": page_size},
+            api_key=api_key,
+            client=client,
+        )
+
+    try:
+        while not scan.done():
+            while len(running) < max_workers and scan.more():
+                offset = scan.take_offset()
+                running[asyncio.ensure_future(fetch(offset))] = offset
+            if not running:
+                return
+            finished, _ = await asyncio.wait(
+                running, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in finished:
+                scan.add(running.pop(task), task.result())
+            for task, offset in list(running.items()):
+                if scan.beyond_end(offset):
+                    task.cancel()
+                    del running[task]
+                    scan.pages[offset] = []
+            for market in scan.emit():
+                yield market
+    finally:
+        for task in running:
+            task.cancel()
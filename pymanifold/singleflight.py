@@ -0,0 +1,115 @@
+import threading
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    def __init__(self):
+        """
+        Coalesce concurrent identical calls into one.
+
+        While a call for a key is in flight, later callers with the same key
+        wait for it and receive its result or exception instead of starting
+        their own. Nothing is remembered once the call finishes; use a
+        `ResponseCache` for that. Results are shared between callers and must
+        not be mutated; `call_manifold_api` shares the undecoded response, so
+        each of its callers decodes a copy of its own.
+        """
+        self.calls = 0
+        self.shared = 0
+        self._threads: dict[Hashable, _Call] = {}
+        self._tasks: dict[tuple[Any, Hashable], Any] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"SingleFlight(in_flight={self.in_flight}, calls={self.calls}, shared={self.shared})"
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._threads) + len(self._tasks)
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Return `fn()`, or the result of the identical call already running in another thread."""
+        with self._lock:
+            call = self._threads.get(key)
+            leader = call is None
+            if leader:
+                call = self._threads[key] = _Call()
+                self.calls += 1
+            else:
+                self.shared += 1
+        if not leader:
+            call.done.wait()
+        else:
+            try:
+                call.result = fn()
+            except BaseException as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    del self._threads[key]
+                call.done.set()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    async def ado(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Asyncio counterpart of `do`, coalescing tasks on the running event loop.
+
+        The shared call runs in its own task, so cancelling one waiter does not
+        cancel the request for the others.
+        """
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        task_key = (loop, key)
+        with self._lock:
+            task = self._tasks.get(task_key)
+            if task is None:
+                task = self._tasks[task_key] = loop.create_task(fn())
+                task.add_done_callback(lambda task: self._finish(task_key, task))
+                self.calls += 1
+            else:
+                self.shared += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, task_key: tuple[Any, Hashable], task: Any) -> None:
+        with self._lock:
+            if self._tasks.get(task_key) is task:
+                del self._tasks[task_key]
+        if not task.cancelled():
+            # Mark the exception as retrieved in case every waiter was cancelled.
+            task.exception()
+
+    def stats(self) -> dict[str, int]:
+        """Return how many calls ran, how many callers shared one, and how many are running."""
+        return {"calls": self.calls, "shared": self.shared, "in_flight": self.in_flight}
+
+
+_default_single_flight: SingleFlight | None = None
+_default_lock = threading.Lock()
+
+
+def get_default_single_flight() -> SingleFlight:
+    """Return the process-wide request coalescer, creating it if needed."""
+    global _default_single_flight
+    with _default_lock:
+        if _default_single_flight is None:
+            _default_single_flight = SingleFlight()
+        return _default_single_flight
+
+
+def resolve_single_flight(coalesce: SingleFlight | bool | None) -> SingleFlight | None:
+    """Map a `coalesce` argument to a coalescer: True is the shared one, None/False disables coalescing."""
+    if coalesce is True:
+        return get_default_single_flight()
+    return coalesce or None
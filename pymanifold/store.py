@@ -0,0 +1,388 @@
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable
+
+try:
+    import numpy as np
+except ImportError as e:  # no cov
+    raise ImportError(
+        "pymanifold.store requires numpy, install it with `pip install pymanifold[numpy]`"
+    ) from e
+
+from pymanifold import call_manifold_api
+from pymanifold.client import Client
+from pymanifold.pagination import BETS_ENDPOINT, BETS_MAX_PAGE_SIZE, iter_bets
+
+META_FILE = "meta.json"
+FORMAT_VERSION = 2
+SYNC_BATCH_SIZE = 10000
+DEFAULT_MAX_WORKERS = 8
+
+# Column name -> on-disk dtype. Bet ids are unique, so they are stored as
+# fixed-width bytes; the other string columns repeat and are dictionary
+# encoded as int32 codes into a per-column list of labels (-1 means missing).
+NUMERIC_COLUMNS: dict[str, str] = {
+    "createdTime": "<f8",
+    "amount": "<f8",
+    "shares": "<f8",
+    "probBefore": "<f8",
+    "probAfter": "<f8",
+}
+ID_COLUMN = "id"
+ID_DTYPE = "S20"
+STRING_COLUMNS = ["contractId", "userId", "answerId", "outcome"]
+COLUMNS = [*NUMERIC_COLUMNS, ID_COLUMN, *STRING_COLUMNS]
+CODE_DTYPE = "<i4"
+MISSING = -1
+OPEN_LIMIT = "open-limit"
+
+
+def is_open_order(bet: dict) -> bool:
+    """Whether a bet is a limit order that can still fill (and so change) or be cancelled."""
+    return (
+        bet.get("limitProb") is not None
+        and not bet.get("isFilled")
+        and not bet.get("isCancelled")
+    )
+
+
+class BetStore:
+    def __init__(self, path: str | Path, params: dict | None = None):
+        """
+        Local columnar store of bets, memory-mapped for reads.
+
+        Each column is a flat binary file of fixed-width values: bet ids are
+        fixed-width bytes, and the other string columns (market and user ids,
+        outcome) are dictionary encoded, so opening a store only loads their
+        distinct values. `sync()` appends bets newer than
+        the last stored one, then refreshes the stored limit orders that were
+        still open, whose `amount` and `shares` grow as they fill. Every other
+        bet is final once created.
+
+        Args:
+            path: Directory holding the store (created if missing)
+            params: `/v0/bets` query parameters the store mirrors (e.g. {"contractId": "..."});
+                fixed when the store is created
+        """
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        meta_path = self.path / META_FILE
+        if meta_path.exists():
+            with meta_path.open("r", encoding="utf-8") as f:
+                self.meta = json.load(f)
+            if self.meta["version"] != FORMAT_VERSION:
+                raise ValueError(
+                    f"Store at {self.path} has format version {self.meta['version']}, "
+                    f"expected {FORMAT_VERSION}; delete it and sync again"
+                )
+            if params is not None and params != self.meta["params"]:
+                raise ValueError(
+                    f"Store at {self.path} mirrors {self.meta['params']}, not {params}"
+                )
+        else:
+            self.meta = {
+                "version": FORMAT_VERSION,
+                "rows": 0,
+                "params": params or {},
+                "label_counts": {name: 0 for name in STRING_COLUMNS},
+                "label_bytes": {name: 0 for name in STRING_COLUMNS},
+                "open_orders": {},
+            }
+        # Limit orders still open when last seen, by bet id -> row.
+        self.meta.setdefault("open_orders", {})
+        self._labels = {name: self._read_labels(name) for name in STRING_COLUMNS}
+        self._codes = {
+            name: {label: code for code, label in enumerate(labels)}
+            for name, labels in self._labels.items()
+        }
+
+    def __repr__(self) -> str:
+        return f"BetStore(path={self.path}, rows={len(self)})"
+
+    def __len__(self) -> int:
+        return self.meta["rows"]
+
+    @property
+    def params(self) -> dict:
+        return self.meta["params"]
+
+    @property
+    def open_orders(self) -> dict[str, int]:
+        """Rows of stored limit orders that were still open when last synced, by bet id."""
+        return self.meta["open_orders"]
+
+    @property
+    def last_bet_id(self) -> str | None:
+        """Id of the newest stored bet, used as the `after` cursor for the next sync."""
+        if not len(self):
+            return None
+        return self[ID_COLUMN][-1].decode("ascii")
+
+    @property
+    def last_created_time(self) -> float | None:
+        if not len(self):
+            return None
+        return float(self["createdTime"][-1])
+
+    def _column_path(self, name: str) -> Path:
+        return self.path / f"{name}.bin"
+
+    def _labels_path(self, name: str) -> Path:
+        return self.path / f"{name}.labels"
+
+    def _read_labels(self, name: str) -> list[str]:
+        count = self.meta["label_counts"][name]
+        if not count:
+            return []
+        with self._labels_path(name).open("r", encoding="utf-8") as f:
+            return [json.loads(line) for _, line in zip(range(count), f)]
+
+    def _dtype(self, name: str) -> np.dtype:
+        if name in NUMERIC_COLUMNS:
+            return np.dtype(NUMERIC_COLUMNS[name])
+        if name == ID_COLUMN:
+            return np.dtype(ID_DTYPE)
+        if name in STRING_COLUMNS:
+            return np.dtype(CODE_DTYPE)
+        raise KeyError(name)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """
+        Return a read-only memory-mapped column.
+
+        Bet ids are returned as fixed-width bytes. Other string columns are
+        returned as int32 codes; use `labels(name)` to decode them.
+        """
+        dtype = self._dtype(name)
+        rows = len(self)
+        if rows == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(self._column_path(name), dtype=dtype, mode="r", shape=(rows,))
+
+    def labels(self, name: str) -> np.ndarray:
+        """Return the dictionary of a string column as an object array indexed by code."""
+        return np.array(self._labels[name], dtype=object)
+
+    def decode(self, name: str) -> np.ndarray:
+        """Return a string column decoded to an object array (None where missing)."""
+        if name == ID_COLUMN:
+            return np.char.decode(self[name], "ascii").astype(object)
+        labels = np.append(self.labels(name), None)
+        return labels[self[name]]
+
+    def columns(self) -> dict[str, np.ndarray]:
+        """Return every column, memory-mapped."""
+        return {name: self[name] for name in COLUMNS}
+
+    def _encode(self, name: str, value: str | None) -> int:
+        if value is None:
+            return MISSING
+        codes = self._codes[name]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(codes)
+            self._labels[name].append(value)
+        return code
+
+    def append(self, bets: Iterable[dict]) -> int:
+        """
+        Append bets (as returned by `/v0/bets`) and return how many were written.
+
+        Rows are written column by column and committed by rewriting the small
+        metadata file, so a crash mid-append leaves the store at its previous
+        row count.
+        """
+        bets = list(bets)
+        if not bets:
+            return 0
+        width = np.dtype(ID_DTYPE).itemsize
+        for bet in bets:
+            if len(bet[ID_COLUMN]) > width or not bet[ID_COLUMN].isascii():
+                raise ValueError(f"Bet id {bet[ID_COLUMN]!r} does not fit {ID_DTYPE}")
+        with self._lock:
+            rows = len(self)
+            for name in COLUMNS:
+                dtype = self._dtype(name)
+                if name in NUMERIC_COLUMNS:
+                    values = np.array(
+                        [bet.get(name, np.nan) for bet in bets], dtype=np.float64
+                    )
+                elif name == ID_COLUMN:
+                    values = np.array([bet[name] for bet in bets], dtype=dtype)
+                else:
+                    values = np.array(
+                        [self._encode(name, bet.get(name)) for bet in bets],
+                        dtype=np.int32,
+                    )
+                with self._column_path(name).open("ab") as f:
+                    # Drop bytes left behind by an append that never committed.
+                    f.truncate(rows * dtype.itemsize)
+                    f.write(values.astype(dtype).tobytes())
+            for name in STRING_COLUMNS:
+                self._append_labels(name)
+            for row, bet in enumerate(bets, rows):
+                if is_open_order(bet):
+                    self.open_orders[bet["id"]] = row
+            self.meta["rows"] = rows + len(bets)
+            self._write_meta()
+        return len(bets)
+
+    def update(self, bets: Iterable[dict]) -> int:
+        """
+        Overwrite the numeric columns of stored open limit orders with their current state.
+
+        Bets that are not tracked open orders are ignored; orders that have
+        filled or been cancelled stop being tracked. Returns how many rows
+        were rewritten.
+        """
+        with self._lock:
+            open_orders = self.open_orders
+            changed = [
+                (open_orders[bet["id"]], bet)
+                for bet in bets
+                if bet["id"] in open_orders
+            ]
+            if not changed:
+                return 0
+            rows = np.array([row for row, _ in changed], dtype=np.int64)
+            for name, dtype in NUMERIC_COLUMNS.items():
+                column = np.memmap(
+                    self._column_path(name), dtype=dtype, mode="r+", shape=(len(self),)
+                )
+                column[rows] = [bet.get(name, np.nan) for _, bet in changed]
+                column.flush()
+                del column
+            for _, bet in changed:
+                if not is_open_order(bet):
+                    del open_orders[bet["id"]]
+            self._write_meta()
+        return len(changed)
+
+    def _append_labels(self, name: str) -> None:
+        committed = self.meta["label_counts"][name]
+        labels = self._labels[name]
+        if len(labels) == committed:
+            return
+        data = "".join(json.dumps(label) + "\n" for label in labels[committed:])
+        data = data.encode("utf-8")
+        with self._labels_path(name).open("ab") as f:
+            # Drop labels left behind by an append that never committed.
+            f.truncate(self.meta["label_bytes"][name])
+            f.write(data)
+        self.meta["label_counts"][name] = len(labels)
+        self.meta["label_bytes"][name] += len(data)
+
+    def _write_meta(self) -> None:
+        tmp_path = self.path / f"{META_FILE}.tmp"
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(self.meta, f)
+        os.replace(tmp_path, self.path / META_FILE)
+
+    def sync(
+        self,
+        max_rows: int | None = None,
+        page_size: int = BETS_MAX_PAGE_SIZE,
+        batch_size: int = SYNC_BATCH_SIZE,
+        refresh: bool = True,
+        api_key: str | None = None,
+        client: Client | None = None,
+    ) -> int:
+        """
+        Fetch bets newer than the last stored one and append them.
+
+        Bets are requested oldest first with the `after` cursor set to the
+        newest stored bet, and written in batches so memory stays bounded.
+        Stored limit orders that were still open are then refreshed (see
+        `refresh_orders`).
+
+        Args:
+            max_rows: Optional cap on the number of bets fetched in this sync
+            page_size: Bets requested per page (at most 50,000)
+            batch_size: Bets buffered before each append
+            refresh: Refresh stored open limit orders after appending
+            api_key: Optional API key (defaults to `MANIFOLD_API_KEY`)
+            client: Optional pooled client (defaults to the shared client)
+
+        Returns:
+            Number of bets appended
+        """
+        params = {**self.params, "order": "asc"}
+        if self.last_bet_id is not None:
+            params["after"] = self.last_bet_id
+        written = 0
+        batch = []
+        for bet in iter_bets(
+            params,
+            page_size=page_size,
+            max_rows=max_rows,
+            stream=True,
+            api_key=api_key,
+            client=client,
+        ):
+            batch.append(bet)
+            if len(batch) >= batch_size:
+                written += self.append(batch)
+                batch = []
+        written += self.append(batch)
+        if refresh:
+            self.refresh_orders(page_size=page_size, api_key=api_key, client=client)
+        return written
+
+    def refresh_orders(
+        self,
+        page_size: int = BETS_MAX_PAGE_SIZE,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        api_key: str | None = None,
+        client: Client | None = None,
+    ) -> int:
+        """
+        Re-fetch stored limit orders that were still open and rewrite their rows.
+
+        Orders that are still open come from one `kinds=open-limit` listing;
+        each order that has since filled or been cancelled is fetched by id,
+        concurrently over the pooled client, and is not tracked afterwards.
+
+        Args:
+            page_size: Bets requested per page of the open-order listing
+            max_workers: Number of closed orders fetched concurrently
+            api_key: Optional API key (defaults to `MANIFOLD_API_KEY`)
+            client: Optional pooled client (defaults to the shared client)
+
+        Returns:
+            Number of rows rewritten
+        """
+        if not self.open_orders:
+            return 0
+        params = {
+            key: value
+            for key, value in self.params.items()
+            if key not in ("order", "before", "after")
+        }
+        still_open = [
+            bet
+            for bet in iter_bets(
+                {**params, "kinds": OPEN_LIMIT},
+                page_size=page_size,
+                api_key=api_key,
+                client=client,
+            )
+            if bet["id"] in self.open_orders
+        ]
+        listed = {bet["id"] for bet in still_open}
+        gone = [key for key in self.open_orders if key not in listed]
+
+        def fetch(bet_id: str) -> list[dict]:
+            return call_manifold_api(
+                BETS_ENDPOINT, params={"id": bet_id}, api_key=api_key, client=client
+            )
+
+        closed = []
+        if gone:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(gone))) as pool:
+                for bets in pool.map(fetch, gone):
+                    closed.extend(bets)
+        return self.update([*still_open, *closed])
@@ -0,0 +1,196 @@
+import codecs
+import json
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, Iterator
+
+import httpx
+
+from pymanifold import get_api_key
+from pymanifold.client import (
+    AsyncClient,
+    Client,
+    get_default_async_client,
+    get_default_client,
+)
+from pymanifold.codec import JSONCodec, get_default_codec
+
+WHITESPACE = " \t\n\r"
+DELIMITERS = ",]" + WHITESPACE
+
+
+class JSONArrayDecoder:
+    def __init__(self, codec: JSONCodec | None = None):
+        """
+        Incrementally decode a JSON array, returning elements as soon as they are complete.
+
+        Only the undecoded tail of the input is buffered, so memory tracks a
+        single element rather than the whole document. A top-level value that
+        is not an array is returned as a single element once the input ends,
+        decoded with `codec` (defaults to the process-wide codec).
+
+        Array elements are always decoded by the standard library: finding
+        where an element ends in a partial buffer needs `raw_decode`, which
+        codecs don't offer, and decoding each element a second time with the
+        codec would cost more than it saves.
+        """
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+        self._codec = codec if codec is not None else get_default_codec()
+        self._buffer = ""
+        self._state = "start"
+
+    def feed(self, data: bytes) -> list[Any]:
+        """Add a chunk of the response body and return the elements it completed."""
+        self._buffer += self._text.decode(data)
+        return self._drain(final=False)
+
+    def close(self) -> list[Any]:
+        """Signal the end of the input and return any remaining elements."""
+        self._buffer += self._text.decode(b"", final=True)
+        items = self._drain(final=True)
+        if self._state != "done":
+            raise json.JSONDecodeError("Unexpected end of JSON input", self._buffer, 0)
+        if self._buffer.strip(WHITESPACE):
+            raise json.JSONDecodeError("Extra data", self._buffer, 0)
+        return items
+
+    def _drain(self, final: bool) -> list[Any]:
+        items = []
+        buffer = self._buffer
+        pos = 0
+        while self._state != "done":
+            while pos < len(buffer) and buffer[pos] in WHITESPACE:
+                pos += 1
+            if pos == len(buffer):
+                break
+            if self._state == "start":
+                if buffer[pos] != "[":
+                    # Not an array: decode the whole document once it has all arrived.
+                    if not final:
+                        break
+                    items.append(self._codec.loads(buffer[pos:]))
+                    pos = len(buffer)
+                    self._state = "done"
+                    break
+                pos += 1
+                self._state = "first"
+            elif buffer[pos] == "]" and self._state in ("first", "comma"):
+                pos += 1
+                self._state = "done"
+            elif self._state == "comma":
+                if buffer[pos] != ",":
+                    raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+                pos += 1
+                self._state = "element"
+            else:
+                try:
+                    item, end = self._decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if final:
+                        raise
+                    break
+                # A number cut off by the chunk boundary ("12" of "12.5") still
+                # decodes, so only accept an element once its delimiter has arrived.
+                if not final and (end == len(buffer) or buffer[end] not in DELIMITERS):
+                    break
+                items.append(item)
+                pos = end
+                self._state = "comma"
+        self._buffer = buffer[pos:]
+        return items
+
+
+def iter_json_array(
+    chunks: Iterable[bytes], codec: JSONCodec | None = None
+) -> Iterator[Any]:
+    """Yield the elements of a JSON array from an iterable of byte chunks."""
+    decoder = JSONArrayDecoder(codec)
+    for chunk in chunks:
+        yield from decoder.feed(chunk)
+    yield from decoder.close()
+
+
+async def aiter_json_array(
+    chunks: AsyncIterable[bytes], codec: JSONCodec | None = None
+) -> AsyncIterator[Any]:
+    """Asyncio counterpart of `iter_json_array`."""
+    decoder = JSONArrayDecoder(codec)
+    async for chunk in chunks:
+        for item in decoder.feed(chunk):
+            yield item
+    for item in decoder.close():
+        yield item
+
+
+def _headers(api_key: str | None) -> dict | None:
+    if api_key is None:
+        api_key = get_api_key()
+    return {"Authorization": f"Key {api_key}"} if api_key else None
+
+
+def stream_manifold_api(
+    endpoint: str,
+    method: str = "GET",
+    params: dict | None = None,
+    json_data: dict | None = None,
+    api_key: str | None = None,
+    client: Client | None = None,
+) -> Iterator[Any]:
+    """Make a request to the Manifold Markets API and decode the response as it arrives.
+
+    Streaming counterpart of `call_manifold_api` for list endpoints such as
+    "/v0/bets": array elements are yielded as soon as they are downloaded.
+    Responses are never cached.
+
+    Args:
+        endpoint: API endpoint path (e.g. "/v0/bets")
+        method: HTTP method to use ("GET", "POST", etc)
+        params: Optional query parameters
+        json_data: Optional JSON data for POST/PUT requests
+        api_key: Optional API key (defaults to `MANIFOLD_API_KEY`)
+        client: Optional pooled client (defaults to the shared client)
+
+    Raises:
+        httpx.HTTPError: If the request fails
+    """
+    if client is None:
+        client = get_default_client()
+    with client.stream(
+        method,
+        endpoint,
+        params=params,
+        json=json_data,
+        headers=_headers(api_key),
+    ) as response:
+        _raise_for_status(response)
+        yield from iter_json_array(response.iter_bytes(), client.codec)
+
+
+async def astream_manifold_api(
+    endpoint: str,
+    method: str = "GET",
+    params: dict | None = None,
+    json_data: dict | None = None,
+    api_key: str | None = None,
+    client: AsyncClient | None = None,
+) -> AsyncIterator[Any]:
+    """Asyncio counterpart of `stream_manifold_api`."""
+    if client is None:
+        client = get_default_async_client()
+    async with client.stream(
+        method,
+        endpoint,
+        params=params,
+        json=json_data,
+        headers=_headers(api_key),
+    ) as response:
+        if response.is_error:
+            await response.aread()
+        response.raise_for_status()
+        async for item in aiter_json_array(response.aiter_bytes(), client.codec):
+            yield item
+
+
+def _raise_for_status(response: httpx.Response) -> None:
+    if response.is_error:
+        response.read()
+    response.raise_for_status()
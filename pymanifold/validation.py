@@ -0,0 +1,58 @@
+from functools import lru_cache
+
+from pydantic import BaseModel, RootModel, TypeAdapter
+
+# Generated models name URL parameters after the schema file, which does not
+# always match the endpoint template (e.g. "/v0/market/[marketId]" has an `id` field).
+URL_PARAM_ALIASES: dict[str, tuple[str, ...]] = {
+    "marketId": ("id", "contractId"),
+    "marketSlug": ("slug",),
+}
+
+
+@lru_cache(maxsize=None)
+def get_validator(model: type[BaseModel]) -> TypeAdapter:
+    """Return a validator for `model`, built once and reused for every request."""
+    return TypeAdapter(model)
+
+
+@lru_cache(maxsize=None)
+def field_names(model: type) -> frozenset[str]:
+    """Return the top-level field names of a generated model, unwrapping root models."""
+    if not isinstance(model, type) or not issubclass(model, BaseModel):
+        return frozenset()
+    if issubclass(model, RootModel):
+        return field_names(model.model_fields["root"].annotation)
+    return frozenset(model.model_fields)
+
+
+def validate_request(
+    model: type[BaseModel],
+    url_params: dict | None = None,
+    payload: dict | None = None,
+) -> None:
+    """
+    Validate a request payload against the endpoint's generated model.
+
+    URL parameters are merged into the payload under the model's field name,
+    since the generated models describe them as ordinary fields.
+
+    Args:
+        model: Generated model for the endpoint
+        url_params: URL parameters substituted into the endpoint template
+        payload: Query parameters (GET) or JSON body (POST)
+
+    Raises:
+        pydantic.ValidationError: If the payload does not match the model
+    """
+    data = dict(payload or {})
+    fields = field_names(model)
+    for name, value in (url_params or {}).items():
+        if name not in fields:
+            name = next(
+                (alias for alias in URL_PARAM_ALIASES.get(name, ()) if alias in fields),
+                None,
+            )
+        if name is not None:
+            data.setdefault(name, value)
+    get_validator(model).validate_python(data)
@@ -1,11 +1,15 @@
+import argparse
+import hashlib
+import importlib.metadata
 import json
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import subprocess
 import shutil
 import logging
 import tempfile
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 import sys
 import os
 
@@ -17,6 +21,17 @@ API_DOC_PATH = Path("docs/docs/api.md")
 GENERATED_SCHEMA_SCRIPT = Path("genJsonSchema.ts")
 REPO_ROOT = Path(__file__).parent.parent
 
+ENDPOINTS_MODULE = Path("pymanifold/endpoints.py")
+# Content hash of each schema as of the last successful generation.
+SCHEMA_HASHES = Path("scripts/.schema_hashes.json")
+# Passed to datamodel-codegen. Part of every schema hash along with the
+# datamodel-codegen version, so changing either regenerates all models.
+CODEGEN_DISTRIBUTION = "datamodel-code-generator"
+CODEGEN_OPTIONS = {
+    "input_file_type": "jsonschema",
+    "output_model_type": "pydantic_v2.BaseModel",
+}
+
 DEPRECATED = "deprecated"
 MANIFOLD_REPO_URL = "https://github.com/iameskild/manifold.git"
 
@@ -67,27 +82,93 @@ def _file_to_endpoint(file_path: Path) -> str:
     return base_endpoint
 
 
-def make_models(temp_dir: Path) -> Dict[str, Dict[str, str]]:
+def _codegen_key() -> bytes:
+    """Return the datamodel-codegen version and options that every schema hash includes."""
+    version = importlib.metadata.version(CODEGEN_DISTRIBUTION)
+    return json.dumps({"version": version, **CODEGEN_OPTIONS}, sort_keys=True).encode()
+
+
+def _schema_hash(schema_file: Path, output: str, codegen_key: bytes) -> str:
+    # The output path is included so that moving a model regenerates it.
+    digest = hashlib.sha256(codegen_key)
+    digest.update(output.encode())
+    digest.update(schema_file.read_bytes())
+    return digest.hexdigest()
+
+
+def _load_hashes() -> Dict[str, str]:
+    path = REPO_ROOT / SCHEMA_HASHES
+    if not path.exists():
+        return {}
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_hashes(hashes: Dict[str, str]) -> None:
+    with open(REPO_ROOT / SCHEMA_HASHES, "w", encoding="utf-8") as f:
+        json.dump(dict(sorted(hashes.items())), f, indent=2)
+        f.write("\n")
+
+
+def generate_model(schema_file: Path, output_file: Path) -> None:
+    """
+    Generate one Pydantic model module from a JSON schema.
+
+    Runs datamodel-codegen in-process, so a worker pays its import cost once
+    rather than once per schema.
+
+    Args:
+        schema_file: JSON schema to generate from
+        output_file: Python module to write
+    """
+    from datamodel_code_generator import DataModelType, InputFileType, generate
+
+    generate(
+        schema_file,
+        input_file_type=InputFileType(CODEGEN_OPTIONS["input_file_type"]),
+        output=output_file,
+        output_model_type=DataModelType(CODEGEN_OPTIONS["output_model_type"]),
+    )
+
+
+def make_models(
+    manifold_dir: Path,
+    schema_dir: Path,
+    jobs: Optional[int] = None,
+    force: bool = False,
+) -> Dict[str, Dict[str, str]]:
     """
     Generate Pydantic models from JSON schemas using datamodel-codegen.
 
+    Schemas are generated across a process pool. A schema whose content hash
+    matches the one recorded after the last run (see `SCHEMA_HASHES`) is
+    skipped if its model still exists.
+
     Args:
-        temp_dir: Path to temporary directory containing schemas
+        manifold_dir: Path to the manifold checkout (for the API docs)
+        schema_dir: Path to the JSON schemas generated from it
+        jobs: Number of worker processes (defaults to the number of CPUs)
+        force: Regenerate every model, ignoring the recorded hashes
     """
-    ENDPOINTS: Dict[str, Dict[str, str]] = _get_endpoints_from_api_doc(temp_dir)
-    schema_dir = temp_dir / SCHEMA_INPUT
+    ENDPOINTS: Dict[str, Dict[str, str]] = _get_endpoints_from_api_doc(manifold_dir)
 
     # Create a reverse mapping of all possible variations to their original endpoints
     variation_map = {}
-    for endpoint, data in ENDPOINTS.items():
+    for endpoint, _ in ENDPOINTS.items():
         variations = _normalize_endpoint(endpoint)
         for variant in variations:
             variation_map[variant] = endpoint
 
-    for schema_file in schema_dir.rglob("*.json"):
+    previous_hashes = {} if force else _load_hashes()
+    codegen_key = _codegen_key()
+    hashes: Dict[str, str] = {}
+    pending: Dict[str, Tuple[Path, Path]] = {}
+
+    schemas: Dict[str, Tuple[Path, str, str]] = {}
+    for schema_file in sorted(schema_dir.rglob("*.json")):
         relative_path = schema_file.relative_to(schema_dir)
         module_path = relative_path.with_suffix("")
-        print(module_path)
+        logger.debug(module_path)
 
         # Get the endpoint from file path and check all its variations
         file_endpoint = _file_to_endpoint(module_path)
@@ -101,8 +182,32 @@ def make_models(temp_dir: Path) -> Dict[str, Dict[str, str]]:
         module_path_str = module_path.as_posix()
         module_path_str = re.sub(r"[^a-zA-Z0-9_/]", "_", module_path_str)
         module_path_str = module_path_str.replace("/_", "/")
-        output_path = REPO_ROOT / PYDANTIC_OUTPUT / (module_path_str + ".py")
-        output_file = str(output_path).replace("_.py", "__.py")
+        if module_path_str.endswith("_"):
+            # Keep e.g. "market/{id}" clear of the package "market/{id}/..." ("id_").
+            module_path_str += "_"
+        schemas[relative_path.as_posix()] = (
+            schema_file,
+            original_endpoint,
+            module_path_str,
+        )
+
+    # A module that is also a package, e.g. "market" for "/v0/market" next to
+    # "market/id__" for "/v0/market/[marketId]", is written as the package's __init__.py.
+    packages = {
+        parent.as_posix()
+        for _, _, module_path_str in schemas.values()
+        for parent in Path(module_path_str).parents
+    }
+
+    for key, (schema_file, original_endpoint, module_path_str) in schemas.items():
+        if module_path_str in packages:
+            output_path = REPO_ROOT / PYDANTIC_OUTPUT / module_path_str / "__init__.py"
+            stale = output_path.parent.with_suffix(".py")
+            if stale.exists():
+                stale.unlink()
+        else:
+            output_path = REPO_ROOT / PYDANTIC_OUTPUT / (module_path_str + ".py")
+        output_file = str(output_path)
 
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -117,44 +222,85 @@ def make_models(temp_dir: Path) -> Dict[str, Dict[str, str]]:
                 init_file.touch()
             current_dir = current_dir.parent
 
-        # Generate the Pydantic model
-        run_command(
-            [
-                "datamodel-codegen",
-                "--input",
-                str(schema_file),
-                "--input-file-type",
-                "jsonschema",
-                "--output",
-                output_file,
-                "--output-model-type",
-                "pydantic_v2.BaseModel",
-            ],
-        )
-
-        model_name = (
-            module_path_str.replace("/", "_").replace("_", " ").title().replace(" ", "")
+        hashes[key] = _schema_hash(
+            schema_file, output_path.relative_to(REPO_ROOT).as_posix(), codegen_key
         )
-        module_path = (
-            output_file.replace(str(REPO_ROOT / PYDANTIC_OUTPUT / ""), "")
-            .replace(".py", "")
-            .replace("/", ".")
+        if previous_hashes.get(key) == hashes[key] and Path(output_file).exists():
+            logger.debug(f"Schema {schema_file} unchanged, keeping {output_file}")
+        else:
+            pending[key] = (schema_file, Path(output_file))
+
+        # Capitalize each word without lowering the rest, so "contractId" stays "ContractId"
+        model_name = "".join(
+            word[0].upper() + word[1:]
+            for word in module_path_str.replace("/", "_").split("_")
+            if word
         )
+        module_path = "." + module_path_str.replace("/", ".")
 
         ENDPOINTS[original_endpoint]["module_path"] = module_path
         ENDPOINTS[original_endpoint]["model_name"] = model_name
 
-        logger.info(f"Generated Pydantic model for {schema_file} at {output_file}")
+    logger.info(
+        f"Generating {len(pending)} of {len(hashes)} models "
+        f"({len(hashes) - len(pending)} unchanged)"
+    )
+    failed = []
+    if pending:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = {
+                key: pool.submit(generate_model, schema_file, output_file)
+                for key, (schema_file, output_file) in pending.items()
+            }
+            for key, future in futures.items():
+                schema_file, output_file = pending[key]
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.error(f"Failed to generate a model for {schema_file}: {e}")
+                    failed.append(key)
+                    continue
+                logger.info(
+                    f"Generated Pydantic model for {schema_file} at {output_file}"
+                )
 
-    with open(REPO_ROOT / "pymanifold/endpoints.json", "w+", encoding="utf-8") as f:
-        json.dump(ENDPOINTS, f)
+    # Failed schemas are retried next run; schemas that disappeared are forgotten.
+    for key in failed:
+        hashes.pop(key)
+    _save_hashes(hashes)
+    write_endpoints_module(ENDPOINTS)
+    if failed:
+        raise RuntimeError(f"Could not generate models for {failed}")
 
     return ENDPOINTS
 
 
-def clone_manifold(temp_dir: Path) -> None:
+def write_endpoints_module(endpoints: Dict[str, Dict[str, str]]) -> None:
+    """
+    Write the endpoint table as a Python module so importing it needs no parsing.
+
+    Args:
+        endpoints: Mapping of endpoint template to method, module path and model name
+    """
+    lines = [
+        "# generated by scripts/make_models.py, do not edit",
+        "",
+        "ENDPOINTS: dict[str, dict[str, str]] = {",
+    ]
+    for endpoint, data in endpoints.items():
+        lines.append(f"    {json.dumps(endpoint)}: {{")
+        for key, value in data.items():
+            lines.append(f"        {json.dumps(key)}: {json.dumps(value)},")
+        lines.append("    },")
+    lines.append("}")
+
+    with open(REPO_ROOT / ENDPOINTS_MODULE, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def clone_manifold(temp_dir: Path) -> Path:
     """
-    Perform a sparse clone of the Manifold repository.
+    Perform a sparse clone of the Manifold repository and return its path.
 
     Args:
         temp_dir: Path to temporary directory for cloning
@@ -188,44 +334,84 @@ def clone_manifold(temp_dir: Path) -> None:
     logger.info("Fetching required files...")
     run_command(["git", "pull", "origin", "main"], cwd=manifold_dir, debug=DEBUG)
     logger.info("Successfully cloned manifold repository")
+    return manifold_dir
 
 
-def create_json_schema(temp_dir: Path) -> None:
+def _copy_workspace(manifold_dir: Path, build_dir: Path) -> bool:
     """
-    Generate JSON schema from TypeScript definitions.
+    Recreate the checkout's workspace root in `build_dir`, reusing its installed packages.
 
-    Args:
-        temp_dir: Path to temporary directory containing manifold clone
+    The root's files and the `common` package are copied; `node_modules`
+    directories are symlinked rather than copied or reinstalled. Returns
+    whether the checkout had any packages installed.
+    """
+    build_dir.mkdir(parents=True, exist_ok=True)
+    for path in manifold_dir.iterdir():
+        if path.is_file():
+            shutil.copy2(path, build_dir)
+    shutil.copytree(
+        manifold_dir / "common",
+        build_dir / "common",
+        ignore=shutil.ignore_patterns("node_modules"),
+    )
+    installed = False
+    for package in (Path("."), Path("common")):
+        node_modules = manifold_dir / package / "node_modules"
+        if node_modules.is_dir():
+            (build_dir / package / "node_modules").symlink_to(node_modules.resolve())
+            installed = True
+    return installed
+
+
+def create_json_schema(manifold_dir: Path, work_dir: Path) -> Path:
     """
-    common_dir = temp_dir / "manifold/common"
-    script_source = REPO_ROOT / "scripts" / GENERATED_SCHEMA_SCRIPT
-    script_dest = common_dir / GENERATED_SCHEMA_SCRIPT
+    Generate JSON schema from TypeScript definitions and return the schema directory.
 
-    shutil.copy(script_source, script_dest)
+    A local checkout's workspace root is recreated in `work_dir` first, so the
+    generator script and the schemas stay out of it. Its installed packages
+    are reused, so only a fresh clone or a checkout without an install needs
+    the network to run `yarn install`.
 
-    logger.info("Installing required packages...")
-    run_command(["yarn", "install"], cwd=common_dir, debug=DEBUG)
-    run_command(["yarn", "add", "typescript"], cwd=common_dir, debug=DEBUG)
-    run_command(["yarn", "add", "ts-node"], cwd=common_dir, debug=DEBUG)
+    Args:
+        manifold_dir: Path to the manifold checkout
+        work_dir: Scratch directory to generate the schemas in
+    """
+    build_dir = work_dir / "manifold"
+    common_dir = build_dir / "common"
+    installed = False
+    if manifold_dir.resolve() != build_dir.resolve():
+        installed = _copy_workspace(manifold_dir, build_dir)
+    shutil.copy(REPO_ROOT / "scripts" / GENERATED_SCHEMA_SCRIPT, common_dir)
+
+    if not installed:
+        logger.info("Installing required packages...")
+        run_command(["yarn", "install"], cwd=common_dir, debug=DEBUG)
+        run_command(
+            ["yarn", "add", "--dev", "typescript", "ts-node"],
+            cwd=common_dir,
+            debug=DEBUG,
+        )
 
     logger.info("Generating JSON schema...")
     run_command(
         ["npx", "ts-node", GENERATED_SCHEMA_SCRIPT], cwd=common_dir, debug=DEBUG
     )
     logger.info("Successfully generated JSON schema")
+    # genJsonSchema.ts writes next to the checkout, two levels up from `common`.
+    return work_dir / SCHEMA_INPUT
 
 
-def _get_endpoints_from_api_doc(temp_dir: Path) -> Dict[str, Dict[str, str]]:
+def _get_endpoints_from_api_doc(manifold_dir: Path) -> Dict[str, Dict[str, str]]:
     """
     Parse the Manifold API documentation to extract endpoint information.
 
     Args:
-        temp_dir: Path to temporary directory containing manifold clone
+        manifold_dir: Path to the manifold checkout
     """
     logger.info("Getting endpoints from API docs...")
     endpoints: Dict[str, Dict[str, str]] = {}
 
-    api_doc_path = temp_dir / "manifold" / API_DOC_PATH
+    api_doc_path = manifold_dir / API_DOC_PATH
     if not api_doc_path.exists():
         raise FileNotFoundError(f"API docs not found at {api_doc_path}")
 
@@ -314,12 +500,43 @@ def run_command(
         raise e
 
 
-if __name__ == "__main__":
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Regenerate pymanifold's models and endpoint table from the Manifold repo."
+    )
+    parser.add_argument(
+        "--manifold",
+        type=Path,
+        help="Use this local manifold checkout instead of cloning one",
+    )
+    parser.add_argument(
+        "--schemas",
+        type=Path,
+        help="Use these already generated JSON schemas instead of running genJsonSchema.ts "
+        "(with --manifold, works fully offline)",
+    )
+    parser.add_argument(
+        "--jobs", type=int, help="Worker processes (defaults to the number of CPUs)"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Regenerate models whose schema is unchanged",
+    )
+    args = parser.parse_args()
+
     with tempfile.TemporaryDirectory() as temp_dir:
-        temp_path = Path(temp_dir)
-        logger.info("### Cloning Manifold repository ###")
-        clone_manifold(temp_path)
-        logger.info("### Generating JSON schema ###")
-        create_json_schema(temp_path)
+        manifold_dir = args.manifold
+        if manifold_dir is None:
+            logger.info("### Cloning Manifold repository ###")
+            manifold_dir = clone_manifold(Path(temp_dir))
+        schema_dir = args.schemas
+        if schema_dir is None:
+            logger.info("### Generating JSON schema ###")
+            schema_dir = create_json_schema(manifold_dir, Path(temp_dir))
         logger.info("### Generating Pydantic models ###")
-        make_models(temp_path)
+        make_models(manifold_dir, schema_dir, jobs=args.jobs, force=args.force)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# The fake API server lives with the benchmarks, which are plain scripts.
+sys.path.insert(0, str(Path(__file__).parent.parent / "benchmarks"))
+
+from fake_server import Fixtures, serve  # noqa: E402
+
+from pymanifold.client import AsyncClient, Client  # noqa: E402
+
+
+def start_server(**fixture_kwargs):
+    """Serve small generated fixtures on a background thread."""
+    kwargs = {"users": 50, "markets": 200, "bets": 5000, "comments": 200, "txns": 500}
+    return serve(Fixtures(**{**kwargs, **fixture_kwargs}))
+
+
+def stop_server(server) -> None:
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(scope="session")
+def fake_server():
+    server = start_server()
+    yield server
+    stop_server(server)
+
+
+@pytest.fixture
+def client(fake_server):
+    with Client(base_url=fake_server.url, rate_limiter=False, retry=False) as client:
+        yield client
+
+
+@pytest.fixture
+def async_client(fake_server):
+    client = AsyncClient(base_url=fake_server.url, rate_limiter=False, retry=False)
+    yield client
+    asyncio.run(client.aclose())
@@ -0,0 +1,117 @@
+import numpy as np
+import pytest
+
+from pymanifold.analytics import (
+    MISSING,
+    compute_positions,
+    latest_prob,
+    positions_from_store,
+    top_holders,
+)
+from pymanifold.store import BetStore
+
+YES, NO = 0, 1
+EMPTY = np.array([], dtype=np.int64)
+
+
+def test_latest_prob_empty():
+    assert len(latest_prob(EMPTY, EMPTY, np.array([]), np.array([]))) == 0
+
+
+def test_latest_prob_repeated_contracts_out_of_order():
+    contract = np.array([0, 1, 0, 1, 0, 2])
+    answer = np.array([MISSING, MISSING, MISSING, 5, MISSING, MISSING])
+    created = np.array([30, 10, 10, 5, 20, 1])
+    prob_after = np.array([0.3, 0.7, 0.1, 0.9, 0.2, 0.5])
+    prob = latest_prob(contract, answer, created, prob_after)
+    # Contract 0's newest bet is at t=30; contract 1 has two answers.
+    np.testing.assert_allclose(prob, [0.3, 0.7, 0.3, 0.9, 0.3, 0.5])
+
+
+def test_compute_positions_empty():
+    positions = compute_positions(
+        EMPTY, EMPTY, EMPTY, np.array([]), np.array([]), yes=YES, prob=np.array([])
+    )
+    assert len(positions) == 0
+    assert len(top_holders(positions, contract=0)) == 0
+
+
+def test_compute_positions_buys_and_sales():
+    user = np.array([0, 0, 1, 0])
+    contract = np.array([7, 7, 7, 8])
+    outcome = np.array([YES, YES, NO, YES])
+    # User 0 buys 20 YES shares for 10 and sells 5 of them for 4.
+    amount = np.array([10.0, -4.0, 6.0, 3.0])
+    shares = np.array([20.0, -5.0, 10.0, 6.0])
+    prob = np.array([0.6, 0.6, 0.6, 0.5])
+    positions = compute_positions(
+        user, contract, outcome, amount, shares, YES, prob=prob
+    )
+
+    assert len(positions) == 3
+    row = int(np.flatnonzero((positions.user == 0) & (positions.contract == 7))[0])
+    assert positions.shares[row] == pytest.approx(15.0)
+    assert positions.cost_basis[row] == pytest.approx(7.5)
+    assert positions.realized[row] == pytest.approx(1.5)
+    assert positions.value[row] == pytest.approx(9.0)
+    assert positions.profit[row] == pytest.approx(3.0)
+
+    row = int(np.flatnonzero(positions.user == 1)[0])
+    # NO shares are priced at 1 - P(YES).
+    assert positions.price[row] == pytest.approx(0.4)
+
+    unpriced = compute_positions(user, contract, outcome, amount, shares, YES)
+    assert np.isnan(unpriced.value).all()
+
+
+def test_top_holders_ranks_within_a_contract():
+    user = np.arange(5)
+    contract = np.array([1, 1, 1, 1, 2])
+    outcome = np.full(5, YES)
+    shares = np.array([5.0, 50.0, 20.0, 1.0, 100.0])
+    positions = compute_positions(user, contract, outcome, shares / 2, shares, YES)
+    top = top_holders(positions, contract=1, n=2)
+    assert top.user.tolist() == [1, 2]
+    assert top_holders(positions, contract=1, n=10).user.tolist() == [1, 2, 0, 3]
+
+
+def bet(index: int, user: str, contract: str, outcome: str, prob: float) -> dict:
+    return {
+        "id": f"b{index}",
+        "userId": user,
+        "contractId": contract,
+        "outcome": outcome,
+        "createdTime": 1000 + index,
+        "amount": 10.0,
+        "shares": 20.0,
+        "probBefore": 0.5,
+        "probAfter": prob,
+    }
+
+
+def test_positions_from_empty_store(tmp_path):
+    assert len(positions_from_store(BetStore(tmp_path))) == 0
+
+
+def test_positions_from_store(tmp_path):
+    store = BetStore(tmp_path)
+    store.append(
+        [
+            bet(0, "alice", "m1", "YES", 0.55),
+            bet(1, "bob", "m1", "NO", 0.45),
+            bet(2, "alice", "m1", "YES", 0.6),
+            bet(3, "alice", "m2", "YES", 0.8),
+        ]
+    )
+    positions = positions_from_store(store)
+    users = store.labels("userId")[positions.user]
+    contracts = store.labels("contractId")[positions.contract]
+    by_key = {
+        (u, c): (shares, price)
+        for u, c, shares, price in zip(
+            users, contracts, positions.shares, positions.price
+        )
+    }
+    assert by_key[("alice", "m1")] == pytest.approx((40.0, 0.6))
+    assert by_key[("bob", "m1")] == pytest.approx((20.0, 0.4))
+    assert by_key[("alice", "m2")] == pytest.approx((20.0, 0.8))
@@ -0,0 +1,111 @@
+import time
+
+import pytest
+
+from fake_server import START_TIME
+
+from pymanifold.backfill import backfill, backfill_managrams, backfill_txns
+from pymanifold.client import Client
+from pymanifold.hooks import REQUEST, Hooks
+
+from .conftest import start_server, stop_server
+
+
+@pytest.fixture(scope="module")
+def dense_server():
+    # Four txns per millisecond, so pages and windows end mid-timestamp.
+    server = start_server(txns=500, txn_spacing=0.25)
+    yield server
+    stop_server(server)
+
+
+@pytest.fixture(scope="module")
+def burst_server():
+    # A hundred txns per millisecond, more than one page at each instant.
+    server = start_server(txns=500, txn_spacing=0.01)
+    yield server
+    stop_server(server)
+
+
+def txns_in(server, start: float, end: float, **filters) -> list[dict]:
+    return [
+        txn
+        for txn in server.fixtures.txns
+        if start <= txn["createdTime"] < end
+        and all(txn[field] == value for field, value in filters.items())
+    ]
+
+
+def check_rows(rows: list[dict], expected: list[dict], order: str) -> None:
+    ids = [row["id"] for row in rows]
+    assert len(ids) == len(set(ids)), "rows were duplicated"
+    assert set(ids) == {row["id"] for row in expected}
+    times = [row["createdTime"] for row in rows]
+    assert times == sorted(times, reverse=order == "desc")
+
+
+@pytest.mark.parametrize("order", ["desc", "asc"])
+@pytest.mark.parametrize("window", [13, 1000])
+def test_windows_and_pages_ending_mid_timestamp(dense_server, order, window):
+    start, end = START_TIME + 7, START_TIME + 101
+    with Client(base_url=dense_server.url, rate_limiter=False) as client:
+        rows = list(
+            backfill_txns(
+                start,
+                end,
+                window=window,
+                order=order,
+                page_size=7,
+                max_workers=4,
+                client=client,
+            )
+        )
+    check_rows(rows, txns_in(dense_server, start, end), order)
+
+
+def test_params_are_sent_with_every_page(dense_server):
+    start, end = START_TIME, START_TIME + 125
+    to_id = dense_server.fixtures.txns[0]["toId"]
+    with Client(base_url=dense_server.url, rate_limiter=False) as client:
+        rows = list(
+            backfill_txns(
+                start, end, {"toId": to_id}, window=20, page_size=2, client=client
+            )
+        )
+    check_rows(rows, txns_in(dense_server, start, end, toId=to_id), "desc")
+
+
+def test_rows_sharing_a_timestamp_beyond_a_page_are_paged_by_offset(burst_server):
+    start, end = START_TIME, START_TIME + 5
+    with Client(base_url=burst_server.url, rate_limiter=False) as client:
+        rows = list(backfill_txns(start, end, window=2, page_size=30, client=client))
+    check_rows(rows, txns_in(burst_server, start, end), "desc")
+
+
+def test_dense_timestamps_without_offset_raise(burst_server):
+    start, end = START_TIME, START_TIME + 5
+    with Client(base_url=burst_server.url, rate_limiter=False) as client:
+        with pytest.raises(RuntimeError, match="offset"):
+            list(backfill_managrams(start, end, window=5, page_size=30, client=client))
+
+
+def test_closing_early_cancels_pending_windows(dense_server):
+    requests = []
+    hooks = Hooks()
+    hooks.add(requests.append, kinds=[REQUEST])
+    with Client(base_url=dense_server.url, rate_limiter=False, hooks=hooks) as client:
+        rows = backfill(
+            "/v0/txns",
+            START_TIME,
+            START_TIME + 125,
+            window=1,
+            max_workers=2,
+            client=client,
+        )
+        next(rows)
+        rows.close()
+        sent = len(requests)
+        time.sleep(0.2)
+    # At most the buffered windows (2 * max_workers) plus the one being read.
+    assert len(requests) == sent
+    assert sent <= 5
@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+
+from pymanifold.batch import DependencyError, place_bets, place_bets_async
+from pymanifold.client import AsyncClient, Client
+from pymanifold.hooks import REQUEST, Hooks
+
+MARKET = "m00000001"
+
+
+def bet(contract_id: str = MARKET, **fields) -> dict:
+    return {"contractId": contract_id, "amount": 10, "outcome": "YES", **fields}
+
+
+@pytest.fixture
+def sent(fake_server):
+    """Yield a client and the request events it emits."""
+    events = []
+    hooks = Hooks()
+    hooks.add(events.append, kinds=[REQUEST])
+    with Client(
+        base_url=fake_server.url, rate_limiter=False, retry=False, hooks=hooks
+    ) as client:
+        yield client, events
+
+
+def test_dependencies_are_sent_first_and_dropped(sent):
+    client, _ = sent
+    bets = {
+        "c": bet(deps=["b", "a"]),
+        "b": bet(deps=["a"]),
+        "a": bet(),
+    }
+    report = place_bets(bets, trusted=True, client=client)
+
+    assert [result.key for result in report] == ["c", "b", "a"]
+    assert len(report.succeeded) == 3
+    assert [result.request.get("deps") for result in report] == [None] * 3
+    # The fake server numbers bets in the order they arrive.
+    bet_ids = {result.key: result.response["betId"] for result in report}
+    assert bet_ids["a"] < bet_ids["b"] < bet_ids["c"]
+
+
+def test_list_deps_are_passed_through(sent):
+    client, _ = sent
+    # "0" is a real bet id here, not the index of the first bet.
+    report = place_bets([bet(), bet(deps=["0", "ext"])], trusted=True, client=client)
+    assert len(report.succeeded) == 2
+    assert report.results[1].request["deps"] == ["0", "ext"]
+    assert report.results[1].response["deps"] == ["0", "ext"]
+
+
+def test_mixed_deps_keep_external_entries(sent):
+    client, _ = sent
+    report = place_bets(
+        {"a": bet(), "b": bet(deps=["a", "ext"])}, trusted=True, client=client
+    )
+    assert report.results[1].request["deps"] == ["ext"]
+
+
+def test_cycle_is_rejected_before_sending(sent):
+    client, events = sent
+    bets = {"a": bet(deps=["c"]), "b": bet(deps=["a"]), "c": bet(deps=["b"])}
+    with pytest.raises(ValueError, match="circular"):
+        place_bets(bets, trusted=True, client=client)
+    with pytest.raises(ValueError, match="circular"):
+        asyncio.run(place_bets_async({"a": bet(deps=["a"])}, trusted=True))
+    assert events == []
+
+
+def test_failure_propagates_to_dependents(sent):
+    client, events = sent
+    bets = {
+        "bad": bet("missing"),
+        "child": bet(deps=["bad"]),
+        "grandchild": bet(deps=["child"]),
+        "other": bet(),
+    }
+    report = place_bets(bets, trusted=True, client=client)
+
+    assert [result.key for result in report.succeeded] == ["other"]
+    errors = {result.key: result.error for result in report}
+    assert errors["bad"].response.status_code == 404
+    assert isinstance(errors["child"], DependencyError)
+    assert isinstance(errors["grandchild"], DependencyError)
+    # Only the failed bet and the independent one reached the server.
+    assert len(events) == 2
+    with pytest.raises(type(errors["bad"])):
+        report.raise_for_errors()
+
+
+def test_async_matches_sync(fake_server):
+    bets = {
+        "bad": bet("missing"),
+        "child": bet(deps=["bad"]),
+        "a": bet(),
+        "b": bet(deps=["a", "ext"]),
+    }
+
+    async def main():
+        async with AsyncClient(
+            base_url=fake_server.url, rate_limiter=False, retry=False
+        ) as client:
+            return await place_bets_async(
+                bets, max_concurrency=2, trusted=True, client=client
+            )
+
+    report = asyncio.run(main())
+    assert [result.key for result in report] == list(bets)
+    assert [result.ok for result in report] == [False, False, True, True]
+    assert isinstance(report.results[1].error, DependencyError)
+    assert report.results[3].request["deps"] == ["ext"]
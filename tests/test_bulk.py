@@ -0,0 +1,94 @@
+import pytest
+
+from pymanifold.bulk import iter_bets_bulk, plan_chunks
+
+CONTRACTS = [f"m{index:08d}" for index in range(0, 40, 4)]
+
+
+def bets_of(server, contract_ids) -> list[dict]:
+    wanted = set(contract_ids)
+    return [bet for bet in server.fixtures.bets if bet["contractId"] in wanted]
+
+
+def fetch(client, merge: str, **kwargs) -> list[dict]:
+    return list(
+        iter_bets_bulk(
+            CONTRACTS,
+            merge=merge,
+            page_size=20,
+            max_workers=3,
+            max_contracts=3,
+            client=client,
+            **kwargs,
+        )
+    )
+
+
+def test_plan_chunks():
+    ids = ["a", "b", "a", "c", "d", "e"]
+    assert plan_chunks(ids, max_contracts=2) == [["a", "b"], ["c", "d"], ["e"]]
+    assert plan_chunks([]) == []
+    # Each id costs "contractId=" plus its encoded form plus a separator.
+    cost = len("contractId=") + len("a%2Fb") + 1
+    assert plan_chunks(["a/b", "c/d"], max_query_bytes=cost) == [
+        ["a/b"],
+        ["c/d"],
+    ]
+    assert plan_chunks(["a/b", "c/d"], max_query_bytes=2 * cost) == [["a/b", "c/d"]]
+    # An id over budget on its own still gets a query.
+    assert plan_chunks(["x" * 100], max_query_bytes=10) == [["x" * 100]]
+
+
+def test_time_merge_is_newest_first(fake_server, client):
+    bets = fetch(client, "time")
+    expected = bets_of(fake_server, CONTRACTS)
+    assert sorted(bet["id"] for bet in bets) == sorted(bet["id"] for bet in expected)
+    times = [bet["createdTime"] for bet in bets]
+    assert times == sorted(times, reverse=True)
+
+
+def test_time_merge_ascending(fake_server, client):
+    bets = fetch(client, "time", params={"order": "asc"})
+    assert len(bets) == len(bets_of(fake_server, CONTRACTS))
+    times = [bet["createdTime"] for bet in bets]
+    assert times == sorted(times)
+
+
+def test_contract_merge_groups_bets_by_market(fake_server, client):
+    bets = fetch(client, "contract")
+    contracts = [bet["contractId"] for bet in bets]
+    # Every market's bets are contiguous, and markets keep their input order
+    # within a query; queries are yielded as they complete.
+    order = list(dict.fromkeys(contracts))
+    for chunk in plan_chunks(CONTRACTS, max_contracts=3):
+        assert [c for c in order if c in chunk] == [c for c in chunk if c in order]
+    assert sum(1 for a, b in zip(contracts, contracts[1:]) if a != b) == len(order) - 1
+    for contract_id in order:
+        expected = [bet["id"] for bet in bets_of(fake_server, [contract_id])][::-1]
+        assert [bet["id"] for bet in bets if bet["contractId"] == contract_id] == (
+            expected
+        )
+
+
+def test_arrival_merge_yields_every_bet_once(fake_server, client):
+    bets = fetch(client, "arrival")
+    ids = [bet["id"] for bet in bets]
+    assert len(ids) == len(set(ids))
+    assert set(ids) == {bet["id"] for bet in bets_of(fake_server, CONTRACTS)}
+
+
+def test_managed_params_are_replaced(fake_server, client):
+    params = {"contractId": "m00000001", "before": "x", "limit": 1}
+    bets = fetch(client, "arrival", params=params)
+    assert len(bets) == len(bets_of(fake_server, CONTRACTS))
+
+
+def test_invalid_arguments(client):
+    with pytest.raises(ValueError, match="merge"):
+        next(iter_bets_bulk(CONTRACTS, merge="random", client=client))
+    with pytest.raises(ValueError, match="page_size"):
+        next(iter_bets_bulk(CONTRACTS, page_size=0, client=client))
+
+
+def test_no_contracts(client):
+    assert list(iter_bets_bulk([], client=client)) == []
@@ -0,0 +1,142 @@
+import asyncio
+import gc
+import threading
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+from pymanifold.client import AsyncClient, Client
+
+
+def market_path(index: int) -> str:
+    return f"/v0/market/m{index:08d}"
+
+
+def test_client_shares_one_pool_across_threads(client):
+    pool = client.open()._shared.client
+
+    def fetch(index: int) -> str:
+        response = client.request("GET", market_path(index))
+        response.raise_for_status()
+        return response.json()["id"]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        ids = list(executor.map(fetch, range(100)))
+
+    assert ids == [f"m{index:08d}" for index in range(100)]
+    assert client._shared.client is pool
+
+
+def test_client_reopens_after_close(fake_server):
+    client = Client(base_url=fake_server.url, rate_limiter=False)
+    with client:
+        assert client.request("GET", market_path(1)).status_code == 200
+    assert client.closed
+    with client:
+        assert client.request("GET", market_path(2)).status_code == 200
+    assert client.closed
+
+
+def test_async_client_survives_successive_event_loops(async_client):
+    pools = []
+
+    async def fetch(index: int) -> str:
+        response = await async_client.request("GET", market_path(index))
+        pools.append(async_client._pool())
+        return response.json()["id"]
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        for index in range(3):
+            assert asyncio.run(fetch(index)) == f"m{index:08d}"
+        gc.collect()
+
+    # Each loop got its own pool, closed when `asyncio.run` shut the loop down.
+    assert len({id(pool) for pool in pools}) == 3
+    assert all(pool.is_closed for pool in pools)
+    assert not [w for w in caught if issubclass(w.category, ResourceWarning)]
+
+
+def test_async_client_shared_between_threads(async_client):
+    barrier = threading.Barrier(4)
+
+    def worker(offset: int) -> list[str]:
+        async def fetch_all() -> list[str]:
+            barrier.wait()
+            responses = await asyncio.gather(
+                *(
+                    async_client.request("GET", market_path(offset + index))
+                    for index in range(25)
+                )
+            )
+            return [response.json()["id"] for response in responses]
+
+        return asyncio.run(fetch_all())
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(worker, range(0, 100, 25)))
+
+    assert [id_ for ids in results for id_ in ids] == [
+        f"m{index:08d}" for index in range(100)
+    ]
+
+
+def test_async_client_aclose_reaches_other_running_loops(fake_server):
+    client = AsyncClient(base_url=fake_server.url, rate_limiter=False)
+    other = asyncio.new_event_loop()
+    thread = threading.Thread(target=other.run_forever, daemon=True)
+    thread.start()
+    try:
+
+        async def fetch() -> None:
+            response = await client.request("GET", market_path(1))
+            response.raise_for_status()
+
+        asyncio.run_coroutine_threadsafe(fetch(), other).result(timeout=10)
+        other_pool = client._shared.pools[other]
+
+        async def close_here() -> None:
+            await fetch()
+            await client.aclose()
+
+        asyncio.run(close_here())
+        assert client.closed
+        assert other_pool.is_closed
+    finally:
+        other.call_soon_threadsafe(other.stop)
+        thread.join()
+        other.close()
+
+
+def test_rate_limited_view_shares_pool_state(fake_server):
+    client = Client(base_url=fake_server.url, rate_limiter=False)
+    view = client.with_rate_limiter(True)
+    assert view.rate_limiter is not None and client.rate_limiter is None
+    assert view.request("GET", market_path(1)).status_code == 200
+    pool = client._shared.client
+    assert pool is not None and not client.closed
+
+    client.close()
+    assert view.closed and pool.is_closed
+    # A request through the view reopens the pool for both clients.
+    assert view.request("GET", market_path(2)).status_code == 200
+    assert not client.closed
+    assert client._shared.client is not pool
+    view.close()
+    assert client.closed
+
+
+def test_async_rate_limited_view_shares_pools(fake_server):
+    client = AsyncClient(base_url=fake_server.url, rate_limiter=False)
+    view = client.with_rate_limiter(False)
+
+    async def main() -> None:
+        await client.request("GET", market_path(1))
+        assert view._pool() is client._pool()
+        await view.aclose()
+        assert client.closed
+        await client.request("GET", market_path(2))
+        assert not view.closed
+        await client.aclose()
+
+    asyncio.run(main())
+    assert view.closed
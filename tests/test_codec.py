@@ -0,0 +1,64 @@
+import json
+import math
+
+import pytest
+
+from pymanifold.codec import JSONCodec, OrjsonCodec, get_codec
+from pymanifold.streaming import JSONArrayDecoder
+
+pytest.importorskip("orjson")
+
+PAYLOADS = [
+    {},
+    [],
+    {"contractId": "m00000001", "amount": 10, "outcome": "YES", "limitProb": 0.37},
+    {"question": "Will it rain? ☔ — café", "tags": ["a", "b"], "nested": {"x": None}},
+    {"big": 2**53 + 1, "negative": -(2**62), "tiny": 5e-324, "float": 1e16},
+    {"escapes": 'quote " backslash \\ newline \n tab \t nul \x00'},
+    [1, 2.5, -0.0, True, False, None, "", [[]], {"": {}}],
+]
+NONFINITE = [math.nan, math.inf, -math.inf]
+CODECS = [JSONCodec(), OrjsonCodec()]
+
+
+@pytest.mark.parametrize("payload", PAYLOADS)
+def test_codecs_round_trip_the_same_payloads(payload):
+    encoded = [codec.dumps(payload) for codec in CODECS]
+    for data in encoded:
+        assert isinstance(data, bytes)
+        # Each codec decodes the other's output to the same value.
+        for codec in CODECS:
+            assert codec.loads(data) == payload
+            assert codec.loads(data.decode()) == payload
+    assert json.loads(encoded[0]) == json.loads(encoded[1])
+
+
+@pytest.mark.parametrize("value", NONFINITE)
+@pytest.mark.parametrize("codec", CODECS, ids=lambda codec: codec.name)
+def test_nonfinite_floats_are_rejected(codec, value):
+    with pytest.raises(ValueError):
+        codec.dumps({"amount": value})
+    with pytest.raises(ValueError):
+        codec.dumps([1, None, {"nested": [value]}])
+    # Plain nulls are still written as null.
+    assert codec.loads(codec.dumps({"amount": None})) == {"amount": None}
+
+
+def test_get_codec_by_name():
+    assert isinstance(get_codec("json"), JSONCodec)
+    assert isinstance(get_codec("orjson"), OrjsonCodec)
+    with pytest.raises(ValueError, match="Unknown codec"):
+        get_codec("yaml")
+
+
+@pytest.mark.parametrize("codec", CODECS, ids=lambda codec: codec.name)
+def test_stream_decoder_uses_codec_for_other_documents(codec):
+    decoder = JSONArrayDecoder(codec)
+    assert decoder.feed(b'{"message": ') == []
+    assert decoder.feed(b'"not a list"}') == []
+    assert decoder.close() == [{"message": "not a list"}]
+
+    decoder = JSONArrayDecoder(codec)
+    decoder.feed(b'{"message": ')
+    with pytest.raises(json.JSONDecodeError):
+        decoder.close()
@@ -0,0 +1,138 @@
+import asyncio
+import logging
+
+import httpx
+import pytest
+
+from pymanifold import call_manifold_api
+from pymanifold.client import AsyncClient, Client
+from pymanifold.hooks import (
+    ERROR,
+    OTHER,
+    REQUEST,
+    RESPONSE,
+    Hooks,
+    RequestEvent,
+    endpoint_template,
+)
+from pymanifold.metrics import MetricsCollector
+from pymanifold.routes import compile_template
+
+
+@pytest.mark.parametrize(
+    "path, template",
+    [
+        ("/v0/bets", "/v0/bets"),
+        ("/v0/market/abc", "/v0/market/[marketId]"),
+        ("/v0/market/abc/sell", "/v0/market/[marketId]/sell"),
+        ("/v0/market/abc/positions", "/v0/market/[marketId]/positions"),
+        ("/v0/user/alice/bets", "/v0/user/[username]/bets"),
+        ("/v0/market/[marketId]", "/v0/market/[marketId]"),
+        ("/v0/not/an/endpoint", OTHER),
+        ("/v0/market/abc/sell/extra", OTHER),
+    ],
+)
+def test_endpoint_template(path, template):
+    assert endpoint_template(path) == template
+
+
+def test_compile_template():
+    pattern = compile_template("/v0/market/[marketId]/answer")
+    assert pattern.match("/v0/market/abc/answer")["marketId"] == "abc"
+    assert not pattern.match("/v0/market/a/b/answer")
+    assert not pattern.match("/v0/market/abc/answer/x")
+    # Regex characters in the template are literal.
+    assert not compile_template("/v0/a.b").match("/v0/aXb")
+
+
+def event(kind: str, template: str = "/v0/bets") -> RequestEvent:
+    return RequestEvent(kind, "GET", template, template)
+
+
+def test_hooks_filter_by_kind_and_endpoint():
+    hooks = Hooks()
+    everything, responses, markets = [], [], []
+    record = hooks.add(everything.append)
+    hooks.add(responses.append, kinds=[RESPONSE])
+    hooks.add(markets.append, endpoints=["/v0/market/[marketId]"])
+    events = [event(REQUEST), event(RESPONSE), event(RESPONSE, "/v0/market/[marketId]")]
+    for e in events:
+        hooks.emit(e)
+    assert everything == events
+    assert responses == events[1:]
+    assert markets == events[2:]
+
+    hooks.remove(record)
+    assert len(hooks) == 2
+    hooks.clear()
+    assert not hooks
+
+
+def test_unknown_kind_is_rejected():
+    with pytest.raises(ValueError, match="Unknown event kind"):
+        Hooks().add(print, kinds=["sent"])
+
+
+def test_failing_hook_does_not_stop_the_others(caplog):
+    hooks = Hooks()
+    seen = []
+    hooks.add(lambda e: 1 / 0)
+    hooks.add(seen.append)
+    with caplog.at_level(logging.ERROR, logger="pymanifold.hooks"):
+        hooks.emit(event(REQUEST))
+    assert len(seen) == 1
+    assert "failed on request event" in caplog.text
+
+
+def test_client_events_and_metrics(fake_server):
+    hooks = Hooks()
+    events = []
+    hooks.add(events.append)
+    metrics = MetricsCollector(buckets=(0.5, 60.0)).install(hooks)
+    with Client(
+        base_url=fake_server.url, rate_limiter=False, retry=False, hooks=hooks
+    ) as client:
+        call_manifold_api("/v0/market/m00000001", client=client)
+        call_manifold_api("/v0/market/m00000002", client=client)
+        with pytest.raises(httpx.HTTPStatusError):
+            call_manifold_api("/v0/no-such-endpoint/123", client=client)
+
+    assert [e.kind for e in events] == [REQUEST, RESPONSE] * 3
+    snapshot = metrics.snapshot()
+    # Both markets share a series, and the unknown path is labelled `OTHER`.
+    assert set(snapshot) == {"/v0/market/[marketId]", OTHER}
+    market = snapshot["/v0/market/[marketId]"]["GET"]
+    assert market["responses"] == 2
+    assert market["statuses"] == {"200": 2}
+    assert market["response_bytes"] > 0
+    assert market["latency_buckets"]["+Inf"] == 2
+    assert snapshot[OTHER]["GET"]["statuses"] == {"404": 1}
+
+    text = metrics.to_prometheus()
+    assert (
+        'pymanifold_responses_total{endpoint="/v0/market/[marketId]",'
+        'method="GET",status="200"} 2'
+    ) in text
+    assert 'endpoint="other"' in text
+
+    metrics.uninstall()
+    assert len(hooks) == 1
+
+
+def test_async_client_reports_errors(fake_server):
+    hooks = Hooks()
+    errors = []
+    hooks.add(errors.append, kinds=[ERROR])
+    # Nothing listens on port 9 of localhost, so every attempt fails without a response.
+    client = AsyncClient(
+        base_url="http://127.0.0.1:9", rate_limiter=False, retry=False, hooks=hooks
+    )
+
+    async def main():
+        async with client:
+            await client.request("GET", "/v0/market/abc")
+
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(main())
+    assert [(e.kind, e.template) for e in errors] == [(ERROR, "/v0/market/[marketId]")]
+    assert errors[0].error is not None
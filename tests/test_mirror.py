@@ -0,0 +1,124 @@
+import json
+import time
+
+import pytest
+
+from pymanifold import mirror
+from pymanifold.client import Client
+from pymanifold.hooks import REQUEST, Hooks
+from pymanifold.mirror import MarketMirror
+
+from .conftest import start_server, stop_server
+
+
+@pytest.fixture
+def server():
+    # Tests edit markets, so each gets its own small server.
+    server = start_server(markets=250, bets=10)
+    yield server
+    stop_server(server)
+
+
+@pytest.fixture
+def requests():
+    return []
+
+
+@pytest.fixture
+def client(server, requests):
+    hooks = Hooks()
+    hooks.add(requests.append, kinds=[REQUEST])
+    with Client(base_url=server.url, rate_limiter=False, hooks=hooks) as client:
+        yield client
+
+
+@pytest.fixture(autouse=True)
+def small_pages(monkeypatch):
+    monkeypatch.setattr(mirror, "MARKETS_PAGE_SIZE", 100)
+
+
+def edit(server, index: int, **fields) -> dict:
+    market = {
+        **server.fixtures.markets[index],
+        "lastUpdatedTime": time.time() * 1000,
+        **fields,
+    }
+    server.fixtures.upsert_markets([market])
+    return market
+
+
+def test_first_sync_crawls_every_market(server, client, requests):
+    markets = MarketMirror(client=client)
+    assert markets.sync() == 250
+    assert len(requests) == 3
+    first = server.fixtures.markets[0]
+    assert markets.get(first["id"]) == first
+    assert markets.get_by_slug(first["slug"]) == first
+    assert first["id"] in markets and "missing" not in markets
+    assert markets.get("missing") is None and markets.get_by_slug("missing") is None
+
+
+def test_refresh_fetches_only_updated_markets(server, client, requests):
+    markets = MarketMirror(client=client)
+    markets.sync()
+    del requests[:]
+
+    renamed = edit(server, 10, question="Edited?", slug="edited-slug")
+    old_slug = server.fixtures.markets[11]["slug"]
+    edit(server, 11)
+    new = {**server.fixtures.markets[0], "id": "new-market", "slug": "new-market"}
+    new["lastUpdatedTime"] = time.time() * 1000
+    server.fixtures.upsert_markets([new])
+
+    assert markets.sync() == 3
+    assert len(requests) == 1
+    assert len(markets) == 251
+    assert markets.get(renamed["id"])["question"] == "Edited?"
+    assert markets.get_by_slug("edited-slug") == renamed
+    assert markets.get_by_slug(old_slug)["id"] == server.fixtures.markets[11]["id"]
+    assert markets.get_by_slug("new-market") == new
+
+
+def test_slug_change_drops_the_old_slug(server, client):
+    markets = MarketMirror(client=client)
+    markets.sync()
+    old = server.fixtures.markets[3]
+    edit(server, 3, slug="renamed")
+    markets.sync()
+    assert markets.get_by_slug(old["slug"]) is None
+    assert markets.get_by_slug("renamed")["id"] == old["id"]
+
+
+def test_save_and_reload(tmp_path, server, client, requests):
+    path = tmp_path / "markets.json"
+    markets = MarketMirror(path, client=client)
+    markets.sync()
+    assert json.loads(path.read_text())["watermark"] == markets.watermark
+    assert not (tmp_path / "markets.json.tmp").exists()
+
+    # A reloaded mirror refreshes incrementally from the saved watermark.
+    reloaded = MarketMirror(path, client=client)
+    assert len(reloaded) == 250
+    assert reloaded.watermark == markets.watermark
+    slug = server.fixtures.markets[5]["slug"]
+    assert reloaded.get_by_slug(slug) == server.fixtures.markets[5]
+    del requests[:]
+    assert reloaded.sync() == 0
+    assert len(requests) == 1
+
+
+def test_background_refresh(server, client):
+    markets = MarketMirror(client=client)
+    markets.start(interval=0.01)
+    try:
+        deadline = time.monotonic() + 5
+        while len(markets) < 250:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        market = edit(server, 42, question="Live?")
+        while markets.get(market["id"])["question"] != "Live?":
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+    finally:
+        markets.stop(timeout=5)
+    assert markets._thread is None
@@ -0,0 +1,93 @@
+import importlib
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from pymanifold import ENDPOINTS, Session, get_model
+
+SCRIPTS = Path(__file__).parent.parent / "scripts"
+
+SCHEMA = {
+    "type": "object",
+    "properties": {"question": {"type": "string"}},
+    "required": ["question"],
+}
+
+
+def test_get_model_resolves_a_module_and_its_same_named_package():
+    market = get_model("/v0/market")
+    market_id = get_model("/v0/market/[marketId]")
+    assert market.__name__ == "Market"
+    assert market_id.__name__ == "MarketId"
+    assert market.__module__ == "pymanifold.models.market"
+    assert market_id.__module__ == "pymanifold.models.market.id__"
+    assert Session("/v0/market").model is market
+
+
+def test_get_model_for_unknown_endpoint():
+    with pytest.raises(ValueError, match="Model not found"):
+        get_model("/v0/not-an-endpoint")
+
+
+def test_every_listed_model_imports():
+    for endpoint, entry in ENDPOINTS.items():
+        if "module_path" in entry:
+            assert get_model(endpoint).__name__ == entry["model_name"]
+
+
+@pytest.fixture
+def make_models(tmp_path, monkeypatch):
+    pytest.importorskip("datamodel_code_generator")
+    pytest.importorskip("mistune")
+    monkeypatch.syspath_prepend(str(SCRIPTS))
+    module = importlib.import_module("make_models")
+    monkeypatch.setattr(module, "REPO_ROOT", tmp_path)
+    (tmp_path / "scripts").mkdir()
+    (tmp_path / "pymanifold" / "models").mkdir(parents=True)
+    yield module
+    sys.modules.pop("make_models", None)
+
+
+def test_make_models_writes_colliding_module_as_package_init(tmp_path, make_models):
+    manifold = tmp_path / "manifold"
+    doc = manifold / make_models.API_DOC_PATH
+    doc.parent.mkdir(parents=True)
+    doc.write_text(
+        "### `POST /v0/market`\n\n"
+        "### `GET /v0/market/[marketId]`\n\n"
+        "### `GET /v0/market/[marketId]/positions`\n"
+    )
+    schemas = tmp_path / "schemas"
+    for name in ("market.json", "market/{id}.json", "market/{id}/positions.json"):
+        (schemas / name).parent.mkdir(parents=True, exist_ok=True)
+        (schemas / name).write_text(json.dumps(SCHEMA))
+    models = tmp_path / make_models.PYDANTIC_OUTPUT
+    # Left over from the old layout, which shadowed it with the package.
+    (models / "market.py").write_text("")
+
+    endpoints = make_models.make_models(manifold, schemas, jobs=1)
+
+    assert not (models / "market.py").exists()
+    assert "filename:  market.json" in (models / "market" / "__init__.py").read_text()
+    assert endpoints["/v0/market"]["module_path"] == ".market"
+    assert endpoints["/v0/market/[marketId]"]["module_path"] == ".market.id__"
+    assert endpoints["/v0/market/[marketId]/positions"] == {
+        "method": "GET",
+        "module_path": ".market.id_.positions",
+        "model_name": "MarketIdPositions",
+    }
+    assert (models / "market" / "id__.py").exists()
+    assert (models / "market" / "id_" / "positions.py").exists()
+
+    # Unchanged schemas are skipped on the next run.
+    hashes = json.loads((tmp_path / make_models.SCHEMA_HASHES).read_text())
+    assert sorted(hashes) == [
+        "market.json",
+        "market/{id}.json",
+        "market/{id}/positions.json",
+    ]
+    stamp = (models / "market" / "__init__.py").stat().st_mtime_ns
+    make_models.make_models(manifold, schemas, jobs=1)
+    assert (models / "market" / "__init__.py").stat().st_mtime_ns == stamp
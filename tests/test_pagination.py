@@ -0,0 +1,125 @@
+import asyncio
+
+import pytest
+
+from pymanifold.client import AsyncClient, Client
+from pymanifold.hooks import REQUEST, Hooks
+from pymanifold.pagination import aiter_bets, apaginate, iter_bets, paginate
+
+
+def counting(client_class, fake_server):
+    """A client on the fake server, and the list its requests are recorded in."""
+    requests = []
+    hooks = Hooks()
+    hooks.add(requests.append, kinds=[REQUEST])
+    client = client_class(base_url=fake_server.url, rate_limiter=False, hooks=hooks)
+    return client, requests
+
+
+def bet_ids(fake_server, contract_id: str | None = None) -> list[str]:
+    return [
+        bet["id"]
+        for bet in fake_server.fixtures.bets
+        if contract_id is None or bet["contractId"] == contract_id
+    ]
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_paginate_walks_every_page_newest_first(fake_server, stream):
+    client, requests = counting(Client, fake_server)
+    with client:
+        ids = [
+            bet["id"] for bet in iter_bets(page_size=700, stream=stream, client=client)
+        ]
+    assert ids == bet_ids(fake_server)[::-1]
+    # 5000 bets: seven full pages and a short one.
+    assert len(requests) == 8
+
+
+def test_paginate_ascending_uses_after_cursor(fake_server, client):
+    ids = [
+        bet["id"] for bet in iter_bets({"order": "asc"}, page_size=600, client=client)
+    ]
+    assert ids == bet_ids(fake_server)
+
+
+def test_paginate_stops_on_empty_page_after_exact_multiple(fake_server):
+    client, requests = counting(Client, fake_server)
+    with client:
+        ids = [bet["id"] for bet in iter_bets(page_size=1000, client=client)]
+    assert len(ids) == 5000
+    assert len(requests) == 6
+
+
+@pytest.mark.parametrize("order", ["desc", "asc"])
+def test_paginate_max_rows(fake_server, order):
+    client, requests = counting(Client, fake_server)
+    with client:
+        ids = [
+            bet["id"]
+            for bet in iter_bets(
+                {"order": order}, page_size=500, max_rows=1234, client=client
+            )
+        ]
+    expected = bet_ids(fake_server)
+    expected = expected[:1234] if order == "asc" else expected[::-1][:1234]
+    assert ids == expected
+    # The last page only asks for the 234 rows still wanted.
+    assert len(requests) == 3
+
+
+def test_paginate_filters_and_generic_endpoint(fake_server, client):
+    contract_id = fake_server.fixtures.bets[0]["contractId"]
+    rows = paginate(
+        "/v0/bets",
+        {"contractId": contract_id, "order": "asc"},
+        cursor_param="after",
+        page_size=7,
+        client=client,
+    )
+    assert [bet["id"] for bet in rows] == bet_ids(fake_server, contract_id)
+
+
+def test_iter_bets_rejects_page_sizes_out_of_range(client):
+    for page_size in (0, 50_001):
+        with pytest.raises(ValueError):
+            iter_bets(page_size=page_size, client=client)
+
+
+@pytest.mark.parametrize("stream", [False, True])
+@pytest.mark.parametrize("order", ["desc", "asc"])
+def test_apaginate_matches_paginate(fake_server, stream, order):
+    client, requests = counting(AsyncClient, fake_server)
+
+    async def collect() -> list[str]:
+        async with client:
+            return [
+                bet["id"]
+                async for bet in aiter_bets(
+                    {"order": order},
+                    page_size=400,
+                    max_rows=2100,
+                    stream=stream,
+                    client=client,
+                )
+            ]
+
+    expected = bet_ids(fake_server)
+    expected = expected[:2100] if order == "asc" else expected[::-1][:2100]
+    assert asyncio.run(collect()) == expected
+    assert len(requests) == 6
+
+
+def test_apaginate_stops_on_short_page(fake_server, async_client):
+    contract_id = fake_server.fixtures.bets[0]["contractId"]
+
+    async def collect() -> list[str]:
+        rows = apaginate(
+            "/v0/bets",
+            {"contractId": contract_id},
+            page_size=1000,
+            client=async_client,
+        )
+        return [bet["id"] async for bet in rows]
+
+    assert asyncio.run(collect()) == bet_ids(fake_server, contract_id)[::-1]
@@ -0,0 +1,262 @@
+import asyncio
+import json
+import socket
+import time
+from contextlib import asynccontextmanager
+
+import pytest
+from websockets.asyncio.server import serve as serve_websocket
+
+from pymanifold import realtime
+from pymanifold.client import AsyncClient
+from pymanifold.realtime import (
+    POLLING,
+    REALTIME,
+    RealtimeClient,
+    market_bets,
+    market_updates,
+)
+
+from .conftest import start_server, stop_server
+
+TIMEOUT = 5.0
+
+
+class RealtimeServer:
+    def __init__(self):
+        """Minimal stand-in for the realtime API: acks requests and broadcasts on demand."""
+        self.connections = []
+        self.subscriptions: asyncio.Queue = asyncio.Queue()
+        self.url = None
+
+    async def handler(self, ws) -> None:
+        self.connections.append(ws)
+        async for message in ws:
+            payload = json.loads(message)
+            if payload["type"] == "subscribe":
+                await self.subscriptions.put(sorted(payload["topics"]))
+            await ws.send(
+                json.dumps({"type": "ack", "txid": payload["txid"], "success": True})
+            )
+
+    async def subscribed(self) -> list[str]:
+        return await asyncio.wait_for(self.subscriptions.get(), TIMEOUT)
+
+    async def broadcast(self, topic: str, data: dict) -> None:
+        message = json.dumps({"type": "broadcast", "topic": topic, "data": data})
+        for ws in self.connections:
+            try:
+                await ws.send(message)
+            except Exception:
+                pass
+
+    async def drop(self) -> None:
+        """Close every open connection, as the API does on deploys."""
+        for ws in self.connections:
+            await ws.close()
+        self.connections.clear()
+
+
+@asynccontextmanager
+async def realtime_server():
+    server = RealtimeServer()
+    async with serve_websocket(server.handler, "127.0.0.1", 0) as ws_server:
+        host, port = ws_server.sockets[0].getsockname()[:2]
+        server.url = f"ws://{host}:{port}"
+        yield server
+
+
+def unused_url() -> str:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"ws://127.0.0.1:{port}"
+
+
+def make_bet(bet_id: str, market_id: str, created: float) -> dict:
+    return {
+        "id": bet_id,
+        "contractId": market_id,
+        "userId": "u00000001",
+        "createdTime": created,
+        "amount": 10.0,
+        "shares": 20.0,
+        "outcome": "YES",
+        "limitProb": None,
+        "isFilled": True,
+        "isCancelled": False,
+    }
+
+
+def now_ms() -> float:
+    return time.time() * 1000
+
+
+async def next_event(subscription):
+    return await asyncio.wait_for(anext(subscription), TIMEOUT)
+
+
+@pytest.fixture(scope="module")
+def bets_server():
+    # Tests add bets to these fixtures, so keep them away from the shared server.
+    server = start_server(bets=100)
+    yield server
+    stop_server(server)
+
+
+@pytest.fixture
+def fast_reconnect(monkeypatch):
+    monkeypatch.setattr(realtime, "RECONNECT_BASE_DELAY", 0.01)
+
+
+def run(coroutine_function, bets_server, **kwargs):
+    async def main():
+        async with AsyncClient(
+            base_url=bets_server.url, rate_limiter=False, retry=False
+        ) as client:
+            await coroutine_function(client, **kwargs)
+
+    asyncio.run(main())
+
+
+def test_live_delivery(bets_server):
+    async def check(client):
+        async with realtime_server() as server, RealtimeClient(
+            url=server.url, poll=False, client=client
+        ) as live:
+            subscription = await live.subscribe(market_bets("live"))
+            assert await server.subscribed() == [market_bets("live")]
+
+            bet = make_bet("b-live", "live", now_ms())
+            await server.broadcast(market_bets("live"), {"bets": [bet]})
+            event = await next_event(subscription)
+            assert event.source == REALTIME
+            assert event.data["bets"] == [bet]
+            assert live.mode == REALTIME
+
+    run(check, bets_server)
+
+
+def test_polls_while_socket_is_down(bets_server):
+    async def check(client):
+        async with RealtimeClient(
+            url=unused_url(), poll_interval=0.05, client=client
+        ) as live:
+            subscription = await live.subscribe(market_bets("down"))
+            bet = make_bet("b-down", "down", now_ms() + 1000)
+            bets_server.fixtures.add_bets([bet])
+
+            event = await next_event(subscription)
+            assert event.source == POLLING
+            assert event.data["bets"] == [bet]
+            assert live.mode == POLLING
+
+    run(check, bets_server)
+
+
+def test_reconnects_and_resubscribes(bets_server, fast_reconnect):
+    async def check(client):
+        topics = [market_bets("again"), market_updates("again")]
+        async with realtime_server() as server, RealtimeClient(
+            url=server.url, poll=False, client=client
+        ) as live:
+            subscription = await live.subscribe(topics)
+            assert await server.subscribed() == sorted(topics)
+
+            await server.drop()
+            assert await server.subscribed() == sorted(topics)
+
+            bet = make_bet("b-again", "again", now_ms() + 1000)
+            await server.broadcast(market_bets("again"), {"bets": [bet]})
+            event = await next_event(subscription)
+            assert event.source == REALTIME
+            assert event.data["bets"] == [bet]
+
+    run(check, bets_server)
+
+
+def test_catch_up_poll_skips_events_already_delivered(bets_server, fast_reconnect):
+    async def check(client):
+        async with realtime_server() as server, RealtimeClient(
+            url=server.url, poll=False, client=client
+        ) as live:
+            # Two markets share one catch-up query, from the older watermark.
+            subscription = await live.subscribe(
+                [market_bets("dedup"), market_bets("dedup-quiet")]
+            )
+            await server.subscribed()
+            start = now_ms()
+            seen = make_bet("b-dedup-1", "dedup", start + 1000)
+            missed = make_bet("b-dedup-2", "dedup", start + 2000)
+            later = make_bet("b-dedup-3", "dedup", start + 3000)
+
+            await server.broadcast(market_bets("dedup"), {"bets": [seen]})
+            event = await next_event(subscription)
+            assert (event.source, event.data["bets"]) == (REALTIME, [seen])
+
+            # `missed` arrives while the socket is down; the catch-up poll
+            # after reconnecting returns it along with `seen`.
+            bets_server.fixtures.add_bets([seen, missed])
+            await server.drop()
+            await server.subscribed()
+            event = await next_event(subscription)
+            assert (event.source, event.data["bets"]) == (POLLING, [missed])
+
+            # A late broadcast of a polled bet is not delivered again.
+            await server.broadcast(market_bets("dedup"), {"bets": [missed]})
+            await server.broadcast(market_bets("dedup"), {"bets": [later]})
+            event = await next_event(subscription)
+            assert (event.source, event.data["bets"]) == (REALTIME, [later])
+
+    run(check, bets_server)
+
+
+def record_backoff(live: RealtimeClient) -> list[int]:
+    """Record the attempt number of every reconnection delay `live` waits."""
+    attempts = []
+    delay = live._backoff.delay
+
+    def record(attempt: int) -> float:
+        attempts.append(attempt)
+        return delay(attempt)
+
+    live._backoff.delay = record
+    return attempts
+
+
+async def wait_for(condition) -> None:
+    deadline = time.monotonic() + TIMEOUT
+    while not condition():
+        assert time.monotonic() < deadline
+        await asyncio.sleep(0.01)
+
+
+def test_backoff_restarts_after_established_session_fails(bets_server, fast_reconnect):
+    async def check(client):
+        connections = 0
+
+        async def accept_then_fail(ws) -> None:
+            nonlocal connections
+            connections += 1
+            await asyncio.sleep(0.01)
+            # Drop the connection without a close frame, so the client's read raises.
+            ws.transport.abort()
+
+        async with serve_websocket(accept_then_fail, "127.0.0.1", 0) as ws_server:
+            host, port = ws_server.sockets[0].getsockname()[:2]
+            async with RealtimeClient(
+                url=f"ws://{host}:{port}", poll=False, client=client
+            ) as live:
+                attempts = record_backoff(live)
+                await live.subscribe(market_bets("flaky"))
+                await wait_for(lambda: connections >= 4)
+        # Every session was established, so none backs off further than the first.
+        assert attempts[:3] == [0, 0, 0]
+
+        async with RealtimeClient(url=unused_url(), poll=False, client=client) as live:
+            attempts = record_backoff(live)
+            await live.subscribe(market_bets("flaky"))
+            await wait_for(lambda: len(attempts) >= 3)
+        assert attempts[:3] == [0, 1, 2]
+
+    run(check, bets_server)
@@ -0,0 +1,86 @@
+import copy
+import pickle
+
+import pytest
+
+from pymanifold.records import Bet, Comment, Market, record_type, to_records
+
+BET = {
+    "id": "b1",
+    "userId": "u1",
+    "contractId": "m1",
+    "createdTime": 1700000000000,
+    "amount": 10.0,
+    "shares": 20.0,
+    "outcome": "YES",
+    "probBefore": 0.5,
+    "probAfter": 0.55,
+    "isFilled": True,
+    "fills": [{"amount": 10.0, "shares": 20.0}],
+    "visibility": "public",
+}
+
+
+def test_fields_are_attributes():
+    bet = Bet.from_dict(BET)
+    assert (bet.id, bet.amount, bet.outcome) == ("b1", 10.0, "YES")
+    assert bet.limitProb is None
+    assert bet.extras is None
+    assert bet.to_dict() == {
+        name: value for name, value in BET.items() if name in Bet.FIELDS
+    }
+
+
+def test_validation():
+    with pytest.raises(ValueError, match="missing"):
+        Bet.from_dict({"amount": 1.0})
+    with pytest.raises(ValueError, match="Bet.amount expects"):
+        Bet.from_dict({**BET, "amount": "10"})
+    with pytest.raises(ValueError, match="Bet.amount expects"):
+        Bet.from_dict({**BET, "amount": True})
+    with pytest.raises(ValueError, match="expects an object"):
+        Bet.from_dict([BET])
+    # Trusted data is not checked.
+    assert Bet.from_dict({**BET, "amount": "10"}, trusted=True).amount == "10"
+
+
+def test_extras_are_kept_on_request():
+    bet = Bet.from_dict(BET, extras=True)
+    assert bet.extras == {"fills": BET["fills"], "visibility": "public"}
+    assert bet.to_dict() == BET
+    assert bet != Bet.from_dict(BET)
+    assert [r.extras for r in Bet.from_dicts([BET, BET], extras=True)] == [
+        bet.extras
+    ] * 2
+    # Nothing extra to keep: no slot is added.
+    known = {name: value for name, value in BET.items() if name in Bet.FIELDS}
+    assert len(Bet.from_dict(known, extras=True)) == len(Bet.FIELDS)
+
+
+def test_equality_and_hash_include_the_type():
+    bet = Bet.from_dict({"id": "x"})
+    comment = Comment.from_dict({"id": "x"})
+    assert tuple(bet)[:1] == tuple(comment)[:1]
+    assert bet != comment and not bet == comment
+    assert Bet.from_dict({"id": "x"}) == bet
+    assert hash(Bet.from_dict({"id": "x"})) == hash(bet)
+    assert len({bet, comment, Bet.from_dict({"id": "x"})}) == 2
+    assert bet != tuple(bet) and tuple(bet) != bet
+
+
+def test_records_pickle_and_copy_with_extras():
+    bet = Bet.from_dict(BET, extras=True)
+    for clone in (pickle.loads(pickle.dumps(bet)), copy.deepcopy(bet)):
+        assert type(clone) is Bet
+        assert clone == bet
+        assert clone.extras == bet.extras
+
+
+def test_to_records_by_endpoint():
+    assert record_type("/v0/market/abc") is Market
+    assert record_type("/v0/unknown") is None
+    bets = to_records("/v0/bets", [BET, BET], trusted=True)
+    assert [type(bet) for bet in bets] == [Bet, Bet]
+    market = to_records("/v0/slug/some-market", {"id": "m1", "extra": 1}, extras=True)
+    assert market.extras == {"extra": 1}
+    assert to_records("/v0/unknown", {"a": 1}) == {"a": 1}
@@ -0,0 +1,226 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from pymanifold.client import AsyncClient, Client
+from pymanifold.hooks import REQUEST, RETRY, Hooks
+from pymanifold.retry import (
+    IDEMPOTENCY_KEY_ALPHABET,
+    IDEMPOTENCY_KEY_FIELD,
+    IDEMPOTENCY_KEY_LENGTH,
+    RetryPolicy,
+    generate_idempotency_key,
+)
+
+# Nothing listens on port 9 of localhost, so every attempt fails before sending.
+UNREACHABLE = "http://127.0.0.1:9"
+
+
+def response(status: int) -> httpx.Response:
+    return httpx.Response(status, request=httpx.Request("GET", "http://test/"))
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "FlakyServer"
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def _reply(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        with self.server.lock:
+            self.server.bodies.append(json.loads(body) if body else None)
+            status = self.server.statuses.pop(0) if self.server.statuses else 200
+        payload = b'{"ok":true}'
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        if status != 200:
+            self.send_header("Retry-After", "0")
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = do_POST = _reply
+
+
+class FlakyServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FlakyHandler)
+        self.lock = threading.Lock()
+        # Statuses of the next responses; 200 once they run out.
+        self.statuses: list[int] = []
+        self.bodies: list = []
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+@pytest.fixture
+def flaky():
+    server = FlakyServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def counting_client(url: str, retry, client_class=Client) -> tuple:
+    events = []
+    hooks = Hooks()
+    hooks.add(events.append, kinds=[REQUEST, RETRY])
+    client = client_class(base_url=url, rate_limiter=False, retry=retry, hooks=hooks)
+    return client, events
+
+
+def test_generate_idempotency_key():
+    key = generate_idempotency_key()
+    assert len(key) == IDEMPOTENCY_KEY_LENGTH
+    assert set(key) <= set(IDEMPOTENCY_KEY_ALPHABET)
+    assert generate_idempotency_key() != key
+
+
+def test_prepare_adds_a_key_only_to_supported_writes():
+    policy = RetryPolicy()
+    body = {"question": "Will it rain?"}
+    prepared = policy.prepare("POST", "/v0/market", body)
+    assert prepared[IDEMPOTENCY_KEY_FIELD]
+    assert prepared["question"] == body["question"]
+    assert IDEMPOTENCY_KEY_FIELD not in body
+
+    keyed = {**body, IDEMPOTENCY_KEY_FIELD: "abc"}
+    assert policy.prepare("POST", "/v0/market", keyed) is keyed
+    assert policy.prepare("POST", "/v0/bet", body) is body
+    assert policy.prepare("GET", "/v0/market", body) is body
+    assert policy.prepare("POST", "/v0/market", None) is None
+    no_keys = RetryPolicy(auto_idempotency_key=False)
+    assert no_keys.prepare("POST", "/v0/market", body) is body
+
+
+def test_should_retry_responses():
+    policy = RetryPolicy(max_retries=2)
+    keyed = {IDEMPOTENCY_KEY_FIELD: "abc"}
+    assert policy.should_retry("GET", None, 0, response(503))
+    assert policy.should_retry("POST", keyed, 0, response(500))
+    # A write without a key may have been applied, so it is not resent.
+    assert not policy.should_retry("POST", {"amount": 1}, 0, response(503))
+    assert not policy.should_retry("GET", None, 0, response(404))
+    assert not policy.should_retry("GET", None, 0, response(429))
+    assert not policy.should_retry("GET", None, 2, response(503))
+    assert RetryPolicy(statuses=frozenset({404})).should_retry(
+        "GET", None, 0, response(404)
+    )
+
+
+def test_should_retry_errors():
+    policy = RetryPolicy(max_retries=1)
+    body = {"amount": 1}
+    # Nothing was sent, so any method can be resent.
+    assert policy.should_retry("POST", body, 0, error=httpx.ConnectError("down"))
+    assert policy.should_retry("POST", body, 0, error=httpx.PoolTimeout("busy"))
+    # The server may have processed a request that timed out.
+    assert policy.should_retry("GET", None, 0, error=httpx.ReadTimeout("slow"))
+    assert not policy.should_retry("POST", body, 0, error=httpx.ReadTimeout("slow"))
+    assert not policy.should_retry("GET", None, 0, error=ValueError("bug"))
+    assert not policy.should_retry("GET", None, 1, error=httpx.ConnectError("down"))
+
+
+def test_delay_is_jittered_and_capped():
+    policy = RetryPolicy(base_delay=1.0, max_delay=3.0)
+    for retries, bound in [(0, 1.0), (1, 2.0), (2, 3.0), (10, 3.0)]:
+        delays = [policy.delay(retries) for _ in range(200)]
+        assert all(0 <= delay <= bound for delay in delays)
+        assert max(delays) > bound / 2
+
+
+def test_client_retry_defaults():
+    assert isinstance(Client(retry=True).retry, RetryPolicy)
+    assert isinstance(Client().retry, RetryPolicy)
+    assert Client(retry=False).retry is None
+    policy = RetryPolicy()
+    assert Client(retry=policy).retry is policy
+
+
+def test_get_is_retried_until_it_succeeds(flaky):
+    flaky.statuses = [503, 502]
+    client, events = counting_client(flaky.url, RetryPolicy(base_delay=0))
+    with client:
+        assert client.request("GET", "/v0/me").status_code == 200
+    assert [(e.kind, e.attempt) for e in events] == [
+        (REQUEST, 0),
+        (RETRY, 0),
+        (REQUEST, 1),
+        (RETRY, 1),
+        (REQUEST, 2),
+    ]
+    assert events[1].status == 503
+
+
+def test_retries_give_up_with_the_last_response(flaky):
+    flaky.statuses = [503] * 5
+    client, events = counting_client(
+        flaky.url, RetryPolicy(max_retries=2, base_delay=0)
+    )
+    with client:
+        assert client.request("GET", "/v0/me").status_code == 503
+    assert sum(e.kind == REQUEST for e in events) == 3
+
+
+def test_unkeyed_write_is_not_resent(flaky):
+    flaky.statuses = [503]
+    client, _ = counting_client(flaky.url, RetryPolicy(base_delay=0))
+    with client:
+        status = client.request("POST", "/v0/bet", json={"amount": 1}).status_code
+    assert status == 503
+    assert flaky.bodies == [{"amount": 1}]
+
+
+def test_market_creation_is_resent_with_the_same_key(flaky):
+    flaky.statuses = [500]
+    client, _ = counting_client(flaky.url, RetryPolicy(base_delay=0))
+    with client:
+        client.request("POST", "/v0/market", json={"question": "Q?"})
+    first, second = flaky.bodies
+    assert first == second
+    assert first[IDEMPOTENCY_KEY_FIELD]
+
+
+def test_connect_errors_are_retried_then_raised():
+    client, events = counting_client(
+        UNREACHABLE, RetryPolicy(max_retries=2, base_delay=0)
+    )
+    with client, pytest.raises(httpx.ConnectError):
+        client.request("POST", "/v0/bet", json={"amount": 1})
+    assert sum(e.kind == REQUEST for e in events) == 3
+    assert all(e.error is not None for e in events if e.kind == RETRY)
+
+
+def test_retry_disabled(flaky):
+    flaky.statuses = [503]
+    client, events = counting_client(flaky.url, False)
+    with client:
+        assert client.request("GET", "/v0/me").status_code == 503
+    assert [e.kind for e in events] == [REQUEST]
+
+
+def test_async_client_retries(flaky):
+    flaky.statuses = [504]
+    client, events = counting_client(
+        flaky.url, RetryPolicy(base_delay=0), client_class=AsyncClient
+    )
+
+    async def main() -> int:
+        async with client:
+            return (await client.request("GET", "/v0/me")).status_code
+
+    assert asyncio.run(main()) == 200
+    assert sum(e.kind == REQUEST for e in events) == 2
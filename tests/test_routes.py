@@ -0,0 +1,87 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pydantic
+import pytest
+
+from pymanifold import Session
+from pymanifold.aio import AsyncSession
+from pymanifold.client import AsyncClient
+from pymanifold.routes import Route, get_route
+
+
+def test_format_substitutes_every_placeholder():
+    route = Route("/v0/market/[marketId]/answer/[answerId]")
+    assert route.params == ("marketId", "answerId")
+    path = route.format({"marketId": "abc", "answerId": 7, "unused": "x"})
+    assert path == "/v0/market/abc/answer/7"
+
+
+def test_format_without_placeholders():
+    assert Route("/v0/me").format() == "/v0/me"
+    assert Route("/v0/me").format({"ignored": 1}) == "/v0/me"
+
+
+def test_format_percent_encodes_values():
+    route = Route("/v0/user/[username]/bets")
+    assert route.format({"username": "a/b c?"}) == "/v0/user/a%2Fb%20c%3F/bets"
+
+
+def test_format_missing_parameter():
+    with pytest.raises(ValueError, match="Missing URL parameter 'marketId'"):
+        Route("/v0/market/[marketId]").format({"id": "abc"})
+    with pytest.raises(ValueError, match="marketId"):
+        Route("/v0/market/[marketId]").format()
+
+
+def test_get_route_is_shared_and_knows_the_method():
+    route = get_route("/v0/market/[marketId]/sell")
+    assert get_route("/v0/market/[marketId]/sell") is route
+    assert route.method == "POST"
+    assert get_route("/v0/not-an-endpoint").method is None
+
+
+@pytest.mark.parametrize("endpoint", ["/v0/me", "/me", "me"])
+def test_session_normalizes_the_endpoint(endpoint):
+    session = Session(endpoint)
+    assert session.endpoint == "/v0/me"
+    assert session.method == "GET"
+
+
+def test_session_rejects_other_versions():
+    with pytest.raises(ValueError, match="v0"):
+        Session("/me", version="v1")
+
+
+def test_session_is_reusable(fake_server, client):
+    session = Session("/v0/market/[marketId]", client=client)
+    ids = [market["id"] for market in fake_server.fixtures.markets[:20]]
+    assert session.url({"marketId": ids[0]}) == f"/v0/market/{ids[0]}"
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        markets = list(pool.map(lambda i: session.execute({"marketId": i}), ids))
+    assert [market["id"] for market in markets] == ids
+    assert session.endpoint == "/v0/market/[marketId]"
+
+
+def test_session_validates_before_sending(fake_server, client):
+    session = Session("/v0/bet", client=client)
+    with pytest.raises(pydantic.ValidationError):
+        session.execute(json_data={"contractId": "m00000001", "amount": "lots"})
+    trusted = Session("/v0/bet", client=client, trusted=True)
+    response = trusted.execute(json_data={"contractId": "m00000001", "amount": 10})
+    assert response["betId"].startswith("new")
+
+
+def test_async_session_is_reusable(fake_server):
+    session = AsyncSession("/v0/user/[username]")
+    names = [user["username"] for user in fake_server.fixtures.users[:10]]
+
+    async def main() -> list[dict]:
+        async with AsyncClient(base_url=fake_server.url, rate_limiter=False) as client:
+            session.client = client
+            return await asyncio.gather(
+                *(session.execute({"username": name}) for name in names)
+            )
+
+    assert [user["username"] for user in asyncio.run(main())] == names
+    assert session.endpoint == "/v0/user/[username]"
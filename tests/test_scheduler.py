@@ -0,0 +1,173 @@
+import asyncio
+import time
+
+import pytest
+
+from pymanifold.client import AsyncClient
+from pymanifold.scheduler import (
+    CLOSE_POLLS,
+    GROWTH,
+    RECENCY_FACTOR,
+    SHRINK,
+    MarketPoller,
+    PollSchedule,
+)
+
+from .conftest import start_server, stop_server
+
+NOW = 1_700_000_000.0
+
+
+def market(market_id: str = "m1", idle: float = 400.0, **fields) -> dict:
+    """A market whose last bet was `idle` seconds before `NOW`."""
+    return {"id": market_id, "lastBetTime": (NOW - idle) * 1000, **fields}
+
+
+@pytest.fixture
+def schedule():
+    return PollSchedule(rps=10.0, min_interval=10.0, max_interval=1000.0)
+
+
+def test_estimate_follows_activity(schedule):
+    assert schedule.estimate(market(idle=400), NOW) == 400 * RECENCY_FACTOR
+    busy = market(idle=400, volume24Hours=1000)
+    assert schedule.estimate(busy, NOW) == 400 * RECENCY_FACTOR / 2
+    # Clamped to the configured bounds.
+    assert schedule.estimate(market(idle=1), NOW) == 10.0
+    assert schedule.estimate(market(idle=10**6), NOW) == 1000.0
+
+
+def test_estimate_of_closing_closed_and_resolved_markets(schedule):
+    closing = market(idle=10**6, closeTime=(NOW + 200) * 1000)
+    assert schedule.estimate(closing, NOW) == 200 / CLOSE_POLLS
+    closed = market(idle=1, closeTime=(NOW - 1) * 1000)
+    assert schedule.estimate(closed, NOW) == 1000.0
+    assert schedule.estimate(market(idle=1, isResolved=True), NOW) == 1000.0
+
+
+def test_bare_id_is_due_immediately(schedule):
+    schedule.add("m1", NOW)
+    schedule.add("m1", NOW)
+    assert len(schedule) == 1 and "m1" in schedule
+    assert schedule.interval("m1") is None
+    assert schedule.next_due() == NOW
+    assert schedule.pop_due(NOW) == "m1"
+    # Not queued again until its poll is recorded.
+    assert schedule.pop_due(NOW + 10**6) is None
+    assert schedule.next_due() is None
+
+
+def test_market_object_is_scheduled_from_its_activity(schedule):
+    schedule.add(market(idle=400), NOW)
+    assert schedule.interval("m1") == 100.0
+    assert schedule.pop_due(NOW + 99) is None
+    assert schedule.pop_due(NOW + 100) == "m1"
+
+
+def test_record_shrinks_on_change_and_grows_otherwise(schedule):
+    schedule.add(market(idle=400, probability=0.5), NOW)
+    schedule.pop_due(NOW + 100)
+    assert not schedule.record("m1", market(idle=400, probability=0.5), NOW)
+    assert schedule.interval("m1") == 100.0 * GROWTH
+    assert schedule.record("m1", market(idle=400, probability=0.6), NOW)
+    assert schedule.interval("m1") == 100.0 * GROWTH * SHRINK
+    assert schedule.next_due() == NOW + 100.0 * GROWTH * SHRINK
+    assert not schedule.record("unknown", market("unknown"), NOW)
+
+
+def test_failed_poll_is_retried_at_the_usual_pace(schedule):
+    schedule.add("m1", NOW)
+    schedule.pop_due(NOW)
+    assert not schedule.record("m1", None, NOW)
+    assert schedule.interval("m1") is None
+    assert schedule.next_due() == NOW + 10.0
+
+
+def test_remove_drops_queued_markets_and_their_load(schedule):
+    schedule.add(market("a"), NOW)
+    schedule.add(market("b", idle=800), NOW)
+    load = schedule.load
+    schedule.remove("a")
+    schedule.remove("missing")
+    assert "a" not in schedule and len(schedule) == 1
+    assert schedule.load == pytest.approx(load - 1 / 100 / schedule.rps)
+    assert schedule.pop_due(NOW + 10**6) == "b"
+
+
+def test_intervals_stretch_when_over_budget():
+    schedule = PollSchedule(rps=0.1, min_interval=10.0, max_interval=1000.0)
+    for index in range(4):
+        schedule.add(market(f"m{index}", idle=400), NOW)
+    # Four markets every 100s want 0.04 polls per second, within budget.
+    assert schedule.load == pytest.approx(0.4)
+    for index in range(4, 20):
+        schedule.add(market(f"m{index}", idle=400), NOW)
+    # Twenty want twice the budget, so later ones are queued twice as far out.
+    assert schedule.load == pytest.approx(2.0)
+    schedule.record("m0", market("m0", idle=400), NOW)
+    assert schedule.interval("m0") == 100.0 * GROWTH
+    for index in range(1, 20):
+        schedule.remove(f"m{index}")
+    assert schedule.next_due() == pytest.approx(NOW + 100.0 * GROWTH * 2.0, rel=0.1)
+
+
+@pytest.fixture
+def server():
+    # Tests edit markets, so each gets its own small server.
+    server = start_server(markets=20, bets=10)
+    yield server
+    stop_server(server)
+
+
+def poll(server, poller: MarketPoller, until, timeout: float = 5.0) -> None:
+    """Run `poller` against `server` until `until()` holds."""
+
+    async def main():
+        async with AsyncClient(base_url=server.url, rate_limiter=False) as client:
+            poller.client = client
+            task = asyncio.ensure_future(poller.run(duration=timeout))
+            while not until() and not task.done():
+                await asyncio.sleep(0.01)
+            poller.stop()
+            await task
+
+    asyncio.run(main())
+    assert until()
+
+
+def test_poller_reports_changed_markets(server):
+    ids = [m["id"] for m in server.fixtures.markets[:5]]
+    changed = []
+
+    async def on_change(found: dict) -> None:
+        changed.append(found)
+
+    poller = MarketPoller(
+        ids, on_change=on_change, rps=1000, min_interval=0.01, max_interval=0.05
+    )
+    poll(server, poller, lambda: poller.polls >= 5)
+    assert not changed
+
+    edited = {**server.fixtures.markets[2], "lastUpdatedTime": time.time() * 1000}
+    server.fixtures.upsert_markets([edited])
+    poll(server, poller, lambda: changed)
+    assert changed[0] == edited
+    assert poller.changes == len(changed)
+    assert poller.errors == 0
+
+
+def test_poller_counts_failures_and_keeps_going(server, caplog):
+    seen = []
+    poller = MarketPoller(
+        [server.fixtures.markets[0], "missing"],
+        on_change=seen.append,
+        rps=1000,
+        min_interval=0.01,
+        max_interval=0.05,
+    )
+    poller.remove(server.fixtures.markets[0]["id"])
+    poller.add(server.fixtures.markets[1]["id"])
+    poll(server, poller, lambda: poller.errors >= 2 and poller.polls >= 2)
+    assert "Polling market missing failed" in caplog.text
+    assert "missing" in poller.schedule
+    assert not seen
@@ -0,0 +1,112 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+from pymanifold.client import AsyncClient, Client
+from pymanifold.hooks import REQUEST, RESPONSE, Hooks
+from pymanifold.search import ascan_markets, scan_markets
+
+from .conftest import start_server, stop_server
+
+
+def market_ids(server) -> list[str]:
+    return [market["id"] for market in server.fixtures.markets]
+
+
+def counting_client(server) -> tuple[Client, list]:
+    requests = []
+    hooks = Hooks()
+    hooks.add(requests.append, kinds=[REQUEST])
+    return Client(base_url=server.url, rate_limiter=False, hooks=hooks), requests
+
+
+def test_ordered_scan_matches_sort_order(fake_server, client):
+    rows = scan_markets(page_size=30, max_workers=4, client=client)
+    assert [market["id"] for market in rows] == market_ids(fake_server)
+
+
+def test_unordered_scan_yields_every_market_once(fake_server, client):
+    rows = list(scan_markets(page_size=30, ordered=False, client=client))
+    assert len(rows) == len(fake_server.fixtures.markets)
+    assert {market["id"] for market in rows} == set(market_ids(fake_server))
+
+
+def test_max_rows_limits_requests(fake_server):
+    client, requests = counting_client(fake_server)
+    with client:
+        rows = list(scan_markets(page_size=30, max_rows=45, client=client))
+    assert [market["id"] for market in rows] == market_ids(fake_server)[:45]
+    assert len(requests) == 2
+
+
+def test_no_pages_past_the_end_are_waited_for(fake_server):
+    client, requests = counting_client(fake_server)
+    with client:
+        rows = list(scan_markets(page_size=100, max_workers=1, client=client))
+    assert len(rows) == 200
+    # Pages at 0 and 100 are full; the empty page at 200 ends the scan.
+    assert len(requests) == 3
+
+
+def test_markets_shifting_between_pages_are_yielded_once():
+    server = start_server(markets=200, bets=10)
+    try:
+        ids = market_ids(server)
+        fixtures = server.fixtures
+        new = {**fixtures.markets[0], "id": "new"}
+        shifted = threading.Event()
+        hooks = Hooks()
+
+        def insert_after_first_page(event):
+            # A new market pushes every later one a page position down.
+            if not shifted.is_set():
+                shifted.set()
+                fixtures.markets.insert(0, new)
+                fixtures.encoded["markets"].insert(0, json.dumps(new).encode())
+
+        hooks.add(insert_after_first_page, kinds=[RESPONSE])
+        with Client(base_url=server.url, rate_limiter=False, hooks=hooks) as client:
+            rows = list(scan_markets(page_size=30, max_workers=1, client=client))
+    finally:
+        stop_server(server)
+    assert [market["id"] for market in rows] == ids
+
+
+@pytest.mark.parametrize("page_size", [0, 1001])
+def test_page_size_is_checked(client, page_size):
+    with pytest.raises(ValueError, match="page_size"):
+        next(scan_markets(page_size=page_size, client=client))
+
+
+def test_managed_params_are_replaced(fake_server, client):
+    rows = scan_markets(
+        {"offset": 150, "limit": 1, "term": "event"}, page_size=50, client=client
+    )
+    assert len(list(rows)) == 200
+
+
+def test_async_scan(fake_server):
+    async def collect(**kwargs) -> list[str]:
+        async with AsyncClient(base_url=fake_server.url, rate_limiter=False) as client:
+            rows = ascan_markets(page_size=30, max_workers=4, client=client, **kwargs)
+            return [market["id"] async for market in rows]
+
+    ids = market_ids(fake_server)
+    assert asyncio.run(collect()) == ids
+    assert sorted(asyncio.run(collect(ordered=False))) == sorted(ids)
+    assert asyncio.run(collect(max_rows=45)) == ids[:45]
+
+
+def test_async_scan_can_stop_early(fake_server):
+    async def first() -> dict:
+        async with AsyncClient(base_url=fake_server.url, rate_limiter=False) as client:
+            rows = ascan_markets(page_size=10, max_workers=8, client=client)
+            try:
+                return await anext(rows)
+            finally:
+                # Closing the scan cancels the pages still in flight.
+                await rows.aclose()
+
+    assert asyncio.run(first())["id"] == market_ids(fake_server)[0]
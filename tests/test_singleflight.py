@@ -0,0 +1,236 @@
+import asyncio
+import gc
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from pymanifold import aio, call_manifold_api
+from pymanifold.client import AsyncClient, Client
+from pymanifold.hooks import REQUEST, Hooks
+from pymanifold.singleflight import SingleFlight
+
+WAITERS = 8
+
+
+def wait_until(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise TimeoutError
+        time.sleep(0.001)
+
+
+def run_threads(flight: SingleFlight, fn) -> list:
+    """Call `flight.do` from WAITERS threads at once; return each result or exception."""
+
+    def call():
+        try:
+            return flight.do("key", fn)
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=WAITERS) as executor:
+        futures = [executor.submit(call) for _ in range(WAITERS)]
+        return [future.result() for future in futures]
+
+
+def test_error_reaches_every_waiting_thread():
+    flight = SingleFlight()
+    error = ValueError("upstream failed")
+
+    def fail():
+        # Hold the call open until every other thread is waiting on it.
+        wait_until(lambda: flight.shared == WAITERS - 1)
+        raise error
+
+    assert run_threads(flight, fail) == [error] * WAITERS
+    assert flight.stats() == {"calls": 1, "shared": WAITERS - 1, "in_flight": 0}
+
+
+def test_result_is_shared_and_not_remembered():
+    flight = SingleFlight()
+    result = {"id": "m1"}
+
+    def fetch():
+        wait_until(lambda: flight.shared == WAITERS - 1)
+        return result
+
+    assert all(r is result for r in run_threads(flight, fetch))
+    # Once finished, the next call runs again.
+    assert flight.do("key", lambda: "again") == "again"
+    assert flight.calls == 2
+
+
+def test_failed_call_is_not_remembered():
+    flight = SingleFlight()
+    with pytest.raises(ZeroDivisionError):
+        flight.do("key", lambda: 1 / 0)
+    assert flight.do("key", lambda: "recovered") == "recovered"
+
+
+def test_different_keys_run_separately():
+    flight = SingleFlight()
+    started = threading.Barrier(2, timeout=5)
+
+    def fetch(value):
+        started.wait()
+        return value
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        a = executor.submit(flight.do, "a", lambda: fetch("a"))
+        b = executor.submit(flight.do, "b", lambda: fetch("b"))
+        assert (a.result(), b.result()) == ("a", "b")
+    assert flight.calls == 2
+
+
+def test_error_reaches_every_waiting_task():
+    flight = SingleFlight()
+    error = ValueError("upstream failed")
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise error
+
+    async def main():
+        return await asyncio.gather(
+            *(flight.ado("key", fail) for _ in range(WAITERS)),
+            return_exceptions=True,
+        )
+
+    assert asyncio.run(main()) == [error] * WAITERS
+    assert flight.stats() == {"calls": 1, "shared": WAITERS - 1, "in_flight": 0}
+
+
+def test_cancelled_waiter_does_not_cancel_the_others():
+    flight = SingleFlight()
+    error = ValueError("upstream failed")
+
+    async def fail():
+        await asyncio.sleep(0.05)
+        raise error
+
+    async def main():
+        tasks = [asyncio.ensure_future(flight.ado("key", fail)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        tasks[0].cancel()
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    first, *rest = asyncio.run(main())
+    assert isinstance(first, asyncio.CancelledError)
+    assert rest == [error, error]
+
+
+def test_error_with_every_waiter_cancelled_is_not_reported_unretrieved():
+    flight = SingleFlight()
+    unhandled = []
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("nobody is waiting")
+
+    async def main():
+        asyncio.get_running_loop().set_exception_handler(
+            lambda loop, context: unhandled.append(context)
+        )
+        waiter = asyncio.ensure_future(flight.ado("key", fail))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.sleep(0.05)
+
+    asyncio.run(main())
+    gc.collect()
+    assert unhandled == []
+    assert flight.in_flight == 0
+
+
+def test_http_error_is_shared_by_coalesced_requests(fake_server):
+    requests = []
+    hooks = Hooks()
+    hooks.add(requests.append, kinds=[REQUEST])
+    client = AsyncClient(
+        base_url=fake_server.url, rate_limiter=False, retry=False, hooks=hooks
+    )
+    flight = SingleFlight()
+
+    async def main():
+        async with client:
+            return await asyncio.gather(
+                *(
+                    aio.call_manifold_api(
+                        "/v0/market/missing", client=client, coalesce=flight
+                    )
+                    for _ in range(WAITERS)
+                ),
+                return_exceptions=True,
+            )
+
+    errors = asyncio.run(main())
+    assert all(isinstance(e, httpx.HTTPStatusError) for e in errors)
+    assert {e.response.status_code for e in errors} == {404}
+    assert len(requests) == 1
+    assert flight.stats()["shared"] == WAITERS - 1
+    # Each caller raises its own error rather than one object shared between tasks.
+    assert len({id(e) for e in errors}) == WAITERS
+
+
+def test_coalesced_callers_get_their_own_copy(fake_server):
+    flight = SingleFlight()
+    hooks = Hooks()
+    # Hold the request until the second caller has joined it.
+    hooks.add(lambda event: wait_until(lambda: flight.shared == 1), kinds=[REQUEST])
+    client = Client(base_url=fake_server.url, rate_limiter=False, hooks=hooks)
+
+    def fetch():
+        return call_manifold_api("/v0/market/m00000001", client=client, coalesce=flight)
+
+    with client, ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(fetch) for _ in range(2)]
+        first, second = [future.result() for future in futures]
+    assert flight.stats()["calls"] == 1
+    assert first == second
+    assert first is not second
+    first["question"] = "changed"
+    assert second["question"] != "changed"
+
+
+def test_async_coalesced_callers_get_their_own_copy(fake_server):
+    flight = SingleFlight()
+    client = AsyncClient(base_url=fake_server.url, rate_limiter=False)
+
+    async def main():
+        async with client:
+            return await asyncio.gather(
+                *(
+                    aio.call_manifold_api(
+                        "/v0/market/m00000001", client=client, coalesce=flight
+                    )
+                    for _ in range(2)
+                )
+            )
+
+    first, second = asyncio.run(main())
+    assert flight.stats()["calls"] == 1
+    assert first == second
+    assert first is not second
+
+
+def test_coalescing_is_off_by_default(fake_server):
+    requests = []
+    hooks = Hooks()
+    hooks.add(requests.append, kinds=[REQUEST])
+    client = AsyncClient(base_url=fake_server.url, rate_limiter=False, hooks=hooks)
+
+    async def main():
+        async with client:
+            await asyncio.gather(
+                *(
+                    aio.call_manifold_api("/v0/market/m00000001", client=client)
+                    for _ in range(3)
+                )
+            )
+
+    asyncio.run(main())
+    assert len(requests) == 3
@@ -0,0 +1,180 @@
+import json
+
+import numpy as np
+import pytest
+
+from fake_server import START_TIME
+
+from pymanifold.client import Client
+from pymanifold.store import META_FILE, BetStore
+
+from .conftest import start_server, stop_server
+
+
+@pytest.fixture
+def server():
+    # Tests add and fill bets, so each gets its own small server.
+    server = start_server(bets=300)
+    yield server
+    stop_server(server)
+
+
+@pytest.fixture
+def client(server):
+    with Client(base_url=server.url, rate_limiter=False) as client:
+        yield client
+
+
+class Crash(Exception):
+    pass
+
+
+def crash_on_commit(monkeypatch, store: BetStore, after: int = 0) -> None:
+    """Make the store's metadata commit fail after `after` successful commits."""
+    write_meta = store._write_meta
+    calls = iter(range(after + 1))
+
+    def fail():
+        if next(calls) == after:
+            raise Crash
+        write_meta()
+
+    monkeypatch.setattr(store, "_write_meta", fail)
+
+
+def limit_order(bet_id: str, index: int, **state) -> dict:
+    return {
+        "id": bet_id,
+        "userId": "u00000001",
+        "contractId": "m00000001",
+        "createdTime": START_TIME + 10**7 + index,
+        "amount": 0.0,
+        "shares": 0.0,
+        "outcome": "YES",
+        "probBefore": 0.5,
+        "probAfter": 0.5,
+        "limitProb": 0.4,
+        "orderAmount": 100.0,
+        "isFilled": False,
+        "isCancelled": False,
+        **state,
+    }
+
+
+def server_ids(server) -> list[str]:
+    return [bet["id"] for bet in server.fixtures.bets]
+
+
+def test_sync_appends_only_new_bets(tmp_path, server, client):
+    store = BetStore(tmp_path)
+    assert store.sync(page_size=70, client=client) == 300
+    assert store.decode("id").tolist() == server_ids(server)
+    assert store["id"].dtype == np.dtype("S20")
+    # Only the low-cardinality string columns keep a dictionary.
+    assert not (tmp_path / "id.labels").exists()
+
+    server.fixtures.add_bets([limit_order("new-1", 1, limitProb=None)])
+    assert store.sync(client=client) == 1
+    reopened = BetStore(tmp_path)
+    assert len(reopened) == 301
+    assert reopened.last_bet_id == "new-1"
+    np.testing.assert_array_equal(
+        reopened["amount"][:300], [bet["amount"] for bet in server.fixtures.bets[:300]]
+    )
+
+
+def test_append_rejects_ids_wider_than_the_column(tmp_path):
+    store = BetStore(tmp_path)
+    with pytest.raises(ValueError):
+        store.append([limit_order("x" * 21, 0)])
+    assert len(store) == 0
+
+
+def test_refresh_rewrites_open_orders(tmp_path, server, client):
+    server.fixtures.add_bets(
+        [
+            limit_order("partial", 1),
+            limit_order("filled", 2),
+            limit_order("cancelled", 3),
+        ]
+    )
+    store = BetStore(tmp_path)
+    store.sync(client=client)
+    assert set(store.open_orders) == {"partial", "filled", "cancelled"}
+
+    server.fixtures.add_bets(
+        [
+            limit_order("partial", 1, amount=40.0, shares=100.0),
+            limit_order("filled", 2, amount=100.0, shares=250.0, isFilled=True),
+            limit_order("cancelled", 3, amount=10.0, shares=25.0, isCancelled=True),
+        ]
+    )
+    assert store.sync(client=client) == 0
+
+    reopened = BetStore(tmp_path)
+    assert reopened["amount"][-3:].tolist() == [40.0, 100.0, 10.0]
+    assert reopened["shares"][-3:].tolist() == [100.0, 250.0, 25.0]
+    assert set(reopened.open_orders) == {"partial"}
+
+
+def test_append_crash_leaves_previous_rows(tmp_path, monkeypatch, server):
+    bets = server.fixtures.bets
+    store = BetStore(tmp_path)
+    store.append(bets[:100])
+    crash_on_commit(monkeypatch, store)
+    with pytest.raises(Crash):
+        store.append(bets[100:200])
+
+    # The columns hold uncommitted bytes, but the store ignores and then overwrites them.
+    reopened = BetStore(tmp_path)
+    assert len(reopened) == 100
+    assert reopened.decode("userId").tolist() == [b["userId"] for b in bets[:100]]
+    reopened.append(bets[100:150])
+    reopened = BetStore(tmp_path)
+    assert reopened.decode("id").tolist() == [b["id"] for b in bets[:150]]
+    assert reopened.decode("contractId").tolist() == [
+        b["contractId"] for b in bets[:150]
+    ]
+    assert (tmp_path / "amount.bin").stat().st_size == 150 * 8
+
+
+def test_sync_crash_resumes_without_duplicates(tmp_path, monkeypatch, server, client):
+    store = BetStore(tmp_path)
+    crash_on_commit(monkeypatch, store, after=1)
+    with pytest.raises(Crash):
+        store.sync(batch_size=100, client=client)
+
+    reopened = BetStore(tmp_path)
+    assert len(reopened) == 100
+    assert reopened.sync(batch_size=100, client=client) == 200
+    assert reopened.decode("id").tolist() == server_ids(server)
+
+
+def test_update_crash_is_repaired_by_the_next_refresh(
+    tmp_path, monkeypatch, server, client
+):
+    server.fixtures.add_bets([limit_order("order", 1)])
+    store = BetStore(tmp_path)
+    store.sync(client=client)
+    server.fixtures.add_bets(
+        [limit_order("order", 1, amount=100.0, shares=250.0, isFilled=True)]
+    )
+    crash_on_commit(monkeypatch, store)
+    with pytest.raises(Crash):
+        store.refresh_orders(client=client)
+
+    # The order is still tracked, so the next refresh rewrites it again.
+    reopened = BetStore(tmp_path)
+    assert set(reopened.open_orders) == {"order"}
+    assert reopened.refresh_orders(client=client) == 1
+    assert reopened["amount"][-1] == 100.0
+    assert not BetStore(tmp_path).open_orders
+
+
+def test_opening_an_older_format_fails(tmp_path):
+    BetStore(tmp_path).append([limit_order("order", 1)])
+    meta_path = tmp_path / META_FILE
+    meta = json.loads(meta_path.read_text())
+    meta_path.write_text(json.dumps({**meta, "version": 1}))
+    with pytest.raises(ValueError, match="format version"):
+        BetStore(tmp_path)
@@ -0,0 +1,115 @@
+import asyncio
+import json
+import random
+
+import pytest
+
+from pymanifold import call_manifold_api
+from pymanifold.streaming import (
+    JSONArrayDecoder,
+    aiter_json_array,
+    astream_manifold_api,
+    iter_json_array,
+    stream_manifold_api,
+)
+
+SMALL = '[{"a": [1, 2.5e-3, "x, ]"]}, -12.75, "café ✓", true, null, {}, []]'
+
+
+def split(data: bytes, cuts: list[int]) -> list[bytes]:
+    bounds = [0, *sorted(cuts), len(data)]
+    return [data[lo:hi] for lo, hi in zip(bounds, bounds[1:])]
+
+
+def decode(chunks: list[bytes]) -> list:
+    decoder = JSONArrayDecoder()
+    items = []
+    for chunk in chunks:
+        items.extend(decoder.feed(chunk))
+    return items + decoder.close()
+
+
+def test_every_two_way_split():
+    data = SMALL.encode()
+    expected = json.loads(SMALL)
+    # Includes cuts inside numbers, strings and multi-byte characters.
+    for cut in range(len(data) + 1):
+        assert decode(split(data, [cut])) == expected, cut
+
+
+def test_single_byte_chunks():
+    data = SMALL.encode()
+    assert decode([data[i : i + 1] for i in range(len(data))]) == json.loads(SMALL)
+
+
+def test_random_splits_of_an_api_page(fake_server, client):
+    body = client.request("GET", "/v0/bets", params={"limit": 500}).content
+    expected = json.loads(body)
+    rng = random.Random(0)
+    for _ in range(20):
+        cuts = rng.sample(range(len(body)), rng.randint(1, 200))
+        assert decode(split(body, cuts)) == expected
+
+
+def test_elements_are_returned_once_complete():
+    decoder = JSONArrayDecoder()
+    assert decoder.feed(b'[{"id": 1}, {"id"') == [{"id": 1}]
+    assert decoder.feed(b": 2}, 3") == [{"id": 2}]
+    # "3" could still be the start of "35", so it waits for its delimiter.
+    assert decoder.feed(b"5") == []
+    assert decoder.feed(b" ]") == [35]
+    assert decoder.close() == []
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("[]", []),
+        (" \n[ ]\n ", []),
+        ('{"message": "not a list"}', [{"message": "not a list"}]),
+        ("42", [42]),
+    ],
+)
+def test_empty_arrays_and_other_documents(text, expected):
+    data = text.encode()
+    for cut in range(len(data) + 1):
+        assert decode(split(data, [cut])) == expected
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["", "[1 2]", "[1, 2", "[1] x", "[1,]", "[,1]", "[1, }]", '["open', "[1]]"],
+)
+def test_malformed_input_raises(text):
+    data = text.encode()
+    for cut in range(len(data) + 1):
+        with pytest.raises(json.JSONDecodeError):
+            decode(split(data, [cut]))
+
+
+def test_iterators_match_decoder():
+    chunks = split(SMALL.encode(), [5, 17, 40])
+    assert list(iter_json_array(chunks)) == json.loads(SMALL)
+
+    async def collect() -> list:
+        async def source():
+            for chunk in chunks:
+                yield chunk
+
+        return [item async for item in aiter_json_array(source())]
+
+    assert asyncio.run(collect()) == json.loads(SMALL)
+
+
+def test_stream_manifold_api_matches_buffered(client, async_client):
+    params = {"limit": 300}
+    expected = call_manifold_api("/v0/bets", params=params, client=client)
+    assert list(stream_manifold_api("/v0/bets", params=params, client=client)) == (
+        expected
+    )
+
+    async def collect() -> list:
+        rows = astream_manifold_api("/v0/bets", params=params, client=async_client)
+        return [row async for row in rows]
+
+    assert asyncio.run(collect()) == expected